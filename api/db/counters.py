@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import bindparam, event, func, update
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session as ORMSession
+
+logger = logging.getLogger(__name__)
+
+# Key in `session.info` of the increments to buffer once the transaction is committed, see `add_on_commit`
+_PENDING_INCREMENTS = "counter_increments"
+
+
+class FlushStats:
+    """
+    Running counters of the increments buffered by a `CounterBuffer` and of its flushes
+
+    - 'increments': Increments buffered since the worker started
+    - 'pending_increments' / 'oldest': Increments not written yet, and when the oldest of them was buffered
+    - 'flushes' / 'failures': Batched UPDATEs written / which failed
+    - 'rows_flushed', 'last_flush_rows', 'max_flush_rows': Rows updated by the flushes
+    - 'last_lag_ms' / 'max_lag_ms': Age of the oldest increment written by the last / any flush
+    """
+
+    def __init__(self):
+        self.increments = 0
+        self.pending_increments = 0
+        self.oldest: Optional[float] = None
+        self.flushes = 0
+        self.failures = 0
+        self.rows_flushed = 0
+        self.last_flush_rows = 0
+        self.max_flush_rows = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def record_add(self):
+        self.increments += 1
+        self.pending_increments += 1
+        if self.oldest is None:
+            self.oldest = time.monotonic()
+
+    def take_pending(self) -> tuple[int, Optional[float]]:
+        """
+        Reset the pending increments as a flush takes them, returns their number and the oldest
+        """
+        taken = (self.pending_increments, self.oldest)
+        self.pending_increments, self.oldest = 0, None
+        return taken
+
+    def record_failure(self, pending_increments: int, oldest: Optional[float]):
+        # the increments are pending again, for the next flush
+        self.failures += 1
+        self.pending_increments += pending_increments
+        self.oldest = min(filter(None, (oldest, self.oldest)), default=None)
+
+    def record_flush(self, rows: int, oldest: Optional[float]):
+        lag_ms = (time.monotonic() - oldest) * 1000 if oldest is not None else 0.0
+        self.flushes += 1
+        self.rows_flushed += rows
+        self.last_flush_rows = rows
+        self.max_flush_rows = max(self.max_flush_rows, rows)
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def snapshot(self) -> dict:
+        return {
+            "pending_increments": self.pending_increments,
+            "increments": self.increments,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "rows_flushed": self.rows_flushed,
+            "last_flush_rows": self.last_flush_rows,
+            "max_flush_rows": self.max_flush_rows,
+            "avg_flush_rows": self.rows_flushed / self.flushes if self.flushes else 0.0,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+        }
+
+
+class CounterBuffer:
+    """
+    Coalesces the increments of a hot counter column in memory, and writes them in batches
+
+    Every `add` only bumps a delta in a dict. The deltas are written with one executemany
+    `UPDATE ... SET col = col + :delta WHERE id = :id` every `flush_interval_ms`, or as soon as
+    `flush_threshold` increments are pending. So 1000 likes on a viral post become a single row
+    update instead of 1000 updates queueing on its row lock.
+
+    Durability: the pending deltas live in the worker process, a crash loses at most the
+    increments of the last `flush_interval_ms` (and never more than `flush_threshold`).
+    A graceful shutdown flushes them, see `CounterRegistry.aclose`.
+
+    Reads should go through `merge`, which adds the pending delta of the row to its stored value.
+    Other workers only see the increments once they are flushed.
+
+    Increments backed by rows written in the request transaction (eg: a like) go through `add_on_commit`,
+    so a rolled back or failed transaction never reaches the count.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        column,
+        flush_interval_ms: int = 1000,
+        flush_threshold: int = 500,
+        floor: Optional[int] = 0,
+        cap: Optional[int] = None,
+    ):
+        self.name = name
+        self.column = column
+        self.flush_interval_ms = flush_interval_ms
+        self.flush_threshold = flush_threshold
+        # (floor, cap) of the counter, either can be None
+        self.bounds = (floor, cap)
+        self._pending: dict[UUID, int] = {}
+        # deltas being written, still counted by `pending` until the write is committed
+        self._inflight: dict[UUID, int] = {}
+        self._engine: Optional[AsyncEngine] = None
+        self._lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        # the periodic flush loop and the threshold flushes in progress
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = FlushStats()
+
+    @property
+    def model(self) -> type:
+        return self.column.class_
+
+    @property
+    def enabled(self) -> bool:
+        return self._engine is not None
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def add(self, id: UUID, delta: int = 1):
+        # pylint: disable=redefined-builtin
+        self._pending[id] = self._pending.get(id, 0) + delta
+        self.stats.record_add()
+        if self.stats.pending_increments >= self.flush_threshold:
+            self._spawn(self.flush())
+
+    def add_on_commit(self, db, id: UUID, delta: int = 1):
+        """
+        `add` the increment once the transaction of the session `db` is committed, drop it on rollback
+        """
+        # pylint: disable=redefined-builtin
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(_PENDING_INCREMENTS, []).append((self, id, delta))
+
+    def pending(self, id: UUID, db=None) -> int:
+        """
+        Delta of the row not flushed yet, with the uncommitted increments of the session `db` if given
+        """
+        # pylint: disable=redefined-builtin
+        delta = self._pending.get(id, 0) + self._inflight.get(id, 0)
+        if db is not None:
+            increments = getattr(db, "sync_session", db).info.get(_PENDING_INCREMENTS, [])
+            delta += sum(change for buffer, row_id, change in increments if buffer is self and row_id == id)
+        return delta
+
+    def merge(self, id: UUID, value: int, db=None) -> int:
+        """
+        The stored `value` of the row with its pending delta, bounded like the flush bounds it.
+        Pass the session `db` to also count its own increments, not committed yet.
+        """
+        # pylint: disable=redefined-builtin
+        value = (value or 0) + self.pending(id, db)
+        floor, cap = self.bounds
+        if floor is not None:
+            value = max(value, floor)
+        if cap is not None:
+            value = min(value, cap)
+        return value
+
+    def _statement(self):
+        value = self.column + bindparam("delta")
+        floor, cap = self.bounds
+        if floor is not None:
+            value = func.greatest(value, floor)
+        if cap is not None:
+            value = func.least(value, cap)
+        table = self.model.__table__
+        return update(table).where(table.c.id == bindparam("row_id")).values({self.column.key: value})
+
+    async def flush(self):
+        if self._engine is None:
+            return
+        async with self._lock:
+            if not self._pending:
+                return
+            self._inflight, self._pending = self._pending, {}
+            increments, oldest = self.stats.take_pending()
+            # sorted, so two workers flushing the same rows lock them in the same order and can not deadlock
+            params = [{"row_id": id, "delta": delta} for id, delta in sorted(self._inflight.items()) if delta]
+            try:
+                if params:
+                    async with self._engine.begin() as conn:
+                        await conn.execute(self._statement(), params)
+            except Exception as e:
+                # keep the deltas for the next flush
+                logger.warning(f"Counter flush of {self.name} failed: {e}")
+                for id, delta in self._inflight.items():  # pylint: disable=redefined-builtin
+                    self._pending[id] = self._pending.get(id, 0) + delta
+                self.stats.record_failure(increments, oldest)
+                self._inflight = {}
+                return
+            if (cache := getattr(self.model, "identity_cache", None)) is not None:
+                for id in self._inflight:  # pylint: disable=redefined-builtin
+                    cache.delete(id)
+            self._inflight = {}
+            self.stats.record_flush(len(params), oldest)
+
+    async def _run(self):
+        # stopped with an event rather than cancelled, so a flush is never interrupted halfway
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.flush_interval_ms / 1000)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self, engine: AsyncEngine):
+        self._engine = engine
+        # asyncio primitives belong to the loop they are first used in, the buffer may be started in another one
+        self._lock = asyncio.Lock()
+        self._stopping = asyncio.Event()
+        self._spawn(self._run())
+
+    async def aclose(self):
+        self._stopping.set()
+        # let the loop and the flushes in progress finish their write, then write what is left
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+        self._engine = None
+
+    def snapshot(self) -> dict:
+        return {"pending_rows": len(self._pending), **self.stats.snapshot()}
+
+
+class CounterRegistry:
+    """
+    The counter buffers of the app, started and flushed for the last time with it, see `lifespan`
+
+    Buffering is off while the registry is not started (eg: in scripts), or with `COUNTER_BUFFER_ENABLED=false`.
+    Callers check `buffer.enabled` and fall back to a direct UPDATE.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.is_enabled = enabled
+        self._buffers: dict[str, CounterBuffer] = {}
+
+    def register(self, buffer: CounterBuffer) -> CounterBuffer:
+        self._buffers[buffer.name] = buffer
+        return buffer
+
+    def start(self, engine: AsyncEngine):
+        if self.is_enabled:
+            for buffer in self._buffers.values():
+                buffer.start(engine)
+
+    async def aclose(self):
+        for buffer in self._buffers.values():
+            await buffer.aclose()
+
+    def stats(self) -> dict:
+        return {name: buffer.snapshot() for name, buffer in self._buffers.items()}
+
+
+@event.listens_for(ORMSession, "after_commit")
+def _buffer_committed_increments(session: ORMSession):
+    for buffer, id, delta in session.info.pop(_PENDING_INCREMENTS, []):  # pylint: disable=redefined-builtin
+        buffer.add(id, delta)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _drop_rolled_back_increments(session: ORMSession):
+    session.info.pop(_PENDING_INCREMENTS, None)
+
+
+counters = CounterRegistry(
+    enabled=os.getenv("COUNTER_BUFFER_ENABLED", "true").lower() not in ("0", "false", "no", "off")
+)
+FLUSH_INTERVAL_MS = int(os.getenv("COUNTER_FLUSH_INTERVAL_MS", "1000"))
+FLUSH_THRESHOLD = int(os.getenv("COUNTER_FLUSH_THRESHOLD", "500"))
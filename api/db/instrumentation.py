@@ -0,0 +1,117 @@
+import heapq
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .settings import DatabaseSettings
+
+logger = logging.getLogger(__name__)
+
+# Number of slowest statements kept for each request
+SLOWEST_KEPT = 5
+
+
+class QueryStats:
+    """
+    SQL statements run while serving one request
+
+    - 'count': Number of statements executed
+    - 'total_time': Sum of their execution time in seconds
+    - 'slowest': The `SLOWEST_KEPT` slowest statements, as (seconds, sql)
+    - 'shapes': How many times each SQL string ran, the parameters are bound separately
+                so the same query with other values has the same shape
+    """
+
+    def __init__(self, route: Optional[str] = None):
+        self.route = route
+        self.count = 0
+        self.total_time = 0.0
+        self._slowest: list[tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement] += 1
+        if len(self._slowest) < SLOWEST_KEPT:
+            heapq.heappush(self._slowest, (duration, statement))
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (duration, statement))
+
+    @property
+    def slowest(self) -> list[tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Statements which ran at least `threshold` times, the usual sign of an N+1 query
+        """
+        return [(statement, times) for statement, times in self.shapes.most_common() if times >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request(route: str) -> Token:
+    """
+    Start collecting the statements of the current request, returns the token for `end_request`
+    """
+    return _current_stats.set(QueryStats(route))
+
+
+def end_request(token: Token):
+    _current_stats.reset(token)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _one_line(statement: str, limit: int = 300) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else f"{statement[:limit]}..."
+
+
+def report_request(stats: QueryStats, settings: DatabaseSettings):
+    """
+    Log the statements of a request which ran often enough to be a likely N+1
+    """
+    for statement, times in stats.repeated(settings.n_plus_one_threshold):
+        logger.warning(f"Possible N+1 on {stats.route}: {times}x {_one_line(statement)}")
+
+
+def instrument_engine(engine: AsyncEngine, settings: DatabaseSettings):
+    """
+    Time every statement run on `engine`, record it on the current request and log the slow ones
+    """
+    slow_query = settings.slow_query_ms / 1000
+
+    def _record(statement: str, start: float):
+        duration = time.perf_counter() - start
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if duration >= slow_query:
+            route = stats.route if stats is not None else "-"
+            logger.warning(f"Slow query on {route} ({duration * 1000:.1f} ms): {_one_line(statement)}")
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # on the execution context rather than the connection: it goes away with the statement,
+        # also when the statement fails and `after_cursor_execute` never runs
+        context.query_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        _record(statement, context.query_start)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # failed statements took DB time too, eg: a lock or statement timeout
+        context = exception_context.execution_context
+        if context is not None and (start := getattr(context, "query_start", None)) is not None:
+            _record(exception_context.statement, start)
@@ -0,0 +1,221 @@
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable
+from uuid_extensions import uuid7
+from sqlalchemy import Index, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.schema import CreateIndex
+from sqlmodel import Field, SQLModel
+
+from .models.base import SEARCH_VECTORS, search_document, search_vector_ddl
+from .models.post import HashtagCount, PostHashtag, parse_hashtags
+
+logger = logging.getLogger(__name__)
+
+# Serializes the migrations of the workers starting at the same time, any constant shared by them works
+_MIGRATION_LOCK_ID = 0x6D696772
+# Serializes the runs of `migrate_manual`, distinct from the startup lock so the workers still start meanwhile
+_MANUAL_MIGRATION_LOCK_ID = 0x6D616E75
+# Rows updated per transaction by the backfills, keeps the row locks and the WAL of each one short
+BACKFILL_BATCH_SIZE = 10_000
+
+
+class SchemaMigration(SQLModel, table=True):
+    """
+    A migration applied to the database, see `migrate`
+    """
+
+    __tablename__ = "schema_migrations"
+
+    name: str = Field(..., primary_key=True, description="Name of the migration")
+    applied_at: datetime = Field(default_factory=datetime.now, description="When the migration was applied")
+
+
+class Migration:
+    """
+    A change of existing tables that `create_all` can not make, applied once per database
+
+    `upgrade` has to be a no-op on a database created by `create_all` from the current models
+    (eg: `CREATE ... IF NOT EXISTS`). Startup migrations run in the transaction of `migrate`, they
+    must not rewrite or scan big tables since every request waits on their locks. The others
+    (`on_startup=False`) are run by `migrate_manual` on an autocommit connection, they commit
+    their own batches and may build indexes concurrently.
+    """
+
+    def __init__(self, name: str, upgrade: Callable[[AsyncConnection], Awaitable[None]], on_startup: bool = True):
+        self.name = name
+        self.upgrade = upgrade
+        self.on_startup = on_startup
+
+
+async def _dedupe_forum_members(conn: AsyncConnection):
+    # members added twice before the unique index existed, the first membership is kept (ids are uuid7)
+    await conn.execute(
+        text(
+            "DELETE FROM forum_members AS duplicate USING forum_members AS kept "
+            "WHERE duplicate.forum_id = kept.forum_id AND duplicate.user_id = kept.user_id "
+            "AND duplicate.id > kept.id"
+        )
+    )
+    await conn.execute(
+        text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_forum_members_forum_id_user_id "
+            "ON forum_members (forum_id, user_id)"
+        )
+    )
+
+
+async def _add_search_vectors(conn: AsyncConnection):
+    # catalog only changes: a nullable column without default and the trigger filling it on the next writes,
+    # the existing rows are left to `_backfill_search_vectors`. Databases which got the generated column of
+    # the first version keep their values, only the expression is dropped.
+    for column in SEARCH_VECTORS:
+        table = column.table.name
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector"))
+        await conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN search_vector DROP EXPRESSION IF EXISTS"))
+        for statement in search_vector_ddl(column):
+            await conn.execute(text(statement))
+
+
+def _search_index(column) -> Index:
+    return next(index for index in column.table.indexes if column in index.columns.values())
+
+
+async def _backfill_search_vectors(conn: AsyncConnection):
+    for column in SEARCH_VECTORS:
+        table = column.table.name
+        # keyset batches on the primary key, the trigger already covers the rows written meanwhile
+        backfill = text(
+            f"WITH batch AS (SELECT id FROM {table} WHERE id > :after ORDER BY id LIMIT :limit), "
+            f"updated AS (UPDATE {table} SET search_vector = {search_document(column, f'{table}.')} FROM batch "
+            f"WHERE {table}.id = batch.id AND {table}.search_vector IS NULL) "
+            "SELECT id FROM batch ORDER BY id DESC LIMIT 1"
+        )
+        after = "00000000-0000-0000-0000-000000000000"
+        while after is not None:
+            # each batch commits on its own, `conn` is in autocommit
+            after = (await conn.execute(backfill, {"after": after, "limit": BACKFILL_BATCH_SIZE})).scalar()
+        index = _search_index(column)
+        # a failed CREATE INDEX CONCURRENTLY leaves an invalid index behind, IF NOT EXISTS would keep it
+        invalid = await conn.execute(
+            text("SELECT 1 FROM pg_index WHERE indexrelid = to_regclass(:name) AND NOT indisvalid"),
+            {"name": index.name},
+        )
+        if invalid.scalar():
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY {index.name}"))
+        create = CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect)
+        await conn.execute(text(str(create).replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)))
+
+
+async def _backfill_post_hashtags(conn: AsyncConnection):
+    # the posts written before `post_hashtags` existed, the ones written since already have their rows
+    posts = text(
+        "SELECT id, hashtag, created_at FROM posts WHERE id > :after AND is_deleted = false "
+        "AND coalesce(hashtag, '') <> '' ORDER BY id LIMIT :limit"
+    )
+    hashtags, counts = PostHashtag.__table__, HashtagCount.__table__
+    after = "00000000-0000-0000-0000-000000000000"
+    while rows := (await conn.execute(posts, {"after": after, "limit": BACKFILL_BATCH_SIZE})).all():
+        after = rows[-1].id
+        now = datetime.now()
+        # tagged in the hour the post was created, so the old posts do not flood the trending hashtags
+        values = [
+            {
+                "id": uuid7(),
+                "post_id": post.id,
+                "tag": tag,
+                "post_created_at": post.created_at,
+                "created_at": post.created_at,
+                "updated_at": now,
+            }
+            for post in rows
+            for tag in sorted(parse_hashtags(post.hashtag))
+        ]
+        if not values:
+            continue
+        # one statement per batch, so only the tags inserted by it are counted, even when the backfill is resumed
+        inserted = (
+            pg_insert(hashtags)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=["post_id", "tag"])
+            .returning(hashtags.c.tag, hashtags.c.created_at)
+            .cte("inserted")
+        )
+        bucket = func.date_trunc("hour", inserted.c.created_at)
+        count = pg_insert(counts).from_select(
+            ["id", "tag", "bucket", "count"],
+            select(func.gen_random_uuid(), inserted.c.tag, bucket, func.count())
+            .group_by(inserted.c.tag, bucket)
+            .order_by(inserted.c.tag, bucket),
+        )
+        count = count.on_conflict_do_update(
+            index_elements=["tag", "bucket"], set_={"count": counts.c["count"] + count.excluded["count"]}
+        )
+        await conn.execute(count)
+
+
+# In the order they are applied, never reorder or rename the ones already shipped
+MIGRATIONS: list[Migration] = [
+    Migration("0001_dedupe_forum_members", _dedupe_forum_members),
+    Migration("0002_add_search_vectors", _add_search_vectors),
+    Migration("0003_backfill_search_vectors", _backfill_search_vectors, on_startup=False),
+    Migration("0004_backfill_post_hashtags", _backfill_post_hashtags, on_startup=False),
+]
+
+
+async def migrate(conn: AsyncConnection) -> list[str]:
+    """
+    Apply the migrations which were not applied to the database yet, in order
+
+    It runs in the transaction of `conn`, under an advisory lock so the workers starting together
+    apply them once. The `schema_migrations` table has to exist, see `initiate`.
+
+    Returns:
+    - list[str]: Names of the migrations applied.
+    """
+    await conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _MIGRATION_LOCK_ID})
+    applied = set((await conn.execute(text("SELECT name FROM schema_migrations"))).scalars())
+    names = []
+    for migration in MIGRATIONS:
+        if migration.name in applied or not migration.on_startup:
+            continue
+        logger.info(f"Applying migration {migration.name}")
+        await migration.upgrade(conn)
+        await conn.execute(SchemaMigration.__table__.insert().values(name=migration.name, applied_at=datetime.now()))
+        names.append(migration.name)
+    return names
+
+
+async def migrate_manual(engine: AsyncEngine) -> list[str]:
+    """
+    Apply the manual migrations which were not applied to the database yet, in order
+
+    They run on an autocommit connection, each one commits its own work (eg: batches of a backfill),
+    so a run interrupted midway is resumed by the next one. The startup migrations have to be applied,
+    see `migrate`.
+
+    Args:
+    - engine (AsyncEngine): Engine of the database to migrate.
+
+    Returns:
+    - list[str]: Names of the migrations applied.
+    """
+    names = []
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _MANUAL_MIGRATION_LOCK_ID})
+        try:
+            applied = set((await conn.execute(text("SELECT name FROM schema_migrations"))).scalars())
+            for migration in MIGRATIONS:
+                if migration.name in applied or migration.on_startup:
+                    continue
+                logger.info(f"Applying migration {migration.name}")
+                await migration.upgrade(conn)
+                await conn.execute(
+                    SchemaMigration.__table__.insert().values(name=migration.name, applied_at=datetime.now())
+                )
+                names.append(migration.name)
+        finally:
+            await conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _MANUAL_MIGRATION_LOCK_ID})
+    return names
@@ -2,7 +2,7 @@ from uuid import UUID
 from typing import TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
 from datetime import datetime
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 if TYPE_CHECKING:
     from .user import User
 class AlertBase(SQLModel):
@@ -11,6 +11,11 @@ class AlertBase(SQLModel):
     alert_datetime: datetime = Field(..., description="Date and time when the alert should trigger", nullable=False)
 class Alert(BaseModel, AlertBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "alerts"
+    __table_args__ = (
+        # keyset pagination of the alerts of a user, and the upcoming alerts
+        live_index("ix_alerts_live_user_id_created_at_id", "user_id", "created_at", "id"),
+        live_index("ix_alerts_live_alert_datetime", "alert_datetime"),
+    )
     user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user who created the alert")
     user: "User" = Relationship(back_populates="alerts")
     
@@ -1,16 +1,45 @@
-from typing import Any, Type, TypeVar, Optional, Callable
+import base64
+import json
+from typing import Any, ClassVar, Iterable, Type, TypeVar, Optional, Callable
 from uuid import UUID
 from datetime import datetime
 from uuid_extensions import uuid7
 from pydantic import field_serializer
+from sqlalchemy import DDL, Column, Index, bindparam, event, false, insert, inspect, text, tuple_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import ORMExecuteState, Session as ORMSession, make_transient_to_detached, with_loader_criteria
 from sqlmodel import Session, SQLModel, Field, select
 from sqlmodel.sql.expression import SelectOfScalar
-from api.interfaces.utils import QueryFilterType
+from api.interfaces.utils import QueryFilterType, PageParams, PAGE_SIZE_MAX
+from api.utils.cache import TTLCache
+from api.utils.exceptions import InvalidParameterError
 
 T = TypeVar("T", bound=SQLModel)
 
+# Number of rows sent per multi-row INSERT by `save_many` and `upsert_many`
+BULK_BATCH_SIZE = 500
+
+# Execution option to also load soft deleted rows, eg: `query.execution_options(include_deleted=True)`
+INCLUDE_DELETED = "include_deleted"
+
+# Text search configuration of the `search_vector` columns, see `add_search_vector`
+SEARCH_CONFIG = "english"
+# The `search_vector` columns, the migrations add them to the tables created before them
+SEARCH_VECTORS: list[Column] = []
+# Key in `Index.info` of the indexes built by a migration (eg: concurrently) instead of by `initiate`
+MIGRATION_MANAGED = "migration_managed"
+
+# (number of tables, loader criteria) of the soft deleted models, see `_soft_delete_criteria`
+_soft_delete_options: tuple[int, tuple] = (0, ())
+
+# Key in `session.info` of the identity cache entries to drop again once the transaction is committed
+_PENDING_INVALIDATIONS = "identity_cache_invalidations"
+
 # Define operator map: Mapping of operators to corresponding SQLAlchemy expressions.
-__operator_map: dict[str, Callable] = {
+# The value passed in by `get` is a bound parameter, so the built statement can be cached and reused.
+# NOTE: single underscore, a `__` prefixed name gets mangled when referenced inside the class body
+_operator_map: dict[str, Callable] = {
     "==": lambda column, value: column == value,
     "!=": lambda column, value: column != value,
     "not": lambda column, _: ~column,  # NOT operation
@@ -22,15 +51,121 @@ __operator_map: dict[str, Callable] = {
     "not in": lambda column, value: column.notin_(value),
     "like": lambda column, value: column.like(value),
 }
+# Operators taking a list of values, their bound parameter is expanded at execution time
+_expanding_operators = ("in", "not in")
+# Operators which take no value at all
+_unary_operators = ("not",)
+
+# Statements built by `get` for dict filters, keyed by the shape of the query: model, columns, (column, operator)s.
+# Shapes come from the code, not from user input, so this stays small. The cap guards against misuse.
+_statement_cache: dict[tuple, SelectOfScalar] = {}
+_STATEMENT_CACHE_MAX = 512
+
+# Columns selected for a read schema by `projection_columns`, keyed by (model, schema)
+_projection_cache: dict[tuple, list] = {}
+
+
+def _cached_statement(cls: type, columns: Optional[list], filters: dict) -> tuple[SelectOfScalar, dict]:
+    """
+    Returns the statement for the shape of the dict `filters` along with the parameters of this call
+
+    A `None` value is part of the shape rather than a parameter, so `==` / `!=` still compile
+    to `IS NULL` / `IS NOT NULL` (a bound `= NULL` would match nothing).
+    """
+    bound = [
+        info["operator"] not in _unary_operators and info.get("value", None) is not None for info in filters.values()
+    ]
+    shape = (
+        cls,
+        tuple(str(column) for column in columns) if columns is not None else None,
+        tuple((str(column), info["operator"], is_bound) for (column, info), is_bound in zip(filters.items(), bound)),
+    )
+    params = {f"p{position}": info["value"] for position, info in enumerate(filters.values()) if bound[position]}
+    if (statement := _statement_cache.get(shape)) is not None:
+        return statement, params
+
+    conditions = [
+        _operator_map[info["operator"]](
+            column,
+            (
+                bindparam(f"p{position}", expanding=info["operator"] in _expanding_operators)
+                if bound[position]
+                else None
+            ),
+        )
+        for position, (column, info) in enumerate(filters.items())
+    ]
+    statement = select(cls) if columns is None else select(*columns)
+    if conditions:
+        statement = statement.where(*conditions)
+    if len(_statement_cache) < _STATEMENT_CACHE_MAX:
+        _statement_cache[shape] = statement
+    return statement, params
+
+
+def _encode_cursor(values: list) -> str:
+    """
+    Encode the keyset values of a row into an opaque, url safe cursor
+    """
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append({"dt": value.isoformat()})
+        elif isinstance(value, UUID):
+            encoded.append({"uuid": str(value)})
+        else:
+            encoded.append(value)
+    return base64.urlsafe_b64encode(json.dumps(encoded, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor generated by `_encode_cursor`, raises InvalidParameterError for tampered cursors
+    """
+    try:
+        encoded = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(encoded, list) or len(encoded) != size:
+            raise ValueError("cursor size mismatch")
+        values = []
+        for value in encoded:
+            if isinstance(value, dict) and "dt" in value:
+                values.append(datetime.fromisoformat(value["dt"]))
+            elif isinstance(value, dict) and "uuid" in value:
+                values.append(UUID(value["uuid"]))
+            else:
+                values.append(value)
+        return values
+    except (ValueError, TypeError) as err:
+        raise InvalidParameterError("cursor") from err
+
+
+def _is_read_only(db: Session) -> bool:
+    """
+    Whether `db` runs on the read replica, see `replica_session_maker`
+    """
+    bind = getattr(db, "sync_session", db).get_bind()
+    return bool(bind.get_execution_options().get("postgresql_readonly"))
 
 
 class BaseModel(SQLModel):
+    # Opt-in, process wide cache of `get_by_id`, see `_cache_identity`.
+    # Only for rows read far more often than written, as every write of the row invalidates it.
+    identity_cache: ClassVar[Optional[TTLCache]] = None
 
     @classmethod
-    async def get(cls: Type[T], db: Session, columns: Optional[list] = None, filters: Optional[QueryFilterType] = None):
+    async def get(
+        cls: Type[T],
+        db: Session,
+        columns: Optional[list] = None,
+        filters: Optional[QueryFilterType] = None,
+        include_deleted: bool = False,
+        projection: Optional[Type[SQLModel]] = None,
+    ):
         """
         This is a class method helps to generate an SQL Query and returns the resultant after execution of the query
 
+        Soft deleted rows are left out automatically, see `SoftDeleteMixin`.
+
         Args:
         db: instance of Session from SQLModel to run query
         columns (optional): List of columns or models whose data to be fetched in the query.
@@ -57,20 +192,201 @@ class BaseModel(SQLModel):
                                 - "in": Inclusion in a list
                                 - "not in": Exclusion from a list
                                 - "like": Pattern matching (LIKE in SQL)
+        include_deleted (optional): Also return soft deleted rows
+        projection (optional): Read schema to select the columns of, instead of `columns`.
+                        Only the columns of its fields are fetched and the result holds plain rows,
+                        which map into the schema with `projection.model_validate(row._mapping)`.
 
         Returns:
             List[T]: A list of instances of the model class matching the query criteria.
 
+        Queries with dictionary filters are built once per shape (model, columns, column + operator pairs)
+        with bound parameters and reused, so the hot lookups skip building the select and hit SQLAlchemy's
+        compiled statement cache. Prefer them over list filters on hot paths.
+
         There is a wide scope of improvement here.
         - The filters need to be a proper condition. It cannot auto setup the conditions for `where` clause
         - TODO: It needs to have feature to support join and accept necessary join conditions (for now it can be done with filters too)
         """
-        query: SelectOfScalar = select(cls) if columns is None else select(*columns)
+        if projection is not None:
+            columns = cls.projection_columns(projection)
+        execution_options = {INCLUDE_DELETED: include_deleted}
         if isinstance(filters, dict):
-            filters = [__operator_map[info["operator"]](col, info.get("value", None)) for col, info in filters.items()]
+            query, params = _cached_statement(cls, columns, filters)
+            return await db.exec(query, params=params, execution_options=execution_options)
+        query: SelectOfScalar = select(cls) if columns is None else select(*columns)
         if filters:
             query: SelectOfScalar = query.where(*filters)
-        return await db.exec(query)
+        return await db.exec(query, execution_options=execution_options)
+
+    @classmethod
+    async def get_by_id(cls: Type[T], db: Session, id: UUID, include_deleted: bool = False) -> Optional[T]:
+        """
+        This is a class method to fetch a row by its primary key, with a cached statement
+
+        Args:
+        db: instance of Session from SQLModel to run query
+        id: primary key of the row
+        include_deleted (optional): Also return soft deleted rows
+
+        Returns:
+            T: The instance, or None if it does not exist (or is soft deleted)
+        """
+        # pylint: disable=redefined-builtin
+        cache = cls.identity_cache if not include_deleted else None
+        if cache is not None and (snapshot := cache.get(id)) is not None:
+            return cls._from_snapshot(db, snapshot)
+
+        res = await cls.get(db=db, filters={cls.id: {"operator": "==", "value": id}}, include_deleted=include_deleted)
+        instance = res.one_or_none()
+        # a lagging replica could put back a row a commit on the primary just invalidated
+        if cache is not None and instance is not None and not _is_read_only(db):
+            cache.set(id, instance._snapshot())
+        return instance
+
+    def _snapshot(self) -> dict:
+        """
+        Column values of the row, what the identity cache keeps instead of the instance bound to a session
+        """
+        return {attr.key: getattr(self, attr.key) for attr in inspect(type(self)).column_attrs}
+
+    @classmethod
+    def _from_snapshot(cls: Type[T], db: Session, snapshot: dict) -> T:
+        """
+        Rebuild a cached row as a persistent instance of `db`, as if it had just been loaded by a query
+        """
+        identity_key = inspect(cls).identity_key_from_primary_key([snapshot["id"]])
+        # the request may already hold the row, possibly with pending changes, keep that one
+        if (instance := db.identity_map.get(identity_key)) is not None:
+            return instance
+        instance = cls(**snapshot)
+        make_transient_to_detached(instance)
+        db.add(instance)
+        return instance
+
+    @classmethod
+    def _invalidate_identity(cls, db: Session, ids: Iterable[UUID]):
+        """
+        Drop the rows from the identity cache now, and again once the transaction is committed,
+        so a concurrent request can not keep the old values it read before the commit
+        """
+        if cls.identity_cache is None:
+            return
+        ids = list(ids)
+        for id in ids:  # pylint: disable=redefined-builtin
+            cls.identity_cache.delete(id)
+        db.info.setdefault(_PENDING_INVALIDATIONS, []).append((cls.identity_cache, ids))
+
+    @classmethod
+    def projection_columns(cls, schema: Type[SQLModel], extra: Optional[list] = None) -> list:
+        """
+        Columns of this model backing the fields of the read `schema`, plus the `extra` columns
+
+        Fields of the schema without a column (eg: computed ones) are left for the schema defaults.
+        """
+        key = (cls, schema)
+        if (columns := _projection_cache.get(key)) is None:
+            column_keys = inspect(cls).columns.keys()
+            columns = [getattr(cls, name) for name in schema.model_fields if name in column_keys]
+            _projection_cache[key] = columns
+        return columns + [column for column in extra or [] if column.key not in schema.model_fields]
+
+    @classmethod
+    def keyset_columns(cls) -> list:
+        """
+        Columns giving a stable, unique order of the rows for cursor pagination.
+        `(created_at, id)` for timestamped models, else the `id` alone (uuid7 ids are time ordered).
+        """
+        if "created_at" in cls.model_fields:
+            return [cls.created_at, cls.id]
+        return [cls.id]
+
+    @classmethod
+    async def paginate(
+        cls: Type[T],
+        db: Session,
+        page: Optional[PageParams] = None,
+        filters: Optional[list] = None,
+        query: Optional[SelectOfScalar] = None,
+        keys: Optional[list] = None,
+        descending: bool = False,
+        include_deleted: bool = False,
+        projection: Optional[Type[SQLModel]] = None,
+    ) -> dict:
+        """
+        This is a class method to fetch one page of rows using keyset (cursor) pagination
+
+        Unlike OFFSET, the cost of fetching a page does not grow with its position,
+        as the cursor turns into a `(created_at, id) > (:created_at, :id)` condition served by an index.
+
+        Args:
+        db: instance of Session from SQLModel to run query
+        page (optional): `after`/`before` cursors and the page size. Defaults to the first page.
+        filters (optional): List of SQLAlchemy conditions to be added on to the `where` clause of the query
+        query (optional): Select query to paginate, eg: with joins or options. Defaults to `select(cls)`.
+                        Each row must expose the `keys` columns by name.
+        keys (optional): Columns defining the order of the rows, the last one must be unique.
+                        Defaults to `cls.keyset_columns()`.
+        descending (optional): Return the rows in descending order of `keys`
+        include_deleted (optional): Also return soft deleted rows
+        projection (optional): Read schema of the page items. Only the columns of its fields (and `keys`)
+                        are fetched and each row is mapped straight into the schema, skipping the ORM objects.
+                        Ignored when `query` is given.
+
+        Returns:
+            dict: `{"data": [...], "next_cursor": str | None, "prev_cursor": str | None}`,
+                which matches the `List[T]` response schema.
+        """
+        page = page or PageParams()
+        keys = keys or cls.keyset_columns()
+        limit = max(1, min(page.limit, PAGE_SIZE_MAX))
+        backwards = page.before is not None
+        cursor = page.before if backwards else page.after
+        # when paging backwards the rows are scanned in the opposite order and reversed afterwards
+        scan_descending = descending != backwards
+
+        if query is None:
+            query = select(cls) if projection is None else select(*cls.projection_columns(projection, keys))
+        else:
+            projection = None
+        if filters:
+            query = query.where(*filters)
+        if cursor:
+            values = tuple(_decode_cursor(cursor, len(keys)))
+            row_key = tuple_(*keys)
+            query = query.where(row_key < values if scan_descending else row_key > values)
+        query = query.order_by(*[key.desc() if scan_descending else key.asc() for key in keys]).limit(limit + 1)
+
+        rows = list((await db.exec(query, execution_options={INCLUDE_DELETED: include_deleted})).all())
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
+
+        def row_cursor(row) -> str:
+            return _encode_cursor([getattr(row, key.key) for key in keys])
+
+        if not rows:
+            return {"data": [], "next_cursor": None, "prev_cursor": None}
+        data = rows
+        if projection is not None:
+            # the rows also carry the `keys` columns the schema may not have, and it may forbid extra fields
+            fields = projection.model_fields
+            data = [
+                projection.model_validate({name: value for name, value in row._mapping.items() if name in fields})
+                for row in rows
+            ]
+        if backwards:
+            return {
+                "data": data,
+                "next_cursor": row_cursor(rows[-1]),
+                "prev_cursor": row_cursor(rows[0]) if has_more else None,
+            }
+        return {
+            "data": data,
+            "next_cursor": row_cursor(rows[-1]) if has_more else None,
+            "prev_cursor": row_cursor(rows[0]) if page.after else None,
+        }
 
     @classmethod
     async def get_multi(cls: Type[T], db: Session, skip: int = 0, limit: int = 10) -> list[T]:
@@ -81,10 +397,83 @@ class BaseModel(SQLModel):
     async def all(cls: Type[T], db: Session):
         return await db.exec(select(cls)).all()
 
+    @classmethod
+    def _column_values(cls, obj: SQLModel) -> dict:
+        # defaults like `id` and `created_at` are already set by the field default factories
+        return {name: getattr(obj, name) for name in cls.__table__.columns.keys() if name in cls.model_fields}
+
+    @classmethod
+    async def save_many(cls: Type[T], db: Session, objects: list[T], batch_size: int = BULK_BATCH_SIZE) -> list[T]:
+        """
+        This is a class method to insert many rows with one multi-row `INSERT ... RETURNING` per batch,
+        instead of the two round-trips per row of `save`
+
+        Args:
+        db: instance of Session from SQLModel to run query
+        objects: List of model instances to insert
+        batch_size (optional): Number of rows sent per statement
+
+        Returns:
+            List[T]: The inserted rows, hydrated from RETURNING. These are new instances attached to the session,
+                    not the objects passed in.
+        """
+        saved: list[T] = []
+        for start in range(0, len(objects), batch_size):
+            rows = [cls._column_values(obj) for obj in objects[start : start + batch_size]]
+            result = await db.scalars(insert(cls).values(rows).returning(cls))
+            saved.extend(result.all())
+        return saved
+
+    @classmethod
+    async def upsert_many(
+        cls: Type[T],
+        db: Session,
+        objects: list[T],
+        index_elements: list[str],
+        update_columns: Optional[list[str]] = None,
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> list[T]:
+        """
+        This is a class method to insert or update many rows with one
+        `INSERT ... ON CONFLICT ... RETURNING` statement per batch
+
+        Args:
+        db: instance of Session from SQLModel to run query
+        objects: List of model instances to upsert. Their `index_elements` values must be unique within the list.
+        index_elements: Columns of the unique index/constraint which detects the conflict. eg: ["forum_id", "user_id"]
+        update_columns (optional): Columns overwritten on conflict. If not given, conflicting rows are skipped
+                        (`ON CONFLICT DO NOTHING`) and are not part of the returned list.
+        batch_size (optional): Number of rows sent per statement
+
+        Returns:
+            List[T]: The inserted and updated rows, hydrated from RETURNING.
+        """
+        upserted: list[T] = []
+        for start in range(0, len(objects), batch_size):
+            rows = [cls._column_values(obj) for obj in objects[start : start + batch_size]]
+            stmt = pg_insert(cls).values(rows)
+            if update_columns:
+                set_ = {name: stmt.excluded[name] for name in update_columns}
+                if "updated_at" in cls.model_fields:
+                    set_.setdefault("updated_at", stmt.excluded["updated_at"])
+                stmt = stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+            result = await db.scalars(stmt.returning(cls), execution_options={"populate_existing": True})
+            upserted.extend(result.all())
+        if update_columns:
+            cls._invalidate_identity(db, (obj.id for obj in upserted))
+        return upserted
+
     async def save(self, db: Session):
         db.add(self)
         await db.flush()
-        await db.refresh(self)
+        self._invalidate_identity(db, [self.id])
+        # Defaults (id, timestamps) are generated in Python and sent with the INSERT/UPDATE itself, and
+        # server generated values come back through RETURNING, so the instance is already up to date.
+        # Only reload what the flush left expired, instead of a full SELECT after every write.
+        if expired := inspect(self).expired_attributes:
+            await db.refresh(self, attribute_names=list(expired))
 
     async def update(self, db: Session, source: dict | SQLModel):
         if isinstance(source, SQLModel):
@@ -98,6 +487,7 @@ class BaseModel(SQLModel):
         if hard_delete:
             await db.delete(self)
             await db.flush()
+            self._invalidate_identity(db, [self.id])
         else:
             await self.update(
                 db,
@@ -179,12 +569,17 @@ class SoftDeleteMixin(SQLModel):
     - 'is_deleted': Flag indicating whether the record is deleted (soft deletion).
 
     Adds 'deleted_at' and 'is_deleted' fields for soft deletion functionality.
+
+    Soft deleted rows are filtered out of every ORM select automatically (see `_filter_soft_deleted`),
+    pass the `include_deleted=True` execution option to load them as well.
+    Indexes of these tables should be declared with `live_index`, so they only cover the live rows.
     """
 
     is_deleted: bool = Field(
         default=False,
-        # every select query will check for softdeletion, so index is needed
-        index=True,
+        # a plain index on a boolean is rarely used by Postgres, the lookup columns have
+        # partial indexes on the live rows instead, see `live_index`
+        index=False,
         description="Flag indicating whether the record is deleted (soft deletion)",
     )
     deleted_at: datetime | None = Field(
@@ -198,3 +593,116 @@ class SoftDeleteMixin(SQLModel):
             return deleted_at.isoformat()
 
         return None
+
+
+def live_index(name: str, *columns: str, **kwargs) -> Index:
+    """
+    Partial index over the live (not soft deleted) rows of a `SoftDeleteMixin` table
+
+    It matches the `is_deleted = false` condition added to every query by `_filter_soft_deleted`,
+    and stays smaller than a full index as deleted rows are left out.
+    """
+    return Index(name, *columns, postgresql_where=text("is_deleted = false"), **kwargs)
+
+
+def _soft_delete_criteria() -> tuple:
+    """
+    One `is_deleted = false` loader criteria per mapped `SoftDeleteMixin` model, built once per set of tables
+
+    The criteria can not be given for the mixin itself: it is not mapped, so it has no `is_deleted` column
+    to build the condition from. The models are imported lazily (eg: by `route_setup`), so the criteria
+    are rebuilt whenever new tables got registered.
+    """
+    global _soft_delete_options  # pylint: disable=global-statement
+    tables, options = _soft_delete_options
+    if tables != len(SQLModel.metadata.tables):
+        models, pending = [], list(SoftDeleteMixin.__subclasses__())
+        while pending:
+            model = pending.pop()
+            pending.extend(model.__subclasses__())
+            if inspect(model, raiseerr=False) is not None and model not in models:
+                models.append(model)
+        options = tuple(
+            with_loader_criteria(model, model.is_deleted == false(), include_aliases=True) for model in models
+        )
+        _soft_delete_options = (len(SQLModel.metadata.tables), options)
+    return options
+
+
+@event.listens_for(ORMSession, "do_orm_execute")
+def _filter_soft_deleted(execute_state: ORMExecuteState):
+    """
+    Add `is_deleted = false` for every `SoftDeleteMixin` model of an ORM select,
+    so the services do not need to repeat the condition in every query.
+    Attribute refreshes and relationship loads of already loaded rows are left untouched.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        execute_state.statement = execute_state.statement.options(*_soft_delete_criteria())
+
+
+@event.listens_for(ORMSession, "after_commit")
+@event.listens_for(ORMSession, "after_rollback")
+def _flush_identity_invalidations(session: ORMSession):
+    """
+    Second pass of `BaseModel._invalidate_identity`, once the writes are visible to the other sessions
+    """
+    for cache, ids in session.info.pop(_PENDING_INVALIDATIONS, []):
+        for id in ids:  # pylint: disable=redefined-builtin
+            cache.delete(id)
+
+
+def search_document(column: Column, row: str = "") -> str:
+    """
+    SQL expression of the tsvector stored in the `search_vector` column, `row` prefixes the text columns (eg: `NEW.`)
+    """
+    document = " || ' ' || ".join(f"coalesce({row}{name}, '')" for name in column.info["document"])
+    return f"to_tsvector('{SEARCH_CONFIG}', {document})"
+
+
+def search_vector_ddl(column: Column) -> list[str]:
+    """
+    Statements (re)creating the trigger which fills the `search_vector` column on insert and on update of its text
+    """
+    table = column.table.name
+    function = f"{table}_search_vector"
+    return [
+        f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger LANGUAGE plpgsql AS "
+        f"$$ BEGIN NEW.search_vector := {search_document(column, 'NEW.')}; RETURN NEW; END $$",
+        f"DROP TRIGGER IF EXISTS {function} ON {table}",
+        f"CREATE TRIGGER {function} BEFORE INSERT OR UPDATE OF {', '.join(column.info['document'])} ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {function}()",
+    ]
+
+
+def add_search_vector(model: type, *columns: str) -> Column:
+    """
+    Add a `search_vector` tsvector column over the text `columns` of the model, with a GIN index
+
+    A trigger keeps the column up to date on every write. It is added to the table only, not mapped on
+    the model, so loading rows does not carry it around. Query it through `model.__table__.c.search_vector`.
+    The index of a `SoftDeleteMixin` table only covers its live rows, like `live_index`.
+
+    New tables get all of it from `create_all`. Existing tables get the column and the trigger on startup,
+    their rows are backfilled and the index built by a manual migration, see `api.db.migrations`.
+    """
+    table = model.__table__
+    column = Column("search_vector", TSVECTOR, info={"document": list(columns)})
+    table.append_column(column)
+    for statement in search_vector_ddl(column):
+        event.listen(table, "after_create", DDL(statement))
+    where = {"postgresql_where": text("is_deleted = false")} if issubclass(model, SoftDeleteMixin) else {}
+    # built CONCURRENTLY by the migration on existing tables, `initiate` leaves it out
+    Index(
+        f"ix_{model.__tablename__}_search_vector",
+        column,
+        postgresql_using="gin",
+        info={MIGRATION_MANAGED: True},
+        **where,
+    )
+    SEARCH_VECTORS.append(column)
+    return column
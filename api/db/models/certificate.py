@@ -5,7 +5,7 @@ from sqlmodel import Field, SQLModel, Relationship
 from sqlalchemy import Column, DateTime
 from sqlalchemy.sql import func
 
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -27,6 +27,11 @@ class CertificateBase(SQLModel):
 
 class Certificate(BaseModel, CertificateBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__: ClassVar[str] = "certificates"
+    __table_args__ = (
+        # keyset pagination of the certificates of a user, and the lookup by module quiz
+        live_index("ix_certificates_live_user_id_created_at_id", "user_id", "created_at", "id"),
+        live_index("ix_certificates_live_module_quiz_id", "module_quiz_id"),
+    )
 
     user: "User" = Relationship(back_populates="certificates")
     module_quiz: "ModuleQuiz" = Relationship(back_populates="certificates")  # Match "certificates" in ModuleQuiz
@@ -1,21 +1,28 @@
 from uuid import UUID
 from typing import TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from sqlalchemy import Index
+from api.db.counters import FLUSH_INTERVAL_MS, FLUSH_THRESHOLD, CounterBuffer, counters
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, add_search_vector, live_index
 
 if TYPE_CHECKING:
     from .user import User
     from .post import Post
 
 class CommentBase(SQLModel):
-    like_count: int = Field(default=0, description="Number of likes on the comment")
     comment: str = Field(..., description="Text of the comment", nullable=False)
     
 
 
 class Comment(BaseModel, CommentBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "comments"
+    __table_args__ = (
+        # keyset pagination of the comments of a post
+        live_index("ix_comments_live_post_id_created_at_id", "post_id", "created_at", "id"),
+    )
 
+    # only moved by the likes, see `add_like` and `recount_likes`
+    like_count: int = Field(default=0, description="Number of likes on the comment")
     post_id: UUID = Field(..., foreign_key="posts.id", description="ID of the associated post")
     user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user who created the comment")
     user: "User" = Relationship(back_populates="comments")
@@ -23,3 +30,31 @@ class Comment(BaseModel, CommentBase, IdMixin, TimestampMixin, SoftDeleteMixin,
 
     def __repr__(self):
         return f"<Comment (id: {self.id}, post_id: {self.post_id}, user_id: {self.user_id})>"
+
+
+# full text search over the comments, see `SearchService`
+add_search_vector(Comment, "comment")
+
+
+class CommentLike(BaseModel, IdMixin, TimestampMixin, table=True):
+    """
+    A like of a user on a comment, `Comment.like_count` counts these rows
+    """
+
+    __tablename__ = "comment_likes"
+    __table_args__ = (
+        # a user likes a comment once, also the conflict target of the like insert
+        Index("ux_comment_likes_comment_id_user_id", "comment_id", "user_id", unique=True),
+    )
+
+    comment_id: UUID = Field(..., foreign_key="comments.id", ondelete="CASCADE", description="ID of the liked comment")
+    user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user who liked the comment")
+
+    def __repr__(self):
+        return f"<CommentLike (comment_id: {self.comment_id}, user_id: {self.user_id})>"
+
+
+# Likes of hot comments are counted in memory and written in batches, see `CounterBuffer`
+comment_like_counter = counters.register(
+    CounterBuffer("comment_likes", Comment.like_count, FLUSH_INTERVAL_MS, FLUSH_THRESHOLD)
+)
@@ -1,7 +1,9 @@
-from typing import TYPE_CHECKING, Optional, List
+from typing import TYPE_CHECKING, ClassVar, Optional, List
 from sqlmodel import Field, SQLModel, Relationship, AutoString
+from sqlalchemy import Index
 from uuid import UUID
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from api.utils.cache import TTLCache
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, add_search_vector, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -13,6 +15,11 @@ class ForumBase(SQLModel):
 
 class Forum(BaseModel, ForumBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "forums"
+    __table_args__ = (
+        # keyset pagination of the forums list
+        live_index("ix_forums_live_created_at_id", "created_at", "id"),
+    )
+    identity_cache: ClassVar[TTLCache] = TTLCache("forums", maxsize=1_000, ttl=300)
 
     # Use string-based relationship references
     forum_members: List["ForumMember"] = Relationship(back_populates="forum", sa_relationship_kwargs={"cascade": "all, delete"})
@@ -27,6 +34,11 @@ class ForumMemberBase(SQLModel):
 
 class ForumMember(BaseModel, ForumMemberBase, IdMixin, table=True):
     __tablename__ = "forum_members"
+    __table_args__ = (
+        # a user joins a forum once, also the conflict target of the bulk member upsert.
+        # Existing duplicates are removed before it is created, see `api.db.migrations`
+        Index("ux_forum_members_forum_id_user_id", "forum_id", "user_id", unique=True),
+    )
 
     # Use string-based relationship references
     forum: "Forum" = Relationship(back_populates="forum_members")
@@ -43,10 +55,18 @@ class ForumMessageBase(SQLModel):
 
 class ForumMessage(BaseModel, ForumMessageBase, IdMixin, TimestampMixin, table=True):
     __tablename__ = "forum_messages"
+    __table_args__ = (
+        # keyset pagination of the messages of a forum
+        Index("ix_forum_messages_forum_id_created_at_id", "forum_id", "created_at", "id"),
+    )
 
     # Use string-based relationship references
     forum: "Forum" = Relationship(back_populates="forum_messages")
     user: "User" = Relationship(back_populates="forum_messages")
 
     def __repr__(self):
-        return f"<ForumMessage (id: {self.id}, forum_id: {self.forum_id}, user_id: {self.user_id})>"
\ No newline at end of file
+        return f"<ForumMessage (id: {self.id}, forum_id: {self.forum_id}, user_id: {self.user_id})>"
+
+
+# full text search over the forum messages, see `SearchService`
+add_search_vector(ForumMessage, "message")
@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -13,6 +13,11 @@ class GameScoreBase(SQLModel):
 
 class GameScore(BaseModel, GameScoreBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "game_scores"
+    __table_args__ = (
+        # keyset pagination of the scores of a user and of a game, also the user totals
+        live_index("ix_game_scores_live_user_id_created_at_id", "user_id", "created_at", "id"),
+        live_index("ix_game_scores_live_game_name_created_at_id", "game_name", "created_at", "id"),
+    )
 
     user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user who achieved the score")
     user: "User" = Relationship(back_populates="game_scores")
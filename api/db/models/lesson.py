@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -12,6 +12,11 @@ class LessonQuizBase(SQLModel):
 
 class LessonQuiz(BaseModel, LessonQuizBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "lesson_quizzes"
+    __table_args__ = (
+        # keyset pagination of the quizzes of a user, and the (user, lesson) lookup on create
+        live_index("ix_lesson_quizzes_live_user_id_created_at_id", "user_id", "created_at", "id"),
+        live_index("ix_lesson_quizzes_live_user_id_lesson_name", "user_id", "lesson_name"),
+    )
 
     user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user")
     
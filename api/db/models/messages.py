@@ -1,7 +1,7 @@
 from uuid import UUID
 from typing import TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -14,6 +14,11 @@ class MessageBase(SQLModel):
 
 class Message(BaseModel, MessageBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "messages"
+    __table_args__ = (
+        # the messages of a user are the ones they sent or received, Postgres combines both with a BitmapOr
+        live_index("ix_messages_live_sender_id_created_at_id", "sender_id", "created_at", "id"),
+        live_index("ix_messages_live_receiver_id_created_at_id", "receiver_id", "created_at", "id"),
+    )
 
     sender: "User" = Relationship(sa_relationship_kwargs={"foreign_keys": "[Message.sender_id]"})
     receiver: "User" = Relationship(sa_relationship_kwargs={"foreign_keys": "[Message.receiver_id]"})
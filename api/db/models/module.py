@@ -1,8 +1,10 @@
 from datetime import datetime  # Remove timezone import
 from uuid import UUID
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 from sqlmodel import Field, SQLModel, Relationship
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from api.utils.cache import TTLCache
+from api.db.counters import FLUSH_INTERVAL_MS, FLUSH_THRESHOLD, CounterBuffer, counters
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -20,8 +22,20 @@ class ModuleQuizBase(SQLModel):
 
 class ModuleQuiz(BaseModel, ModuleQuizBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "module_quizzes"
-    
+    __table_args__ = (
+        # keyset pagination of the quizzes of a user, and the (user, module) lookup on create
+        live_index("ix_module_quizzes_live_user_id_created_at_id", "user_id", "created_at", "id"),
+        live_index("ix_module_quizzes_live_user_id_module_name", "user_id", "module_name"),
+    )
+    identity_cache: ClassVar[TTLCache] = TTLCache("module_quizzes", maxsize=10_000, ttl=60)
+
     user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user")
     
     user: "User" = Relationship(back_populates="module_quizzes")
-    certificates: "Certificate" = Relationship(back_populates="module_quiz")
\ No newline at end of file
+    certificates: "Certificate" = Relationship(back_populates="module_quiz")
+
+
+# Progress reported by polling VR clients is written in batches, capped like `increment_module_progress` caps it
+module_progress_counter = counters.register(
+    CounterBuffer("module_progress", ModuleQuiz.module_progress, FLUSH_INTERVAL_MS, FLUSH_THRESHOLD, cap=1)
+)
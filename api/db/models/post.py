@@ -1,7 +1,12 @@
+import re
+from datetime import datetime
 from uuid import UUID
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar, Optional
 from sqlmodel import Field, SQLModel, Relationship
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from sqlalchemy import Index
+from api.utils.cache import TTLCache
+from api.db.counters import FLUSH_INTERVAL_MS, FLUSH_THRESHOLD, CounterBuffer, counters
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, add_search_vector, live_index
 
 if TYPE_CHECKING:
     from .user import User
@@ -12,12 +17,21 @@ class PostBase(SQLModel):
     description: str = Field(..., description="Description of the post", nullable=False)
     hashtag: str = Field(None, description="Hashtags associated with the post", nullable=True)
     image_url: str = Field(None, description="URL of the uploaded image", nullable=True)
-    like_count: int = Field(default=0, description="Number of likes on the post")
 
 
 class Post(BaseModel, PostBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "posts"
+    __table_args__ = (
+        # keyset pagination of the feed and of the posts of a user
+        live_index("ix_posts_live_created_at_id", "created_at", "id"),
+        live_index("ix_posts_live_user_id_created_at_id", "user_id", "created_at", "id"),
+        # keyset pagination of the feed ranked by likes
+        live_index("ix_posts_live_like_count_created_at_id", "like_count", "created_at", "id"),
+    )
+    identity_cache: ClassVar[TTLCache] = TTLCache("posts", maxsize=10_000, ttl=30)
 
+    # only moved by the likes, see `add_like` and `recount_likes`
+    like_count: int = Field(default=0, description="Number of likes on the post")
     user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user who created the post")
     user: "User" = Relationship(back_populates="posts")
     comments: list["Comment"] = Relationship(
@@ -25,4 +39,98 @@ class Post(BaseModel, PostBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=
 )
 
     def __repr__(self):
-        return f"<Post (id: {self.id}, title: {self.title}, user_id: {self.user_id})>"
\ No newline at end of file
+        return f"<Post (id: {self.id}, title: {self.title}, user_id: {self.user_id})>"
+
+
+# full text search over the posts, see `SearchService`
+add_search_vector(Post, "title", "description")
+
+
+class PostLike(BaseModel, IdMixin, TimestampMixin, table=True):
+    """
+    A like of a user on a post, `Post.like_count` counts these rows
+    """
+
+    __tablename__ = "post_likes"
+    __table_args__ = (
+        # a user likes a post once, also the conflict target of the like insert
+        Index("ux_post_likes_post_id_user_id", "post_id", "user_id", unique=True),
+    )
+
+    post_id: UUID = Field(..., foreign_key="posts.id", ondelete="CASCADE", description="ID of the liked post")
+    user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user who liked the post")
+
+    def __repr__(self):
+        return f"<PostLike (post_id: {self.post_id}, user_id: {self.user_id})>"
+
+
+# Tags of a post beyond these are ignored, and so are longer tags
+MAX_HASHTAGS = 30
+MAX_HASHTAG_LENGTH = 64
+
+
+def parse_hashtags(text: Optional[str]) -> set[str]:
+    """
+    Hashtags of the free-form `Post.hashtag`, eg: "#Doping #antiDoping" or "doping, sports"
+
+    With any `#` in the text only the `#words` are tags, else every word is. Tags are lowercased.
+    """
+    if not text:
+        return set()
+    words = re.findall(r"#(\w+)", text) if "#" in text else re.findall(r"\w+", text)
+    tags = {word.lower() for word in words if len(word) <= MAX_HASHTAG_LENGTH}
+    return set(sorted(tags)[:MAX_HASHTAGS])
+
+
+class PostHashtag(BaseModel, IdMixin, TimestampMixin, table=True):
+    """
+    A hashtag of a post, parsed from `Post.hashtag` on create and update
+
+    - 'tag': The hashtag lowercased, without the `#`
+    - 'post_created_at': Creation time of the post, so the posts of a tag are paginated on this table's index alone
+    - 'created_at': When the tag was added, the hour it is counted in by `HashtagCount`
+    """
+
+    __tablename__ = "post_hashtags"
+    __table_args__ = (
+        # keyset pagination of the posts of a tag, newest first
+        Index("ix_post_hashtags_tag_post_created_at_post_id", "tag", "post_created_at", "post_id"),
+        # a post carries a tag once
+        Index("ux_post_hashtags_post_id_tag", "post_id", "tag", unique=True),
+    )
+
+    post_id: UUID = Field(..., foreign_key="posts.id", ondelete="CASCADE", description="ID of the tagged post")
+    tag: str = Field(..., max_length=64, description="Hashtag, lowercased and without the `#`")
+    post_created_at: datetime = Field(..., description="Creation time of the tagged post")
+
+    def __repr__(self):
+        return f"<PostHashtag (post_id: {self.post_id}, tag: {self.tag})>"
+
+
+class HashtagCount(BaseModel, IdMixin, table=True):
+    """
+    Uses of a hashtag per hour, kept up to date as posts are tagged and untagged
+
+    The trending hashtags sum the last hours of this small table, instead of scanning `post_hashtags`.
+    """
+
+    __tablename__ = "hashtag_counts"
+    __table_args__ = (
+        # conflict target of the count upsert
+        Index("ux_hashtag_counts_tag_bucket", "tag", "bucket", unique=True),
+        # rolling window of the trending hashtags
+        Index("ix_hashtag_counts_bucket", "bucket"),
+    )
+
+    tag: str = Field(..., max_length=64, description="Hashtag, lowercased and without the `#`")
+    bucket: datetime = Field(..., description="Start of the hour counted")
+    count: int = Field(default=0, description="Posts tagged during the hour, less the ones untagged since")
+
+    def __repr__(self):
+        return f"<HashtagCount (tag: {self.tag}, bucket: {self.bucket}, count: {self.count})>"
+
+
+# Likes of hot posts are counted in memory and written in batches, see `CounterBuffer`
+post_like_counter = counters.register(
+    CounterBuffer("post_likes", Post.like_count, FLUSH_INTERVAL_MS, FLUSH_THRESHOLD)
+)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlmodel import Field, SQLModel, AutoString
+from sqlalchemy import Index
+from .base import IdMixin, TimestampMixin, BaseModel
+
+
+class RefreshTokenBase(SQLModel):
+    user_id: UUID = Field(..., foreign_key="users.id", description="ID of the user the token was issued to")
+    token_hash: str = Field(
+        ..., description="SHA-256 of the token, the token itself is never stored", nullable=False, sa_type=AutoString
+    )
+    device_id: Optional[str] = Field(None, description="Device the token was issued to, eg: a headset serial")
+    expires_at: datetime = Field(..., description="Time after which the token can no longer be used")
+    revoked_at: Optional[datetime] = Field(None, description="Time the token was rotated or revoked")
+
+
+class RefreshToken(BaseModel, RefreshTokenBase, IdMixin, TimestampMixin, table=True):
+    __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # lookup of a presented token
+        Index("ux_refresh_tokens_token_hash", "token_hash", unique=True),
+        # revocation of all the tokens of a user / device
+        Index("ix_refresh_tokens_user_id_device_id", "user_id", "device_id"),
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken (id: {self.id}, user_id: {self.user_id}, device_id: {self.device_id})>"
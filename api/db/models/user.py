@@ -1,8 +1,9 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, ClassVar, Optional
 from enum import Enum
 from sqlmodel import Field, SQLModel, AutoString, Relationship
 from pydantic import EmailStr
-from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel
+from api.utils.cache import TTLCache
+from .base import IdMixin, TimestampMixin, SoftDeleteMixin, BaseModel, live_index
 
 if TYPE_CHECKING:
     from .post import Post
@@ -43,6 +44,11 @@ class UserBase(SQLModel):
 
 class User(BaseModel, UserBase, IdMixin, TimestampMixin, SoftDeleteMixin, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # keyset pagination of the users list
+        live_index("ix_users_live_created_at_id", "created_at", "id"),
+    )
+    identity_cache: ClassVar[TTLCache] = TTLCache("users", maxsize=10_000, ttl=60)
 
     posts: list["Post"] = Relationship(
         back_populates="user", sa_relationship_kwargs={"cascade": "all, delete"}
@@ -76,6 +76,14 @@ TAGS_METADATA: list[dict] = [  # for better documentation in openapi spec
         "name": "Alert",
         "description": "Endpoint for alerts",
     },
+    {
+        "name": "Export",
+        "description": "Endpoints to download the data of a user",
+    },
+    {
+        "name": "Search",
+        "description": "Full text search over posts, comments and forum messages",
+    },
 ]
 
 
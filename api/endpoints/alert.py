@@ -1,7 +1,7 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from api.services import AlertService
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.interfaces.alert import AlertRead, AlertCreate
 from datetime import datetime
 import pytz  # To handle timezone conversion
@@ -18,11 +18,13 @@ async def get_alert(alert_id: UUID, service: AlertService = Depends(get_alert_se
     return await service.get_alert(alert_id)
 # Endpoint to get all alerts for a specific user
 @alert_router.get("", response_model=List[AlertRead])
-async def get_alerts(user_id: UUID, service: AlertService = Depends(get_alert_service)):
+async def get_alerts(
+    user_id: UUID, page: PageParams = Depends(), service: AlertService = Depends(get_alert_service)
+):
     """
-    Endpoint to get a list of alerts for a specific user
+    Endpoint to get a page of alerts for a specific user
     """
-    return await service.get_alerts_for_user(user_id)
+    return await service.get_alerts_for_user(user_id, page)
 # Endpoint to create a new alert
 @alert_router.post("", status_code=status.HTTP_201_CREATED, response_model=AlertRead)
 async def create_alert(info: AlertCreate, user_id: UUID, service: AlertService = Depends(get_alert_service)):
@@ -39,7 +41,9 @@ async def create_alert(info: AlertCreate, user_id: UUID, service: AlertService =
 # Endpoint to get upcoming alerts that are scheduled to be displayed
 @alert_router.get("/upcoming", response_model=List[AlertRead])
 async def get_upcoming_alerts(
-    current_time: datetime = datetime.now(), service: AlertService = Depends(get_alert_service)
+    current_time: datetime = datetime.now(),
+    page: PageParams = Depends(),
+    service: AlertService = Depends(get_alert_service),
 ):
     """
     Endpoint to get alerts that are scheduled for the current time or later
@@ -48,16 +52,19 @@ async def get_upcoming_alerts(
     if current_time.tzinfo is not None:
         current_time = current_time.astimezone(pytz.UTC)  # Convert to UTC
         current_time = current_time.replace(tzinfo=None)  # Make naive (remove timezone info)
-    return await service.get_upcoming_alerts(current_time)
+    return await service.get_upcoming_alerts(current_time, page)
 
 
 @alert_router.get("/user/{user_id}", response_model=List[AlertRead])
-async def get_alerts_by_user(user_id: UUID, service: AlertService = Depends(get_alert_service)):
+async def get_alerts_by_user(
+    user_id: UUID, page: PageParams = Depends(), service: AlertService = Depends(get_alert_service)
+):
     """
-    Endpoint to get all alerts for a specific user by user_id.
+    Endpoint to get a page of alerts for a specific user by user_id.
     Args:
     - user_id (UUID): The ID of the user.
+    - page (PageParams): Cursor and size of the page.
     Returns:
-    - List[AlertRead]: List of alerts belonging to the user.
+    - List[AlertRead]: Page of alerts belonging to the user.
     """
-    return await service.get_alerts_by_user_id(user_id)
+    return await service.get_alerts_by_user_id(user_id, page)
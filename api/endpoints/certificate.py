@@ -4,6 +4,7 @@ from fastapi.responses import FileResponse
 from datetime import datetime 
 from api.services import CertificateService
 from api.interfaces.certificate import CertificateCreate, CertificateRead
+from api.interfaces.utils import PageParams
 
 certificate_router = APIRouter(prefix="/certificates")
 
@@ -20,12 +21,13 @@ async def create_certificate(
 @certificate_router.get("/user/{user_id}")
 async def get_user_certificates(
     user_id: UUID,
+    page: PageParams = Depends(),
     service: CertificateService = Depends(CertificateService)
 ):
     """
-    Retrieve all certificates for a specific user.
+    Retrieve a page of certificates for a specific user.
     """
-    return await service.get_certificates_by_user(user_id)
+    return await service.get_certificates_by_user(user_id, page)
 
 @certificate_router.get("/{certificate_id}/download")
 async def download_certificate(
@@ -1,7 +1,9 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 import httpx
 import re
+from api.utils.http import http_clients
+from api.utils.rate_limit import CHAT_POLICY, RateLimit
 
 # Define the request body model
 class MessageRequest(BaseModel):
@@ -15,19 +17,19 @@ def sanitize_message(message: str) -> str:
     return re.sub(r'[^\x00-\x7F]+', '', message)
 
 # Define the chatbot response endpoint
-@chat_router.post("/")
+@chat_router.post("/", dependencies=[Depends(RateLimit(CHAT_POLICY))])
 async def chatbot_response(request: MessageRequest):
     external_url="https://web-production-38420.up.railway.app/api/api1/"
     sanitized_message = sanitize_message(request.message)  # Sanitize the incoming message
     data = {"message": sanitized_message}  # Prepare data to be sent to the external service
 
-    # Send the sanitized message to the external service using httpx
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(external_url, json=data, headers={"Content-Type": "application/json"})
-            response.raise_for_status()  # Check if response status is ok
-            return {"response_text": response.json().get("response_text", "No response text")}
-        except httpx.RequestError as e:
-            return {"error": "RequestError", "message": str(e), "payload": data}
-        except httpx.HTTPStatusError as e:
-            return {"error": "HTTPStatusError", "status_code": e.response.status_code, "response_body": e.response.text, "payload": data}
\ No newline at end of file
+    # Send the sanitized message to the external service on the shared, pooled chatbot client
+    client = http_clients.get("chatbot")
+    try:
+        response = await client.post(external_url, json=data, headers={"Content-Type": "application/json"})
+        response.raise_for_status()  # Check if response status is ok
+        return {"response_text": response.json().get("response_text", "No response text")}
+    except httpx.RequestError as e:
+        return {"error": "RequestError", "message": str(e), "payload": data}
+    except httpx.HTTPStatusError as e:
+        return {"error": "HTTPStatusError", "status_code": e.response.status_code, "response_body": e.response.text, "payload": data}
\ No newline at end of file
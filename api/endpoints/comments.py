@@ -2,7 +2,8 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from api.services import CommentService
 from api.interfaces.comments import CommentRead, CommentCreate, CommentUpdate
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
+from api.utils.auth import CurrentUserId
 
 comments_router = APIRouter(prefix="/comments")
 
@@ -16,11 +17,13 @@ async def get_comment(comment_id: UUID, service: CommentService = Depends(Commen
 
 
 @comments_router.get("/post/{post_id}", response_model=List[CommentRead])
-async def get_comments_for_post(post_id: UUID, service: CommentService = Depends(CommentService)):
+async def get_comments_for_post(
+    post_id: UUID, page: PageParams = Depends(), service: CommentService = Depends(CommentService)
+):
     """
-    Endpoint to get all comments for a particular post
+    Endpoint to get a page of comments for a particular post
     """
-    return await service.get_comments_for_post(post_id)
+    return await service.get_comments_for_post(post_id, page)
 
 
 @comments_router.post("", status_code=status.HTTP_201_CREATED, response_model=CommentRead)
@@ -48,8 +51,20 @@ async def update_comment(comment_id: UUID, info: CommentUpdate, service: Comment
 
 
 @comments_router.post("/{comment_id}/like", response_model=CommentRead)
-async def increment_like_count(comment_id: UUID, service: CommentService = Depends(CommentService)):
+async def increment_like_count(
+    comment_id: UUID, user_id: CurrentUserId, service: CommentService = Depends(CommentService)
+):
     """
-    Endpoint to increment the like count for a comment
+    Endpoint to like a comment as the user of the bearer token, a user's like is counted once
     """
-    return await service.increment_like_count(comment_id)
+    return await service.increment_like_count(comment_id, user_id)
+
+
+@comments_router.post("/{comment_id}/unlike", response_model=CommentRead)
+async def decrement_like_count(
+    comment_id: UUID, user_id: CurrentUserId, service: CommentService = Depends(CommentService)
+):
+    """
+    Endpoint to take back the like of the user of the bearer token on a comment
+    """
+    return await service.decrement_like_count(comment_id, user_id)
@@ -0,0 +1,31 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from api.services import ExportService
+from api.services.export import MEDIA_TYPES
+from api.interfaces.export import ExportFormat, ExportResource
+from api.utils.auth import CurrentUserId
+from api.utils.exceptions import ACLDenied
+
+export_router = APIRouter(prefix="/export")
+
+
+@export_router.get("/users/{user_id}/{resource}")
+async def export_user_data(
+    user_id: UUID,
+    resource: ExportResource,
+    current_user_id: CurrentUserId,
+    format: ExportFormat = ExportFormat.NDJSON,  # pylint: disable=redefined-builtin
+    service: ExportService = Depends(ExportService),
+):
+    """
+    Endpoint to download all the posts, comments, messages, game scores or certificates of a user
+    The rows are streamed as NDJSON (default) or CSV, whatever their number. Users only export their own data.
+    """
+    if current_user_id != user_id:
+        raise ACLDenied(resource.value)
+    return StreamingResponse(
+        service.export_user_data(resource, user_id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{resource.value}-{user_id}.{format.value}"'},
+    )
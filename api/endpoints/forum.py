@@ -2,12 +2,14 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from api.utils.exceptions import NotFoundError, HTTPException
 from api.services import ForumService
-from api.interfaces.utils import List
+from api.utils.etag import ConditionalGet
+from api.interfaces.utils import List, PageParams
 from api.interfaces.forum import (
     ForumCreate, 
     ForumRead, 
     ForumMemberCreate, 
     ForumMemberRead, 
+    ForumMembersCreate, 
     ForumMessageCreate, 
     ForumMessageRead
 )
@@ -28,6 +30,13 @@ async def add_forum_member(info: ForumMemberCreate, service: ForumService = Depe
     """
     return await service.add_forum_member(info)
 
+@forum_router.post("/{forum_id}/members/bulk", status_code=status.HTTP_201_CREATED, response_model=List[ForumMemberRead])
+async def add_forum_members(forum_id: UUID, info: ForumMembersCreate, service: ForumService = Depends(ForumService)):
+    """
+    Add many users to a forum at once. Returns the members which were newly added.
+    """
+    return await service.add_forum_members(forum_id, info)
+
 @forum_router.post("/messages", status_code=status.HTTP_201_CREATED, response_model=ForumMessageRead)
 async def send_forum_message(info: ForumMessageCreate, service: ForumService = Depends(ForumService)):
     """
@@ -36,25 +45,32 @@ async def send_forum_message(info: ForumMessageCreate, service: ForumService = D
     return await service.send_forum_message(info)
 
 @forum_router.get("/{forum_id}/members", response_model=List[ForumMemberRead])
-async def get_forum_members(forum_id: UUID, service: ForumService = Depends(ForumService)):
+async def get_forum_members(
+    forum_id: UUID, page: PageParams = Depends(), service: ForumService = Depends(ForumService)
+):
     """
-    Get all members of a specific forum.
+    Get a page of members of a specific forum.
     """
-    return await service.get_forum_members(forum_id)
+    return await service.get_forum_members(forum_id, page)
 
 @forum_router.get("/{forum_id}/messages", response_model=List[ForumMessageRead])
-async def get_forum_messages(forum_id: UUID, service: ForumService = Depends(ForumService)):
+async def get_forum_messages(
+    forum_id: UUID, page: PageParams = Depends(), service: ForumService = Depends(ForumService)
+):
     """
-    Get all messages in a specific forum.
+    Get a page of messages in a specific forum.
     """
-    return await service.get_forum_messages(forum_id)
+    return await service.get_forum_messages(forum_id, page)
 
 @forum_router.get("", response_model=List[ForumRead])
-async def list_forums(service: ForumService = Depends(ForumService)):
+async def list_forums(
+    page: PageParams = Depends(), conditional: ConditionalGet = Depends(), service: ForumService = Depends(ForumService)
+):
     """
-    List all forums.
+    List a page of forums.
+    Answers 304 when `If-None-Match` holds the ETag of the same page.
     """
-    return await service.list_forums()
+    return conditional.check_body(await service.list_forums(page))
 
 @forum_router.delete("/{forum_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_forum(forum_id: UUID, service: ForumService = Depends(ForumService)):
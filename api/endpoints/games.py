@@ -1,7 +1,8 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from api.services import GameScoreService
-from api.interfaces.utils import List
+from api.utils.etag import ConditionalGet
+from api.interfaces.utils import List, PageParams
 from api.interfaces.games import GameScoreRead, GameScoreCreate, LeaderboardEntry
 
 games_router = APIRouter(prefix="/game-scores")
@@ -14,25 +15,32 @@ async def record_score(info: GameScoreCreate, service: GameScoreService = Depend
     return await service.record_score(info)
 
 @games_router.get("/user/{user_id}", response_model=List[GameScoreRead])
-async def get_user_scores(user_id: UUID, service: GameScoreService = Depends(GameScoreService)):
+async def get_user_scores(
+    user_id: UUID, page: PageParams = Depends(), service: GameScoreService = Depends(GameScoreService)
+):
     """
-    Get all scores for a specific user
+    Get a page of scores for a specific user
     """
-    return await service.get_user_scores(user_id)
+    return await service.get_user_scores(user_id, page)
 
 @games_router.get("/game/{game_name}", response_model=List[GameScoreRead])
-async def get_game_scores(game_name: str, service: GameScoreService = Depends(GameScoreService)):
+async def get_game_scores(
+    game_name: str, page: PageParams = Depends(), service: GameScoreService = Depends(GameScoreService)
+):
     """
-    Get all scores for a specific game
+    Get a page of scores for a specific game
     """
-    return await service.get_game_scores(game_name)
+    return await service.get_game_scores(game_name, page)
 
 @games_router.get("/leaderboard", response_model=List[LeaderboardEntry])
-async def get_leaderboard(service: GameScoreService = Depends(GameScoreService)):
+async def get_leaderboard(
+    conditional: ConditionalGet = Depends(), service: GameScoreService = Depends(GameScoreService)
+):
     """
     Get the global leaderboard
+    Answers 304 when `If-None-Match` holds the ETag of the current standings
     """
-    return await service.get_leaderboard()
+    return conditional.check_body(await service.get_leaderboard())
 
 @games_router.get("/user/{user_id}/total", response_model=dict)
 async def get_user_total(user_id: UUID, service: GameScoreService = Depends(GameScoreService)):
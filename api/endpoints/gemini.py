@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional
 from ..services.gemini import GeminiService  # Adjusted to use the new GeminiService
+from ..utils.rate_limit import GEMINI_POLICY, RateLimit
 
 gemini_router = APIRouter()
 
-@gemini_router.get("/gemini", summary="Fetch Gemini model results")
+@gemini_router.get(
+    "/gemini", summary="Fetch Gemini model results", dependencies=[Depends(RateLimit(GEMINI_POLICY))]
+)
 async def get_gemini_response(prompt: str, max_tokens: int = Query(100, description="Maximum number of tokens for the response")):
     try:
         # Use the GeminiService to get the response
@@ -1,6 +1,18 @@
 from fastapi import APIRouter
 
-from api.interfaces import PingResponse, HealthResponse
+from api.db.counters import counters
+from api.db.session import pool_stats
+from api.utils.cache import cache_stats
+from api.utils.http import http_clients
+from api.utils.passwords import password_hasher
+from api.interfaces import (
+    PingResponse,
+    HealthResponse,
+    DatabaseHealthResponse,
+    HashingHealthResponse,
+    UpstreamStats,
+    CounterStats,
+)
 
 health_router = APIRouter(prefix="")
 # health_router = APIRouter(prefix="", include_in_schema=False)
@@ -22,3 +34,40 @@ async def health() -> PingResponse:
     """
     # add the health info for DB and other services later when they are added
     return {"api": "OK"}
+
+
+@health_router.get("/health/db", response_model=DatabaseHealthResponse)
+async def health_db() -> DatabaseHealthResponse:
+    """
+    Endpoint to check the connection pool usage of the worker serving the request
+    Use these numbers to size `DB_POOL_SIZE` and `DB_MAX_OVERFLOW` per worker,
+    along with the hit ratio of the caches in front of the DB
+    """
+    return {"db": "OK", **pool_stats(), "caches": cache_stats()}
+
+
+@health_router.get("/health/hashing", response_model=HashingHealthResponse)
+async def health_hashing() -> HashingHealthResponse:
+    """
+    Endpoint to check the password hashing pool of the worker serving the request
+    A growing `queued` or any `rejected` means `PASSWORD_HASH_WORKERS` is too low for the login load
+    """
+    return password_hasher.stats()
+
+
+@health_router.get("/health/upstreams", response_model=dict[str, UpstreamStats])
+async def health_upstreams() -> dict[str, UpstreamStats]:
+    """
+    Endpoint to check the outbound HTTP clients of the worker serving the request, by upstream
+    Latency and errors of the upstream services, along with the usage of their connection pools
+    """
+    return http_clients.stats()
+
+
+@health_router.get("/health/counters", response_model=dict[str, CounterStats])
+async def health_counters() -> dict[str, CounterStats]:
+    """
+    Endpoint to check the counter write buffers of the worker serving the request, by counter
+    The lag is how stale other workers may see a counter, the pending increments what a crash would lose
+    """
+    return counters.stats()
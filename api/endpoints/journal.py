@@ -13,7 +13,7 @@ async def get_doping_journals(page: int = Query(1, description="Page number for
     :return: Dictionary with journal data and pagination info
     """
     try:
-        journals = JournalService.fetch_journals(page=page)
+        journals = await JournalService.fetch_journals(page=page)
         return {
             "status": "success", 
             "data": journals, 
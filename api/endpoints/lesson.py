@@ -1,7 +1,7 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from api.services import LessonQuizService
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.interfaces.lesson import LessonQuizCreate, LessonQuizRead
 from sqlmodel import SQLModel
 
@@ -11,11 +11,13 @@ class ScoreUpdate(SQLModel):
 lesson_router = APIRouter(prefix="/lesson-quizzes")
 
 @lesson_router.get("/user/{user_id}")
-async def get_lesson_quizzes_by_user(user_id: UUID, service: LessonQuizService = Depends(LessonQuizService)):
+async def get_lesson_quizzes_by_user(
+    user_id: UUID, page: PageParams = Depends(), service: LessonQuizService = Depends(LessonQuizService)
+):
     """
-    Retrieve lesson quizzes for a specific user.
+    Retrieve a page of lesson quizzes for a specific user.
     """
-    return await service.get_lesson_quizzes_by_user(user_id)
+    return await service.get_lesson_quizzes_by_user(user_id, page)
 
 @lesson_router.get("/{lesson_quiz_id}")
 async def get_lesson_quiz_by_id(lesson_quiz_id: UUID, service: LessonQuizService = Depends(LessonQuizService)):
@@ -2,8 +2,8 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
 from api.services import MessageService
-from api.interfaces.utils import List
-from api.interfaces.messages import MessageRead, MessageCreate
+from api.interfaces.utils import List, PageParams
+from api.interfaces.messages import MessageRead, MessageCreate, ConversationMessageRead
 from sqlalchemy import select
 from api.db.models.messages import Message  # Import the Message model
 
@@ -17,18 +17,25 @@ async def send_message(info: MessageCreate, service: MessageService = Depends(Me
     return await service.send_message(info)
 
 @messages_router.get("/user/{user_id}", response_model=List[MessageRead])
-async def get_user_messages(user_id: UUID, service: MessageService = Depends(MessageService)):
+async def get_user_messages(
+    user_id: UUID, page: PageParams = Depends(), service: MessageService = Depends(MessageService)
+):
     """
-    Get all messages sent to or received by a user.
+    Get a page of messages sent to or received by a user.
     """
-    return await service.get_user_messages(user_id)
+    return await service.get_user_messages(user_id, page)
 
-@messages_router.get("/conversation", response_model=List[MessageRead])
-async def get_conversation(user1_id: UUID, user2_id: UUID, service: MessageService = Depends(MessageService)):
+@messages_router.get("/conversation", response_model=List[ConversationMessageRead])
+async def get_conversation(
+    user1_id: UUID,
+    user2_id: UUID,
+    page: PageParams = Depends(),
+    service: MessageService = Depends(MessageService),
+):
     """
-    Get all messages exchanged between two users.
+    Get a page of messages exchanged between two users.
     """
-    return await service.get_conversation(user1_id, user2_id)
+    return await service.get_conversation(user1_id, user2_id, page)
 
 @messages_router.get("/unread", response_model=dict)
 async def get_unread_messages(
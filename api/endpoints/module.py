@@ -1,7 +1,7 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from api.services import ModuleQuizService
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.interfaces.module import ModuleQuizCreate, ModuleQuizRead
 from sqlmodel import SQLModel
 
@@ -11,11 +11,13 @@ class ScoreUpdate(SQLModel):
 module_router = APIRouter(prefix="/module-quizzes")
 
 @module_router.get("/user/{user_id}")
-async def get_module_quizzes_by_user(user_id: UUID, service: ModuleQuizService = Depends(ModuleQuizService)):
+async def get_module_quizzes_by_user(
+    user_id: UUID, page: PageParams = Depends(), service: ModuleQuizService = Depends(ModuleQuizService)
+):
     """
-    Retrieve module quizzes for a specific user.
+    Retrieve a page of module quizzes for a specific user.
     """
-    return await service.get_module_quizzes_by_user(user_id)
+    return await service.get_module_quizzes_by_user(user_id, page)
 
 @module_router.get("/{module_quiz_id}")
 async def get_module_quiz_by_id(module_quiz_id: UUID, service: ModuleQuizService = Depends(ModuleQuizService)):
@@ -1,26 +1,63 @@
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from api.db.models.post import Post, post_like_counter
 from api.services import PostService
-from api.interfaces.utils import List
-from api.interfaces.post import PostRead, PostCreate, PostUpdate
+from api.services.post import TRENDING_MAX_HOURS
+from api.interfaces.utils import List, PageParams
+from api.interfaces.post import FeedPost, FeedSort, PostRead, PostCreate, PostUpdate, TrendingHashtag
+from api.utils.auth import CurrentUserId
+from api.utils.etag import RowVersion
 
 post_router = APIRouter(prefix="/posts")
 
 
-@post_router.get("/{post_id}", response_model=PostRead)
+@post_router.get("/feed", response_model=List[FeedPost])
+async def get_feed(
+    page: PageParams = Depends(), sort: FeedSort = FeedSort.RECENT, service: PostService = Depends(PostService)
+):
+    """
+    Endpoint to get a page of the feed, newest or most liked first
+    Each post comes with its author and comment count, so a page renders without further calls
+    """
+    return await service.get_feed(page, sort)
+
+
+@post_router.get("/hashtags/trending", response_model=list[TrendingHashtag])
+async def get_trending_hashtags(
+    hours: int = Query(24, ge=1, le=TRENDING_MAX_HOURS, description="Length of the rolling window, in hours"),
+    limit: int = Query(10, ge=1, le=100, description="Number of hashtags"),
+    service: PostService = Depends(PostService),
+):
+    """
+    Endpoint to get the most used hashtags of the last hours
+    """
+    return await service.get_trending_hashtags(hours, limit)
+
+
+@post_router.get(
+    "/{post_id}",
+    response_model=PostRead,
+    dependencies=[Depends(RowVersion(Post, "post_id", counters=[post_like_counter]))],
+)
 async def get_post(post_id: UUID, service: PostService = Depends(PostService)):
     """
     Endpoint to get post details
+    Answers 304 when `If-None-Match` holds the current ETag of the post
     """
     return await service.get_post(post_id)
 
 
 @post_router.get("", response_model=List[PostRead])
-async def get_posts(service: PostService = Depends(PostService)):
+async def get_posts(
+    page: PageParams = Depends(),
+    hashtag: Optional[str] = Query(None, description="Only the posts with this hashtag, eg: doping"),
+    service: PostService = Depends(PostService),
+):
     """
-    Endpoint to get a list of posts
+    Endpoint to get a page of posts, newest first
     """
-    return await service.get_posts()
+    return await service.get_posts(page, hashtag)
 
 
 @post_router.post("", status_code=status.HTTP_201_CREATED, response_model=PostRead)
@@ -47,23 +84,25 @@ async def update_post(post_id: UUID, info: PostUpdate, service: PostService = De
     return await service.update_post(post_id, info)
 
 @post_router.post("/{post_id}/like", response_model=PostRead, summary="Increment post like count")
-async def like_post(post_id: UUID, post_service: PostService = Depends(PostService)):
+async def like_post(post_id: UUID, user_id: CurrentUserId, post_service: PostService = Depends(PostService)):
     """
-    Increment the like count of a post.
+    Like a post as the user of the bearer token. A user's like is counted once.
     """
-    return await post_service.increment_like_count(post_id)
+    return await post_service.increment_like_count(post_id, user_id)
 
 
 @post_router.post("/{post_id}/unlike", response_model=PostRead, summary="Decrement post like count")
-async def unlike_post(post_id: UUID, post_service: PostService = Depends(PostService)):
+async def unlike_post(post_id: UUID, user_id: CurrentUserId, post_service: PostService = Depends(PostService)):
     """
-    Decrement the like count of a post.
+    Take back the like of the user of the bearer token on a post.
     """
-    return await post_service.decrement_like_count(post_id)
+    return await post_service.decrement_like_count(post_id, user_id)
 
 @post_router.get("/user/{user_id}", response_model=List[PostRead])
-async def get_posts_by_user(user_id: UUID, service: PostService = Depends(PostService)):
+async def get_posts_by_user(
+    user_id: UUID, page: PageParams = Depends(), service: PostService = Depends(PostService)
+):
     """
-    Endpoint to get posts created by a specific user.
+    Endpoint to get a page of posts created by a specific user.
     """
-    return await service.get_posts_by_user(user_id)
+    return await service.get_posts_by_user(user_id, page)
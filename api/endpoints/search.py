@@ -0,0 +1,21 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from api.services import SearchService
+from api.interfaces.search import SearchResult, SearchType
+from api.interfaces.utils import List, PageParams
+
+search_router = APIRouter(prefix="/search")
+
+
+@search_router.get("", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description='Search text, eg: doping -cycling "blood test"'),
+    type: Optional[SearchType] = Query(None, description="Only search posts, comments or messages"),
+    page: PageParams = Depends(),
+    service: SearchService = Depends(SearchService),
+):
+    """
+    Endpoint to search the posts, comments and forum messages, most relevant first
+    """
+    # pylint: disable=redefined-builtin
+    return await service.search(q, page, type)
@@ -1,8 +1,12 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, status
-from api.services import UserService
-from api.interfaces.utils import List
-from api.interfaces.user import UserRead, UserCreate, UserUpdate, UserLogin
+from api.services import UserService, RefreshTokenService
+from api.interfaces.utils import List, PageParams
+from api.interfaces.user import UserRead, UserListRead, UserCreate, UserUpdate, UserLogin, TokenRefresh, TokenResponse
+from api.db.models.user import User
+from api.utils.auth import CurrentUserId
+from api.utils.etag import RowVersion
+from api.utils.rate_limit import LOGIN_POLICY, RateLimit
 from fastapi import Request
 from fastapi.responses import RedirectResponse, JSONResponse
 import os
@@ -17,7 +21,7 @@ GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI", "http://localhost:8000/us
 user_router = APIRouter(prefix="/users")
 
 
-@user_router.post("/login")
+@user_router.post("/login", dependencies=[Depends(RateLimit(LOGIN_POLICY))])
 async def login(login_data: UserLogin, service: UserService = Depends(UserService)):
     """
     Endpoint for user login
@@ -25,20 +29,46 @@ async def login(login_data: UserLogin, service: UserService = Depends(UserServic
     return await service.login(login_data)
 
 
-@user_router.get("/{user_id}", response_model=UserRead)
+@user_router.post("/token/refresh", response_model=TokenResponse)
+async def refresh_token(info: TokenRefresh, service: RefreshTokenService = Depends(RefreshTokenService)):
+    """
+    Endpoint to exchange a refresh token for a new access token, without logging in again
+    The refresh token is rotated, use the new one returned for the next refresh
+    """
+    return await service.refresh(info.refresh_token)
+
+
+@user_router.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_token(info: TokenRefresh, service: RefreshTokenService = Depends(RefreshTokenService)):
+    """
+    Endpoint to revoke a refresh token, eg: on logout from a device
+    """
+    await service.revoke(info.refresh_token)
+
+
+@user_router.get("/me", response_model=UserRead)
+async def get_me(user_id: CurrentUserId, service: UserService = Depends(UserService)):
+    """
+    Endpoint to get the details of the user of the bearer token
+    """
+    return await service.get_user(user_id)
+
+
+@user_router.get("/{user_id}", response_model=UserRead, dependencies=[Depends(RowVersion(User, "user_id"))])
 async def get_user(user_id: UUID, service: UserService = Depends(UserService)):
     """
     Endpoint to get a user details
+    Answers 304 when `If-None-Match` holds the current ETag of the user
     """
     return await service.get_user(user_id)
 
 
-@user_router.get("", response_model=List[UserRead])
-async def get_users(service: UserService = Depends(UserService)):
+@user_router.get("", response_model=List[UserListRead])
+async def get_users(page: PageParams = Depends(), service: UserService = Depends(UserService)):
     """
-    Endpoint to get a list of user
+    Endpoint to get a page of users
     """
-    return await service.get_users()
+    return await service.get_users(page)
 
 
 @user_router.post("", status_code=status.HTTP_201_CREATED, response_model=UserRead)
@@ -15,13 +15,14 @@ class CommentCreate(CommentBase):
 class CommentRead(CommentBase, IdMixin, TimestampMixin):
     user_id: UUID
     post_id: UUID
+    like_count: int = 0
+    user_name: Optional[str] = None
 
 
 
 class CommentUpdate(SQLModel):
     user_id: UUID
     post_id: UUID
-    like_count: Optional[int] = None
     comment: Optional[str] = None
 
     model_config = ConfigDict(extra="forbid")
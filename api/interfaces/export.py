@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportResource(str, Enum):
+    POSTS = "posts"
+    COMMENTS = "comments"
+    MESSAGES = "messages"
+    GAME_SCORES = "game-scores"
+    CERTIFICATES = "certificates"
@@ -21,6 +21,10 @@ class ForumMemberCreate(SQLModel):
 class ForumMemberRead(ForumMemberCreate):
     id: UUID
 
+class ForumMembersCreate(SQLModel):
+    user_ids: List[UUID]
+    model_config = ConfigDict(extra="forbid")
+
 class ForumMessageCreate(SQLModel):
     forum_id: UUID
     user_id: UUID
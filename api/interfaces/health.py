@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -15,3 +16,90 @@ class HealthResponse(BaseModel):
     """
 
     api: str = Field(..., description="A message on health of the api system")
+
+
+class PoolStats(BaseModel):
+    """
+    Connection pool usage of the worker process that served the request
+    """
+
+    size: int = Field(..., description="Configured number of pooled connections")
+    checked_out: int = Field(..., description="Connections currently in use")
+    idle: int = Field(..., description="Connections open and waiting in the pool")
+    overflow: int = Field(..., description="Connections opened above the pool size")
+    max_overflow: int = Field(..., description="Maximum overflow connections allowed")
+    checkouts: int = Field(..., description="Connections handed out since the worker started")
+    failures: int = Field(..., description="Checkouts that failed, eg: timed out waiting for a connection")
+    avg_wait_ms: float = Field(..., description="Average time spent waiting for a connection")
+    max_wait_ms: float = Field(..., description="Longest time spent waiting for a connection")
+
+
+class CacheStats(BaseModel):
+    """
+    Usage of an in-process cache of the worker process that served the request
+    """
+
+    size: int = Field(..., description="Entries currently cached")
+    maxsize: int = Field(..., description="Maximum number of entries")
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups which had to go to the source")
+    evictions: int = Field(..., description="Entries dropped to stay under the maximum size")
+    hit_ratio: float = Field(..., description="hits / (hits + misses)")
+
+
+class HashingHealthResponse(BaseModel):
+    """
+    Usage of the password hashing pool of the worker process that served the request
+    """
+
+    max_workers: int = Field(..., description="Threads hashing passwords")
+    max_queue: int = Field(..., description="Calls allowed to wait for a thread before rejecting with 503")
+    in_flight: int = Field(..., description="Calls running or waiting for a thread")
+    queued: int = Field(..., description="Calls waiting for a thread")
+    max_in_flight: int = Field(..., description="Highest number of calls in flight seen")
+    completed: int = Field(..., description="Calls done since the worker started")
+    rejected: int = Field(..., description="Calls refused because the queue was full")
+    avg_time_ms: float = Field(..., description="Average time of a call, waiting included")
+
+
+class UpstreamStats(BaseModel):
+    """
+    Outbound calls to an upstream service from the worker process that served the request
+    """
+
+    requests: int = Field(..., description="Requests sent since the worker started")
+    errors: int = Field(..., description="Requests which failed without a response, eg: timeouts")
+    avg_latency_ms: float = Field(..., description="Average time until the response headers came back")
+    max_latency_ms: float = Field(..., description="Longest time until the response headers came back")
+    connections: int = Field(..., description="Connections open in the pool of the upstream")
+    idle: int = Field(..., description="Open connections waiting to be reused")
+    active: int = Field(..., description="Open connections serving a request")
+
+
+class CounterStats(BaseModel):
+    """
+    Write buffer of a hot counter column in the worker process that served the request
+    """
+
+    pending_rows: int = Field(..., description="Rows with increments not written yet")
+    pending_increments: int = Field(..., description="Increments not written yet, lost if the worker crashes")
+    increments: int = Field(..., description="Increments buffered since the worker started")
+    flushes: int = Field(..., description="Batched UPDATEs written")
+    failures: int = Field(..., description="Flushes which failed, their increments are retried with the next one")
+    rows_flushed: int = Field(..., description="Rows updated by all the flushes")
+    last_flush_rows: int = Field(..., description="Rows updated by the last flush")
+    max_flush_rows: int = Field(..., description="Most rows updated by one flush")
+    avg_flush_rows: float = Field(..., description="Average rows updated per flush")
+    last_lag_ms: float = Field(..., description="Age of the oldest increment written by the last flush")
+    max_lag_ms: float = Field(..., description="Largest age of an increment when it was written")
+
+
+class DatabaseHealthResponse(BaseModel):
+    """
+    A simple Model for Response of DB Health endpoint
+    """
+
+    db: str = Field(..., description="A message on health of the database")
+    pool: PoolStats
+    replica_pool: Optional[PoolStats] = Field(None, description="Pool of the read replica, if configured")
+    caches: dict[str, CacheStats] = Field({}, description="In-process caches in front of the database, by name")
@@ -1,4 +1,5 @@
 # interfaces/messages.py
+from typing import Optional
 from uuid import UUID
 from pydantic import ConfigDict
 from sqlmodel import SQLModel
@@ -13,3 +14,7 @@ class MessageCreate(SQLModel):
 
 class MessageRead(MessageBase, IdMixin, TimestampMixin):
     pass
+
+class ConversationMessageRead(MessageRead):
+    sender_name: Optional[str] = None
+    receiver_name: Optional[str] = None
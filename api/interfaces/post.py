@@ -1,7 +1,8 @@
+from enum import Enum
 from typing import Optional
 from uuid import UUID
 from pydantic import ConfigDict
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, Field
 from api.db.models.post import PostBase
 from api.db.models import IdMixin, TimestampMixin, SoftDeleteMixin
 
@@ -13,6 +14,30 @@ class PostCreate(PostBase):
 
 class PostRead(PostBase, IdMixin, TimestampMixin):
     user_id: UUID
+    like_count: int = 0
+    user_name: Optional[str] = None
+
+
+class FeedSort(str, Enum):
+    RECENT = "recent"
+    TOP = "top"
+
+
+class PostAuthor(SQLModel):
+    id: UUID
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    dp_url: Optional[str] = None
+
+
+class FeedPost(PostRead):
+    author: Optional[PostAuthor] = Field(None, description="Summary of the author, null if the user is gone")
+    comment_count: int = Field(0, description="Number of comments on the post")
+
+
+class TrendingHashtag(SQLModel):
+    tag: str = Field(..., description="Hashtag, lowercased and without the `#`")
+    uses: int = Field(..., description="Posts tagged with it during the window")
 
 
 class PostUpdate(SQLModel):
@@ -21,6 +46,5 @@ class PostUpdate(SQLModel):
     hashtag: Optional[str] = None
     image_url: Optional[str] = None
     image_data: Optional[str] = None
-    like_count: Optional[int] = None
 
     model_config = ConfigDict(extra="forbid")
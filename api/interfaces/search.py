@@ -0,0 +1,22 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class SearchType(str, Enum):
+    POST = "post"
+    COMMENT = "comment"
+    MESSAGE = "message"
+
+
+class SearchResult(BaseModel):
+    type: SearchType = Field(..., description="Kind of the matching item")
+    id: UUID = Field(..., description="ID of the post, comment or forum message")
+    user_id: UUID = Field(..., description="ID of its author")
+    title: Optional[str] = Field(None, description="Title, for posts")
+    text: str = Field(..., description="Description of the post, or text of the comment or message")
+    parent_id: Optional[UUID] = Field(None, description="Post of a comment, or forum of a message")
+    rank: float = Field(..., description="Relevance to the query, higher first")
+    created_at: datetime
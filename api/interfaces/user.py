@@ -1,8 +1,9 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import ConfigDict, EmailStr, field_validator
 from sqlmodel import SQLModel
 from uuid import UUID
-from api.db.models.user import UserBase
+from api.db.models.user import UserBase, UserCategory
 from api.db.models import IdMixin, TimestampMixin, SoftDeleteMixin
 import re
 
@@ -30,6 +31,24 @@ class UserReadInternal(UserRead, SoftDeleteMixin):
     pass
 
 
+class UserListRead(SQLModel):
+    """
+    Lean user entry of the users list, it leaves out the password hash and the bio
+    """
+    id: UUID
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: str
+    phone_number: Optional[str] = None
+    age: Optional[int] = None
+    country: Optional[str] = None
+    state: Optional[str] = None
+    dp_url: Optional[str] = None
+    category: UserCategory
+    created_at: datetime
+    updated_at: datetime
+
+
 class UserUpdate(SQLModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
@@ -48,5 +67,18 @@ class UserLogin(SQLModel):
     email: EmailStr
     password: str
     category: str
+    device_id: Optional[str] = None
+
+
+class TokenRefresh(SQLModel):
+    refresh_token: str
+
+    model_config = ConfigDict(extra="forbid")
+
+
+class TokenResponse(SQLModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
 
     
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Generic, TypeVar, Union, TypeAlias, Any
+from typing import Annotated, Generic, Optional, TypeVar, Union, TypeAlias, Any
+from fastapi import Query
 from pydantic import BaseModel
 from sqlmodel.sql.expression import BinaryExpression
 
@@ -16,9 +17,42 @@ class List(BaseModel, Generic[T]):
     Fields:
     ----------
     - 'data' (List[SchemaType]): List of items in the response.
+    - 'next_cursor' (str): Cursor to pass as `after` to fetch the next page, null on the last page.
+    - 'prev_cursor' (str): Cursor to pass as `before` to fetch the previous page, null on the first page.
     """
 
     data: list[T]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+
+# Page size limits for the cursor paginated list endpoints
+PAGE_SIZE_DEFAULT = 20
+PAGE_SIZE_MAX = 100
+
+
+class PageParams:
+    """
+    Description:
+    ----------
+    Query parameters of a cursor paginated list endpoint, use it as `page: PageParams = Depends()`
+
+    Fields:
+    ----------
+    - 'after' (str): Opaque cursor, returns the items after it (`next_cursor` of the previous response).
+    - 'before' (str): Opaque cursor, returns the items before it (`prev_cursor` of the previous response).
+    - 'limit' (int): Number of items in the page.
+    """
+
+    def __init__(
+        self,
+        after: Annotated[Optional[str], Query(description="Cursor to fetch the page after")] = None,
+        before: Annotated[Optional[str], Query(description="Cursor to fetch the page before")] = None,
+        limit: Annotated[int, Query(ge=1, le=PAGE_SIZE_MAX, description="Page size")] = PAGE_SIZE_DEFAULT,
+    ):
+        self.after = after
+        self.before = before
+        self.limit = limit
 
 
 # Define a type alias for filters passed to get method of BaseModel.Filters can be a list of binary expressions or a dictionary
@@ -4,13 +4,18 @@ from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv  # Import dotenv
 import os  # Import os to access environment variables
 
+# Load environment variables from .env file
+# This has to run before the api imports, as the DB engine is configured from the env on import
+load_dotenv()
+
+# pylint: disable=wrong-import-position
 from api.db import initiate as init_db
+from api.db.counters import counters
+from api.db.session import engine
 from api.middleware import custom_middleware_setup
 from api.endpoints import TAGS_METADATA, route_setup
-
-
-# Load environment variables from .env file
-load_dotenv()
+from api.utils.http import http_clients
+from api.utils.passwords import password_hasher
 
 async def lifespan(app: FastAPI):
     # On startup
@@ -19,8 +24,14 @@ async def lifespan(app: FastAPI):
     print("Route Setup Done")
     await init_db()
     print("DB Loaded")
+    http_clients.start()
+    counters.start(engine)
     yield
     # On Shutdown
+    # write the buffered counters before the process goes away
+    await counters.aclose()
+    await http_clients.aclose()
+    password_hasher.shutdown()
 
 
 def create_api() -> FastAPI:
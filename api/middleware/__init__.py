@@ -15,6 +15,7 @@ from typing import Callable, List
 from fastapi import FastAPI
 
 from .handler_middleware import HandlerMiddleware
+from .instrumentation_middleware import InstrumentationMiddleware
 
 
 def custom_middleware_setup(app: FastAPI):
@@ -33,6 +34,8 @@ def custom_middleware_setup(app: FastAPI):
         # please remember that it will be added to stack as given order.
         # example: MyCustomMiddlewareClass()
         HandlerMiddleware(),
+        # added last so it wraps `HandlerMiddleware` and also sees the commit of the request
+        InstrumentationMiddleware(),
     ]
     # TODO: logging.info("Setting up Custom Middlewares ...")
     for middleware in middleware_stack:
@@ -2,7 +2,25 @@ import os
 from typing import Callable
 from fastapi.requests import Request
 from api.utils.exceptions import HTTPError
-from api.db.session import get_session
+from api.db.session import LazySession
+
+# Requests with these methods never write, so their session can be served by the read replica
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Safe-method routes which still write to the DB (eg: the google callback creates the user)
+PRIMARY_ONLY_PATHS = ("/users/google/callback",)
+# Escape hatch for clients which need to read their own writes right after making them
+READ_YOUR_WRITES_HEADER = "X-Read-Your-Writes"
+
+
+def use_read_replica(request: Request) -> bool:
+    """
+    Decide if the request can be served by a read-only session on the replica
+    """
+    if request.method not in SAFE_METHODS:
+        return False
+    if request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true"):
+        return False
+    return not request.url.path.startswith(PRIMARY_ONLY_PATHS)
 
 
 async def http_exception_handler(request: Request, exc: HTTPError):
@@ -15,8 +33,8 @@ async def http_exception_handler(request: Request, exc: HTTPError):
     #     route=str(permission),
     #     user=user
     # )
-    if hasattr(request.state, "session"):
-        await request.state.session.rollback()
+    if hasattr(request.state, "db"):
+        await request.state.db.rollback()
         # TODO: Log rollback -- remove the rollback from api.db.models.base
         # logger.info("Automatically rollback session")
     if os.environ.get("RAISE_HTTP_EXCEPTION") == "true":
@@ -28,13 +46,18 @@ async def http_exception_handler(request: Request, exc: HTTPError):
 class HandlerMiddleware:
     """
     Middleware to handle the HTTP Errors
+
+    It also owns the DB session of the request, on the read replica for safe-method requests
     """
 
     async def __call__(self, request: Request, call_next: Callable):
+        # the session itself is only opened if a dependency asks for it, see `api.utils.misc.get_session`
+        request.state.db = LazySession(read_only=use_read_replica(request))
         try:
-            request.state.session = await anext(get_session())
             resp = await call_next(request)
-            await request.state.session.commit()
+            await request.state.db.commit()
             return resp
         except HTTPError as err:
             return await http_exception_handler(request, err)
+        finally:
+            await request.state.db.close()
@@ -0,0 +1,30 @@
+from typing import Callable
+from fastapi.requests import Request
+from api.db.instrumentation import current_stats, end_request, report_request, start_request
+from api.db.session import settings
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+
+
+class InstrumentationMiddleware:
+    """
+    Middleware to collect the SQL statements run by each request
+
+    Slow statements are logged as they run, repeated ones (likely N+1) once the request is done.
+    With `DB_DEBUG_HEADERS=true` the statement count and DB time are added to the response headers.
+    It has to wrap `HandlerMiddleware`, so the commit of the request is counted as well.
+    """
+
+    async def __call__(self, request: Request, call_next: Callable):
+        token = start_request(f"{request.method} {request.url.path}")
+        try:
+            resp = await call_next(request)
+            stats = current_stats()
+            report_request(stats, settings)
+            if settings.debug_headers:
+                resp.headers[QUERY_COUNT_HEADER] = str(stats.count)
+                resp.headers[QUERY_TIME_HEADER] = f"{stats.total_time * 1000:.1f}"
+            return resp
+        finally:
+            end_request(token)
@@ -8,4 +8,7 @@ from .module import ModuleQuizService
 from .lesson import LessonQuizService
 from .certificate import CertificateService
 from .newsletter import NewsletterService
-from .alert import AlertService
\ No newline at end of file
+from .alert import AlertService
+from .export import ExportService
+from .token import RefreshTokenService
+from .search import SearchService
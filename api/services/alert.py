@@ -1,8 +1,7 @@
 from uuid import UUID
 from datetime import datetime
-from sqlmodel import col
 from api.db.models.alert import Alert
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.interfaces.alert import AlertCreate, AlertRead
 from api.utils.exceptions import NotFoundError
 from .base import BaseService
@@ -17,34 +16,35 @@ class AlertService(BaseService):
         Raises:
         - NotFoundError: Raised if the alert is not found.
         """
-        res = await Alert.get(db=self.db, filters=[Alert.id == alert_id, ~col(Alert.is_deleted)])
-        alert = res.one_or_none()
+        alert = await Alert.get_by_id(self.db, alert_id)
         if alert is None:
             raise NotFoundError("Alert not found")
         return alert
-    async def get_alerts_for_user(self, user_id: UUID) -> List[AlertRead]:
+    async def get_alerts_for_user(self, user_id: UUID, page: PageParams) -> List[AlertRead]:
         """
-        Retrieve a list of alerts for a specific user.
+        Retrieve a page of alerts for a specific user.
         Args:
         - user_id (UUID): The UUID of the user.
+        - page (PageParams): Cursor and size of the page to fetch.
         Returns:
-        - List[AlertRead]: List of alerts for the user.
+        - List[AlertRead]: Page of alerts for the user.
         """
-        res = await Alert.get(db=self.db, filters=[Alert.user_id == user_id, ~col(Alert.is_deleted)])
-        return {"data": res.all()}
-    async def get_upcoming_alerts(self, current_time: datetime) -> List[AlertRead]:
+        return await Alert.paginate(db=self.db, page=page, filters=[Alert.user_id == user_id], projection=AlertRead)
+    async def get_upcoming_alerts(self, current_time: datetime, page: PageParams) -> List[AlertRead]:
         """
-        Retrieve alerts scheduled to trigger at or after the current time.
+        Retrieve a page of alerts scheduled to trigger at or after the current time.
         Args:
         - current_time (datetime): The current time.
+        - page (PageParams): Cursor and size of the page to fetch.
         Returns:
-        - List[AlertRead]: List of upcoming alerts.
+        - List[AlertRead]: Page of upcoming alerts.
         """
-        res = await Alert.get(
+        return await Alert.paginate(
             db=self.db,
-            filters=[Alert.alert_datetime <= current_time, ~col(Alert.is_deleted)]
+            page=page,
+            filters=[Alert.alert_datetime <= current_time],
+            projection=AlertRead,
         )
-        return {"data": res.all()}
     async def create_alert(self, data: AlertCreate, user_id: UUID) -> AlertRead:
         """
         Create a new alert.
@@ -67,16 +67,18 @@ class AlertService(BaseService):
         alert.is_deleted = True
         await alert.save(self.db)
 
-    async def get_alerts_by_user_id(self, user_id: UUID) -> List[AlertRead]:
+    async def get_alerts_by_user_id(self, user_id: UUID, page: PageParams) -> List[AlertRead]:
             """
-            Retrieve all alerts for a specific user by their user_id.
+            Retrieve a page of alerts for a specific user by their user_id.
             Args:
             - user_id (UUID): The UUID of the user.
+            - page (PageParams): Cursor and size of the page to fetch.
             Returns:
-            - List[AlertRead]: List of alerts for the specified user.
+            - List[AlertRead]: Page of alerts for the specified user.
             """
-            res = await Alert.get(
+            return await Alert.paginate(
                 db=self.db,
-                filters=[Alert.user_id == user_id, ~col(Alert.is_deleted)]
+                page=page,
+                filters=[Alert.user_id == user_id],
+                projection=AlertRead,
             )
-            return {"data": res.all()}
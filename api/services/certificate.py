@@ -1,6 +1,5 @@
 from uuid import UUID
 from sqlalchemy.future import select
-from sqlalchemy.sql import not_
 from typing import Optional
 
 from reportlab.lib.pagesizes import letter
@@ -12,11 +11,11 @@ from reportlab.pdfbase.ttfonts import TTFont
 
 import os
 from datetime import datetime, timezone
-from sqlmodel import col
 from api.db.models.certificate import Certificate
 from api.db.models.module import ModuleQuiz
 from api.db.models.user import User
 from api.interfaces.certificate import CertificateCreate
+from api.interfaces.utils import PageParams
 from api.utils.exceptions import NotFoundError
 from .base import BaseService
 
@@ -34,12 +33,7 @@ class CertificateService(BaseService):
         """
         try:
             # Fetch the corresponding module quiz to get the latest score
-            query = select(ModuleQuiz).where(
-                ModuleQuiz.id == data.module_quiz_id,
-                ~col(ModuleQuiz.is_deleted)
-            )
-            result = await self.db.execute(query)
-            module_quiz = result.scalars().one_or_none()
+            module_quiz = await ModuleQuiz.get_by_id(self.db, data.module_quiz_id)
             
             if module_quiz:
                 # Override the score with the module quiz's actual score
@@ -51,8 +45,7 @@ class CertificateService(BaseService):
             
             # Check if a certificate already exists for this module quiz
             existing_certificate_query = select(Certificate).where(
-                Certificate.module_quiz_id == data.module_quiz_id,
-                ~col(Certificate.is_deleted)
+                Certificate.module_quiz_id == data.module_quiz_id
             )
             existing_certificate_result = await self.db.execute(existing_certificate_query)
             existing_certificate = existing_certificate_result.scalars().one_or_none()
@@ -137,24 +130,21 @@ class CertificateService(BaseService):
         
         return filename
 
-    async def get_certificates_by_user(self, user_id: UUID):
+    async def get_certificates_by_user(self, user_id: UUID, page: PageParams):
         """
-        Retrieve all certificates for a specific user.
+        Retrieve a page of certificates for a specific user.
         """
-        query = select(Certificate).where(
-            Certificate.user_id == user_id,
-            not_(Certificate.is_deleted)
+        return await Certificate.paginate(
+            db=self.db,
+            page=page,
+            filters=[Certificate.user_id == user_id],
         )
-        
-        result = await self.db.execute(query)
-        return {"data": result.scalars().all()}
     async def get_certificate_by_module_quiz(self, module_quiz_id: UUID) -> Optional[Certificate]:
         """
         Retrieve a certificate by module quiz ID.
         """
         query = select(Certificate).where(
-            Certificate.module_quiz_id == module_quiz_id,
-            not_(Certificate.is_deleted)
+            Certificate.module_quiz_id == module_quiz_id
         )
         
         result = await self.db.execute(query)
@@ -1,29 +1,48 @@
 from uuid import UUID
-from sqlmodel import col
-from api.db.models.comments import Comment
+from api.db.models.comments import Comment, CommentLike, comment_like_counter
 from api.interfaces.comments import CommentRead, CommentCreate, CommentUpdate
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.utils.exceptions import NotFoundError
 from .base import BaseService
+from .likes import add_like, remove_like
+from .loaders import UserLoader
 
 
 class CommentService(BaseService):
-    async def get_comment(self, comment_id: UUID) -> CommentRead:
+    def _with_pending_likes(self, comment: Comment) -> CommentRead:
         """
-        Retrieve a specific comment by its UUID.
+        Read model of the comment, counting the likes still buffered in memory
         """
-        res = await Comment.get(db=self.db, filters=[Comment.id == comment_id, ~col(Comment.is_deleted)])
-        comment = res.one_or_none()
+        read = CommentRead.model_validate(comment)
+        read.like_count = comment_like_counter.merge(comment.id, comment.like_count, self.db)
+        return read
+
+    async def _get_comment(self, comment_id: UUID) -> Comment:
+        comment = await Comment.get_by_id(self.db, comment_id)
         if comment is None:
             raise NotFoundError("Comment not found")
         return comment
 
-    async def get_comments_for_post(self, post_id: UUID) -> List[CommentRead]:
+    async def get_comment(self, comment_id: UUID) -> CommentRead:
+        """
+        Retrieve a specific comment by its UUID.
+        """
+        return self._with_pending_likes(await self._get_comment(comment_id))
+
+    async def get_comments_for_post(self, post_id: UUID, page: PageParams) -> List[CommentRead]:
         """
-        Retrieve all comments for a specific post.
+        Retrieve a page of comments for a specific post, oldest first.
         """
-        res = await Comment.get(db=self.db, filters=[Comment.post_id == post_id, ~col(Comment.is_deleted)])
-        return {"data": res.all()}
+        result = await Comment.paginate(
+            db=self.db, page=page, filters=[Comment.post_id == post_id], projection=CommentRead
+        )
+
+        # Add the author names, all the authors of the page are loaded with one query
+        names = await UserLoader.of(self.db).names(comment.user_id for comment in result["data"])
+        for comment in result["data"]:
+            comment.user_name = names[comment.user_id]
+            comment.like_count = comment_like_counter.merge(comment.id, comment.like_count)
+        return result
 
     async def create_comment(self, data: CommentCreate) -> CommentRead:
         """
@@ -37,7 +56,7 @@ class CommentService(BaseService):
         """
         Mark a comment as deleted.
         """
-        comment = await self.get_comment(comment_id)
+        comment = await self._get_comment(comment_id)
         comment.is_deleted = True
         await comment.save(self.db)
 
@@ -45,17 +64,22 @@ class CommentService(BaseService):
         """
         Update details of a comment.
         """
-        comment = await self.get_comment(comment_id)
+        comment = await self._get_comment(comment_id)
         await comment.update(self.db, data)
-        return comment
+        return self._with_pending_likes(comment)
 
-    async def increment_like_count(self, comment_id: UUID) -> CommentRead:
+    async def increment_like_count(self, comment_id: UUID, user_id: UUID) -> CommentRead:
         """
-        Increment the like count of a comment.
+        Like a comment, once per user. Liking it again leaves the count as is.
         """
-        comment = await self.get_comment(comment_id)
-        comment.like_count += 1
-        await comment.save(self.db)
-        return comment
-    
-    
+        comment = await add_like(self.db, Comment, CommentLike, "comment_id", comment_id, user_id, comment_like_counter)
+        return self._with_pending_likes(comment if comment is not None else await self._get_comment(comment_id))
+
+    async def decrement_like_count(self, comment_id: UUID, user_id: UUID) -> CommentRead:
+        """
+        Take back the like of the user on a comment, if any.
+        """
+        comment = await remove_like(
+            self.db, Comment, CommentLike, "comment_id", comment_id, user_id, comment_like_counter
+        )
+        return self._with_pending_likes(comment if comment is not None else await self._get_comment(comment_id))
@@ -0,0 +1,96 @@
+import csv
+import io
+from typing import AsyncIterator, Type
+from uuid import UUID
+from sqlmodel import SQLModel, select
+
+from api.db.models.certificate import Certificate
+from api.db.models.comments import Comment
+from api.db.models.games import GameScore
+from api.db.models.messages import Message
+from api.db.models.post import Post
+from api.db.session import replica_session_maker
+from api.interfaces.certificate import CertificateRead
+from api.interfaces.comments import CommentRead
+from api.interfaces.export import ExportFormat, ExportResource
+from api.interfaces.games import GameScoreRead
+from api.interfaces.messages import MessageRead
+from api.interfaces.post import PostRead
+from .base import BaseService
+
+# Rows fetched from the server-side cursor per round trip, this bounds the memory used by an export
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+class ExportService(BaseService):
+    """
+    Streams every row of a user's data without loading it all in memory
+
+    The rows are read through a server-side cursor, `EXPORT_BATCH_SIZE` at a time, and written
+    to the response as they come. The export runs on its own session as the body is sent after
+    the request session has been closed by `HandlerMiddleware`.
+    """
+
+    def _export_query(self, resource: ExportResource, user_id: UUID) -> tuple[Type[SQLModel], object]:
+        """
+        Returns the read schema and the select of the rows of `resource` owned by the user
+        """
+        if resource == ExportResource.POSTS:
+            schema, model, condition = PostRead, Post, Post.user_id == user_id
+        elif resource == ExportResource.COMMENTS:
+            schema, model, condition = CommentRead, Comment, Comment.user_id == user_id
+        elif resource == ExportResource.MESSAGES:
+            schema, model = MessageRead, Message
+            condition = (Message.sender_id == user_id) | (Message.receiver_id == user_id)
+        elif resource == ExportResource.GAME_SCORES:
+            schema, model, condition = GameScoreRead, GameScore, GameScore.user_id == user_id
+        else:
+            schema, model, condition = CertificateRead, Certificate, Certificate.user_id == user_id
+
+        query = (
+            select(*model.projection_columns(schema))
+            .where(condition)
+            .order_by(*model.keyset_columns())
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        return schema, query
+
+    async def export_user_data(
+        self, resource: ExportResource, user_id: UUID, export_format: ExportFormat
+    ) -> AsyncIterator[str]:
+        """
+        Yields the rows of `resource` owned by the user, one NDJSON line or CSV record at a time
+
+        Args:
+        - resource (ExportResource): Kind of rows to export.
+        - user_id (UUID): The UUID of the user whose data is exported.
+        - export_format (ExportFormat): `ndjson` or `csv`, the CSV output starts with a header row.
+        """
+        schema, query = self._export_query(resource, user_id)
+        fields = list(schema.model_fields)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+
+        def csv_line(values: dict) -> str:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue()
+
+        if export_format == ExportFormat.CSV:
+            yield csv_line({field: field for field in fields})
+
+        async with replica_session_maker() as session:
+            result = await session.stream(query)
+            async for rows in result.partitions():
+                for row in rows:
+                    item = schema.model_validate(row._mapping)
+                    if export_format == ExportFormat.CSV:
+                        yield csv_line(item.model_dump(mode="json"))
+                    else:
+                        yield item.model_dump_json() + "\n"
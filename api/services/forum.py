@@ -2,19 +2,20 @@ from uuid import UUID
 from sqlmodel import select, col
 from api.db.models.forum import Forum, ForumMember, ForumMessage
 from api.db.models.user import User
-from sqlalchemy.orm import joinedload
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.interfaces.forum import (
     ForumCreate, 
     ForumRead, 
     ForumMemberCreate, 
     ForumMemberRead, 
+    ForumMembersCreate, 
     ForumMessageCreate, 
     ForumMessageRead
 )
 from api.utils.exceptions import NotFoundError, ConflictError
 from api.utils.spam_filter import SpamFilter
 from .base import BaseService
+from .loaders import UserLoader
 
 class ForumService(BaseService):
     async def create_forum(self, data: ForumCreate) -> ForumRead:
@@ -30,14 +31,12 @@ class ForumService(BaseService):
         Add a user to a forum.
         """
         # Check if forum exists
-        forum_query = select(Forum).where(Forum.id == data.forum_id, ~col(Forum.is_deleted))
-        forum = await self.db.scalar(forum_query)
+        forum = await Forum.get_by_id(self.db, data.forum_id)
         if not forum:
             raise NotFoundError("Forum not found")
 
         # Check if user exists
-        user_query = select(User).where(User.id == data.user_id, ~col(User.is_deleted))
-        user = await self.db.scalar(user_query)
+        user = await User.get_by_id(self.db, data.user_id)
         if not user:
             raise NotFoundError("User not found")
 
@@ -55,13 +54,36 @@ class ForumService(BaseService):
         await new_member.save(self.db)
         return new_member
 
+    async def add_forum_members(self, forum_id: UUID, data: ForumMembersCreate) -> List[ForumMemberRead]:
+        """
+        Add many users to a forum at once. Users who are already members are skipped.
+        """
+        # Check if forum exists
+        forum = await Forum.get_by_id(self.db, forum_id)
+        if not forum:
+            raise NotFoundError("Forum not found")
+
+        # Check if all the users exist, with one query
+        user_ids = set(data.user_ids)
+        users_query = select(User.id).where(col(User.id).in_(list(user_ids)))
+        found_ids = set((await self.db.exec(users_query)).all())
+        if missing := user_ids - found_ids:
+            raise NotFoundError(f"Users not found: {', '.join(str(user_id) for user_id in missing)}")
+
+        # Add the members with one INSERT ... ON CONFLICT DO NOTHING
+        new_members = await ForumMember.upsert_many(
+            self.db,
+            [ForumMember(forum_id=forum_id, user_id=user_id) for user_id in user_ids],
+            index_elements=["forum_id", "user_id"],
+        )
+        return {"data": new_members}
+
     async def send_forum_message(self, data: ForumMessageCreate) -> ForumMessageRead:
         """
         Send a message to a forum.
         """
         # Check if forum exists
-        forum_query = select(Forum).where(Forum.id == data.forum_id, ~col(Forum.is_deleted))
-        forum = await self.db.scalar(forum_query)
+        forum = await Forum.get_by_id(self.db, data.forum_id)
         if not forum:
             raise NotFoundError("Forum not found")
 
@@ -74,63 +96,43 @@ class ForumService(BaseService):
         new_message = ForumMessage(**data.model_dump())
         await new_message.save(self.db)
         
-        # Add user name to response
-        user_query = select(User).where(User.id == data.user_id)
-        user = await self.db.scalar(user_query)
-        
-        # Create response using model_dump to include all fields
+        # Create response using model_dump to include all fields, with the user name added
         message_dict = new_message.model_dump()
-        message_dict['user_name'] = f"{user.first_name} {user.last_name}" if user else None
-        
+        message_dict['user_name'] = await UserLoader.of(self.db).name(data.user_id)
+
         return ForumMessageRead(**message_dict)
 
-    async def get_forum_members(self, forum_id: UUID) -> List[ForumMemberRead]:
+    async def get_forum_members(self, forum_id: UUID, page: PageParams) -> List[ForumMemberRead]:
         """
-        Get all members of a specific forum.
+        Get a page of members of a specific forum.
         """
         query = (
             select(ForumMember)
             .join(User)
             .where(ForumMember.forum_id == forum_id)
         )
-        result = await self.db.execute(query)
-        return {"data": result.scalars().all()}
+        return await ForumMember.paginate(db=self.db, page=page, query=query)
 
-    async def get_forum_messages(self, forum_id: UUID) -> List[ForumMessageRead]:
+    async def get_forum_messages(self, forum_id: UUID, page: PageParams) -> List[ForumMessageRead]:
         """
-        Get all messages in a specific forum.
+        Get a page of messages in a specific forum, oldest first.
         """
-        query = (
-            select(ForumMessage)
-            .options(
-                joinedload(ForumMessage.user)
-            )
-            .where(
-                ForumMessage.forum_id == forum_id
-            )
-            .order_by(ForumMessage.created_at)
+        result = await ForumMessage.paginate(
+            db=self.db, page=page, filters=[ForumMessage.forum_id == forum_id], projection=ForumMessageRead
         )
-        result = await self.db.execute(query)
-        messages = result.scalars().all()
 
-        # Format the response to include user names
-        response = [
-            ForumMessageRead(
-                **message.model_dump(), 
-                user_name=f"{message.user.first_name} {message.user.last_name}" if message.user else None
-            )
-            for message in messages
-        ]
+        # Add the user names, all the authors of the page are loaded with one query
+        names = await UserLoader.of(self.db).names(message.user_id for message in result["data"])
+        for message in result["data"]:
+            message.user_name = names[message.user_id]
 
-        return {"data": response}
+        return result
 
-    async def list_forums(self) -> List[ForumRead]:
+    async def list_forums(self, page: PageParams) -> List[ForumRead]:
         """
-        List all forums.
+        List a page of forums.
         """
-        query = select(Forum).where(~col(Forum.is_deleted))
-        result = await self.db.execute(query)
-        return {"data": result.scalars().all()}
+        return await Forum.paginate(db=self.db, page=page, projection=ForumRead)
     
     async def delete_forum(self, forum_id: UUID) -> None:
         """
@@ -140,8 +142,7 @@ class ForumService(BaseService):
         - forum_id (UUID): The UUID of the forum to delete.
         """
         # Fetch the forum to be deleted
-        forum_query = select(Forum).where(Forum.id == forum_id, ~col(Forum.is_deleted))
-        forum = await self.db.scalar(forum_query)
+        forum = await Forum.get_by_id(self.db, forum_id)
         
         if not forum:
             raise NotFoundError("Forum not found or already deleted")
@@ -1,8 +1,8 @@
 from uuid import UUID
-from sqlmodel import col, select, func
+from sqlmodel import select, func
 from api.db.models.games import GameScore
 from api.db.models.user import User
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.interfaces.games import GameScoreRead, GameScoreCreate, LeaderboardEntry
 from api.utils.exceptions import NotFoundError
 from .base import BaseService
@@ -20,8 +20,7 @@ class GameScoreService(BaseService):
         """
         # Get the user's current total score
         query = select(func.coalesce(func.max(GameScore.cumulative_total), 0)).where(
-            GameScore.user_id == data.user_id,
-            ~col(GameScore.is_deleted)
+            GameScore.user_id == data.user_id
         )
         result = await self.db.execute(query)
         current_total = result.scalar() or 0
@@ -34,43 +33,41 @@ class GameScoreService(BaseService):
         await new_score.save(self.db)
         return new_score
 
-    async def get_user_scores(self, user_id: UUID) -> List[GameScoreRead]:
+    async def get_user_scores(self, user_id: UUID, page: PageParams) -> List[GameScoreRead]:
         """
-        Get all scores for a specific user.
+        Get a page of scores for a specific user.
 
         Args:
         - user_id (UUID): The user's UUID
+        - page (PageParams): Cursor and size of the page to fetch
 
         Returns:
-        - List[GameScoreRead]: List of user's scores
+        - List[GameScoreRead]: Page of user's scores
         """
-        res = await GameScore.get(
+        return await GameScore.paginate(
             db=self.db,
-            filters=[
-                GameScore.user_id == user_id,
-                ~col(GameScore.is_deleted)
-            ]
+            page=page,
+            filters=[GameScore.user_id == user_id],
+            projection=GameScoreRead,
         )
-        return {"data": res.all()}
 
-    async def get_game_scores(self, game_name: str) -> List[GameScoreRead]:
+    async def get_game_scores(self, game_name: str, page: PageParams) -> List[GameScoreRead]:
         """
-        Get all scores for a specific game.
+        Get a page of scores for a specific game.
 
         Args:
         - game_name (str): Name of the game
+        - page (PageParams): Cursor and size of the page to fetch
 
         Returns:
-        - List[GameScoreRead]: List of scores for the game
+        - List[GameScoreRead]: Page of scores for the game
         """
-        res = await GameScore.get(
+        return await GameScore.paginate(
             db=self.db,
-            filters=[
-                GameScore.game_name == game_name,
-                ~col(GameScore.is_deleted)
-            ]
+            page=page,
+            filters=[GameScore.game_name == game_name],
+            projection=GameScoreRead,
         )
-        return {"data": res.all()}
 
     async def get_leaderboard(self) -> List[LeaderboardEntry]:
             """
@@ -85,8 +82,6 @@ class GameScoreService(BaseService):
                 func.count(GameScore.id).label("games_played")
             ).join(
                 User, GameScore.user_id == User.id
-            ).where(
-                ~col(GameScore.is_deleted)
             ).group_by(
                 User.first_name
             ).order_by(
@@ -119,8 +114,7 @@ class GameScoreService(BaseService):
             func.sum(GameScore.score).label("total_score"),
             func.count(GameScore.id).label("games_played")
         ).where(
-            GameScore.user_id == user_id,
-            ~col(GameScore.is_deleted)
+            GameScore.user_id == user_id
         )
         
         result = await self.db.execute(query)
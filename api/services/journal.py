@@ -1,12 +1,15 @@
-import requests
+import httpx
 from typing import List, Dict
 
+from api.utils.http import http_clients
+
+
 class JournalService:
     BASE_URL = "https://api.crossref.org/works"
     ITEMS_PER_PAGE = 50  # Number of results per page
 
     @classmethod
-    def fetch_journals(cls, page: int = 1) -> List[dict]:
+    async def fetch_journals(cls, page: int = 1) -> List[dict]:
         """
         Fetch scientific journals related to doping practices,
         sorted by relevance first and then by publication date (latest first).
@@ -28,7 +31,7 @@ class JournalService:
                 'User-Agent': 'YourAppName/1.0 (your_email@example.com)'
             }
             
-            response = requests.get(
+            response = await http_clients.get("crossref").get(
                 cls.BASE_URL, 
                 params=params, 
                 headers=headers
@@ -64,7 +67,7 @@ class JournalService:
             
             return processed_journals
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"Request Error: {e}")
             raise Exception(f"Network error: {str(e)}")
         except Exception as e:
@@ -107,9 +110,9 @@ class JournalService:
         return item.get("publisher", "Unknown Publisher")
 
 # Optional: Debug method
-def debug_journal_service():
+async def debug_journal_service():
     try:
-        journals = JournalService.fetch_journals(page=1)
+        journals = await JournalService.fetch_journals(page=1)
         print(f"Fetched {len(journals)} journals")
         for journal in journals:
             print("\n--- Journal ---")
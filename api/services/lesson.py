@@ -1,30 +1,28 @@
 from uuid import UUID
-from sqlmodel import col
 from api.db.models.lesson import LessonQuiz
-from api.interfaces.lesson import LessonQuizCreate
+from api.interfaces.lesson import LessonQuizCreate, LessonQuizRead
 from sqlalchemy.future import select
-from sqlalchemy.sql import not_
-from api.interfaces.utils import List
+from api.interfaces.utils import List, PageParams
 from api.utils.exceptions import NotFoundError
 from .base import BaseService
 
 class LessonQuizService(BaseService):
-    async def get_lesson_quizzes_by_user(self, user_id: UUID) -> List[LessonQuiz]:
+    async def get_lesson_quizzes_by_user(self, user_id: UUID, page: PageParams) -> List[LessonQuiz]:
         """
-        Retrieve lesson quizzes for a specific user.
+        Retrieve a page of lesson quizzes for a specific user.
         """
-        res = await LessonQuiz.get(
+        return await LessonQuiz.paginate(
             db=self.db,
-            filters=[LessonQuiz.user_id == user_id, ~col(LessonQuiz.is_deleted)]
+            page=page,
+            filters=[LessonQuiz.user_id == user_id],
+            projection=LessonQuizRead,
         )
-        return {"data": res.all()}
 
     async def get_lesson_quiz_by_id(self, lesson_quiz_id: UUID) -> LessonQuiz:
         """
         Retrieve a specific lesson quiz by its ID.
         """
-        res = await LessonQuiz.get(db=self.db, filters=[LessonQuiz.id == lesson_quiz_id, ~col(LessonQuiz.is_deleted)])
-        lesson_quiz = res.one_or_none()
+        lesson_quiz = await LessonQuiz.get_by_id(self.db, lesson_quiz_id)
         if lesson_quiz is None:
             raise NotFoundError("Lesson quiz not found")
         return lesson_quiz
@@ -58,7 +56,6 @@ class LessonQuizService(BaseService):
         query = select(LessonQuiz).where(
         LessonQuiz.user_id == data.user_id,
         LessonQuiz.lesson_name == data.lesson_name,
-        not_(LessonQuiz.is_deleted)
         )
 
         result = await self.db.execute(query)
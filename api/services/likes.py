@@ -0,0 +1,140 @@
+from datetime import datetime
+from typing import Optional, Type
+from uuid import UUID
+from uuid_extensions import uuid7
+from sqlalchemy import delete, exists, false, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.db.counters import CounterBuffer
+from api.db.models.base import BaseModel
+
+
+async def _apply(
+    db: AsyncSession, target: Type[BaseModel], target_id: UUID, changed, delta: int
+) -> Optional[BaseModel]:
+    """
+    Move `like_count` of the target by `delta` if the `changed` CTE returned a row, in the same statement
+    """
+    stmt = (
+        update(target)
+        .where(target.id == changed.c.target_id)
+        # `updated_at` is set by hand, the `onupdate` default is left out (as NULL) of an UPDATE
+        # carrying an INSERT / DELETE in its WITH clause
+        .values(like_count=func.greatest(target.like_count + delta, 0), updated_at=datetime.now())
+        .returning(target)
+        .execution_options(synchronize_session=False)
+    )
+    row = (await db.scalars(stmt, execution_options={"populate_existing": True})).one_or_none()
+    if row is not None:
+        target._invalidate_identity(db, [target_id])
+    return row
+
+
+async def add_like(
+    db: AsyncSession,
+    target: Type[BaseModel],
+    like: Type[BaseModel],
+    fk: str,
+    target_id: UUID,
+    user_id: UUID,
+    counter: CounterBuffer,
+) -> Optional[BaseModel]:
+    """
+    Record the like of `user_id` on the target and count it, as one statement:
+
+        WITH changed AS (INSERT INTO <likes> ... ON CONFLICT DO NOTHING RETURNING <fk>)
+        UPDATE <targets> SET like_count = like_count + 1 FROM changed ... RETURNING <targets>.*
+
+    Concurrent likes serialize on the row lock of the target and each adds to the latest count,
+    so none is lost. Only live targets can be liked.
+
+    When the `counter` buffer is running only the like is inserted, and the increment is left
+    to the buffer once the like is committed, so a viral target is not updated once per like.
+
+    Returns:
+        The updated target, or None if the user had already liked it (or the target does not exist),
+        or if the increment was buffered
+    """
+    now = datetime.now()
+    live_target = exists().where(target.id == target_id, target.is_deleted == false())
+    inserted = (
+        pg_insert(like)
+        .from_select(
+            ["id", fk, "user_id", "created_at", "updated_at"],
+            select(literal(uuid7()), literal(target_id), literal(user_id), literal(now), literal(now)).where(
+                live_target
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=[fk, "user_id"])
+        .returning(getattr(like, fk).label("target_id"))
+    )
+    if counter.enabled:
+        if (await db.execute(inserted)).first() is not None:
+            counter.add_on_commit(db, target_id, +1)
+        return None
+    return await _apply(db, target, target_id, inserted.cte("changed"), +1)
+
+
+async def remove_like(
+    db: AsyncSession,
+    target: Type[BaseModel],
+    like: Type[BaseModel],
+    fk: str,
+    target_id: UUID,
+    user_id: UUID,
+    counter: CounterBuffer,
+) -> Optional[BaseModel]:
+    """
+    Delete the like of `user_id` on the target and uncount it, as one statement, see `add_like`
+
+    Returns:
+        The updated target, or None if the user had not liked it, or if the decrement was buffered
+    """
+    deleted = (
+        delete(like)
+        .where(getattr(like, fk) == target_id, like.user_id == user_id)
+        .returning(getattr(like, fk).label("target_id"))
+    )
+    if counter.enabled:
+        if (await db.execute(deleted)).first() is not None:
+            counter.add_on_commit(db, target_id, -1)
+        return None
+    return await _apply(db, target, target_id, deleted.cte("changed"), -1)
+
+
+async def recount_likes(
+    db: AsyncSession, target: Type[BaseModel], like: Type[BaseModel], fk: str, batch_size: int = 1000
+) -> int:
+    """
+    Set `like_count` of every target back to the number of its like rows, in batches of `batch_size` targets
+
+    The like rows are the source of truth, but a worker which dies with increments still buffered loses them
+    (see `CounterBuffer`), and its counts drift. Only run this while no increment is buffered, ie: with the
+    workers stopped or running with `COUNTER_BUFFER_ENABLED=false`, otherwise those would be counted twice.
+    Each batch is committed on its own, so the row locks are held briefly.
+
+    Returns:
+        Number of targets whose count was off
+    """
+    table, likes = target.__table__, like.__table__
+    count = select(func.count()).where(likes.c[fk] == table.c.id).scalar_subquery()
+    fixed, after = 0, None
+    while True:
+        query = select(table.c.id).order_by(table.c.id).limit(batch_size)
+        if after is not None:
+            query = query.where(table.c.id > after)
+        batch = (await db.execute(query)).scalars().all()
+        if not batch:
+            return fixed
+        stmt = (
+            update(table)
+            .where(table.c.id.in_(batch), table.c.like_count != count)
+            .values(like_count=count)
+            .returning(table.c.id)
+        )
+        ids = (await db.execute(stmt)).scalars().all()
+        target._invalidate_identity(db, ids)
+        await db.commit()
+        fixed += len(ids)
+        after = batch[-1]
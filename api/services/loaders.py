@@ -0,0 +1,57 @@
+from typing import Iterable, Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from api.db.models.base import INCLUDE_DELETED
+from api.db.models.user import User
+
+
+class UserLoader:
+    """
+    Request scoped, batching loader of user names (DataLoader style)
+
+    All the user ids asked for at once are fetched with a single `WHERE id IN (...)` query,
+    and every user loaded is memoized for the rest of the request. The loader lives in the
+    `info` of the DB session, which is scoped to the request, see `UserLoader.of`.
+
+    Names of soft deleted users are still returned, so their old posts and messages keep an author.
+    """
+
+    _info_key = "user_loader"
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._names: dict[UUID, Optional[str]] = {}
+
+    @classmethod
+    def of(cls, db: AsyncSession) -> "UserLoader":
+        """
+        Returns the loader of the session, creating it on first use
+        """
+        if (loader := db.info.get(cls._info_key)) is None:
+            loader = db.info[cls._info_key] = cls(db)
+        return loader
+
+    async def names(self, user_ids: Iterable[UUID]) -> dict[UUID, Optional[str]]:
+        """
+        Full names of the given users, `None` for the ids which do not exist
+
+        Args:
+        - user_ids (Iterable[UUID]): Users to load, duplicates are fine.
+
+        Returns:
+        - dict[UUID, Optional[str]]: Full name of each of the given user ids.
+        """
+        user_ids = set(user_ids)
+        if missing := [user_id for user_id in user_ids if user_id not in self._names]:
+            query = select(User.id, User.first_name, User.last_name).where(col(User.id).in_(missing))
+            rows = await self.db.exec(query, execution_options={INCLUDE_DELETED: True})
+            for user_id, first_name, last_name in rows.all():
+                self._names[user_id] = f"{first_name} {last_name}"
+            for user_id in missing:
+                self._names.setdefault(user_id, None)
+        return {user_id: self._names[user_id] for user_id in user_ids}
+
+    async def name(self, user_id: UUID) -> Optional[str]:
+        return (await self.names([user_id]))[user_id]
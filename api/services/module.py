@@ -1,56 +1,73 @@
 from datetime import datetime
 from uuid import UUID
 from fastapi import HTTPException
-from sqlmodel import col
 from sqlalchemy.future import select
-from sqlalchemy.sql import not_
 
-from api.interfaces.utils import List
-from api.interfaces.module import ModuleQuizCreate
+from api.interfaces.utils import List, PageParams
+from api.interfaces.module import ModuleQuizCreate, ModuleQuizRead
 from api.utils.exceptions import NotFoundError
 
 from api.services.certificate import CertificateService
 from api.interfaces.certificate import CertificateCreate
-from api.db.models.module import ModuleQuiz
+from api.db.models.module import ModuleQuiz, module_progress_counter
 from .base import BaseService
 
 class ModuleQuizService(BaseService):
-    async def get_module_quizzes_by_user(self, user_id: UUID) -> List[ModuleQuiz]:
+    async def get_module_quizzes_by_user(self, user_id: UUID, page: PageParams) -> List[ModuleQuiz]:
         """
-        Retrieve module quizzes for a specific user.
+        Retrieve a page of module quizzes for a specific user.
         """
-        res = await ModuleQuiz.get(
+        result = await ModuleQuiz.paginate(
             db=self.db,
-            filters=[ModuleQuiz.user_id == user_id, ~col(ModuleQuiz.is_deleted)]
+            page=page,
+            filters=[ModuleQuiz.user_id == user_id],
+            projection=ModuleQuizRead,
         )
-        return {"data": res.all()}
+        for module_quiz in result["data"]:
+            module_quiz.module_progress = module_progress_counter.merge(module_quiz.id, module_quiz.module_progress)
+        return result
 
-    async def get_module_quiz_by_id(self, module_quiz_id: UUID) -> ModuleQuiz:
+    def _with_pending_progress(self, module_quiz: ModuleQuiz) -> ModuleQuizRead:
         """
-        Retrieve a specific module quiz by its ID.
+        Read model of the module quiz, counting the progress still buffered in memory
         """
-        res = await ModuleQuiz.get(db=self.db, filters=[ModuleQuiz.id == module_quiz_id, ~col(ModuleQuiz.is_deleted)])
-        module_quiz = res.one_or_none()
+        read = ModuleQuizRead.model_validate(module_quiz)
+        read.module_progress = module_progress_counter.merge(module_quiz.id, module_quiz.module_progress, self.db)
+        return read
+
+    async def _get_module_quiz(self, module_quiz_id: UUID) -> ModuleQuiz:
+        module_quiz = await ModuleQuiz.get_by_id(self.db, module_quiz_id)
         if module_quiz is None:
             raise NotFoundError("Module quiz not found")
         return module_quiz
 
-    async def increment_module_progress(self, module_quiz_id: UUID) -> ModuleQuiz:
+    async def get_module_quiz_by_id(self, module_quiz_id: UUID) -> ModuleQuizRead:
+        """
+        Retrieve a specific module quiz by its ID.
+        """
+        return self._with_pending_progress(await self._get_module_quiz(module_quiz_id))
+
+    async def increment_module_progress(self, module_quiz_id: UUID) -> ModuleQuizRead:
         """
         Increment module progress by one. If progress is already noted, return the existing data without incrementing.
+
+        The increment goes through the progress buffer when it runs, see `module_progress_counter`.
         """
-        module_quiz = await self.get_module_quiz_by_id(module_quiz_id)
-        if module_quiz.module_progress >= 1:
+        module_quiz = await self._get_module_quiz(module_quiz_id)
+        if module_progress_counter.merge(module_quiz.id, module_quiz.module_progress, self.db) >= 1:
             # Return the existing data without incrementing
-            return module_quiz
-        
-        module_quiz.module_progress += 1
-        await module_quiz.save(self.db)
-        return module_quiz
+            return self._with_pending_progress(module_quiz)
+
+        if module_progress_counter.enabled:
+            module_progress_counter.add_on_commit(self.db, module_quiz.id)
+        else:
+            module_quiz.module_progress += 1
+            await module_quiz.save(self.db)
+        return self._with_pending_progress(module_quiz)
 
     async def increment_module_completed(self, module_quiz_id: UUID) -> ModuleQuiz:
         try:
-            module_quiz = await self.get_module_quiz_by_id(module_quiz_id)
+            module_quiz = await self._get_module_quiz(module_quiz_id)
 
             if module_quiz.module_completed >= 1:
                 return module_quiz
@@ -59,9 +76,6 @@ class ModuleQuizService(BaseService):
             
             module_quiz.completed_at = datetime.now()
             await module_quiz.save(self.db)
-            
-            # Refresh to ensure latest data
-            await self.db.refresh(module_quiz)
 
             # Certificate creation logic remains the same
             certificate_service = CertificateService(db=self.db)
@@ -91,7 +105,7 @@ class ModuleQuizService(BaseService):
         """
         Update module quiz score conditionally.
         """
-        module_quiz = await self.get_module_quiz_by_id(module_quiz_id)
+        module_quiz = await self._get_module_quiz(module_quiz_id)
         
         if module_quiz.m_quizscore == 0:
             module_quiz.m_quizscore = score
@@ -116,7 +130,6 @@ class ModuleQuizService(BaseService):
         query = select(ModuleQuiz).where(
         ModuleQuiz.user_id == data.user_id,
         ModuleQuiz.module_name == data.module_name,
-        not_(ModuleQuiz.is_deleted)
         )
 
         result = await self.db.execute(query)
@@ -135,7 +148,7 @@ class ModuleQuizService(BaseService):
         """
         Mark a module quiz as deleted.
         """
-        module_quiz = await self.get_module_quiz_by_id(module_quiz_id)
+        module_quiz = await self._get_module_quiz(module_quiz_id)
         module_quiz.is_deleted = True
         await module_quiz.save(self.db)
 
@@ -145,15 +158,14 @@ class ModuleQuizService(BaseService):
         """
         try:
             query = select(ModuleQuiz).where(
-                ModuleQuiz.user_id == user_id,
-                not_(ModuleQuiz.is_deleted)
+                ModuleQuiz.user_id == user_id
             )
 
             result = await self.db.execute(query)
             quizzes = result.scalars().all()
 
             # Aggregate progress and completed counts
-            total_progress = sum(quiz.module_progress for quiz in quizzes)
+            total_progress = sum(module_progress_counter.merge(quiz.id, quiz.module_progress) for quiz in quizzes)
             total_completed = sum(quiz.module_completed for quiz in quizzes)
 
             return {
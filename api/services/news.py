@@ -1,13 +1,16 @@
-import requests
+import httpx
 from typing import List
 
+from api.utils.http import http_clients
+
+
 class NewsService:
     BASE_URL = "https://newsapi.org/v2/everything"
     API_KEY = "8a546bb93cd1429c96fa3c5bd075809b"
     ITEMS_PER_PAGE = 20  # Increased to 20 articles per page
 
     @classmethod
-    def fetch_news(cls, page: int = 1) -> List[dict]:
+    async def fetch_news(cls, page: int = 1) -> List[dict]:
         try:
             # Query focused on sports, doping, and anti-doping
             query = "(doping OR anti-doping) AND sports"
@@ -20,7 +23,7 @@ class NewsService:
                 "language": "en"
             }
 
-            response = requests.get(cls.BASE_URL, params=params)
+            response = await http_clients.get("newsapi").get(cls.BASE_URL, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -38,7 +41,7 @@ class NewsService:
             ]
             
             return filtered_articles
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f"Network error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error fetching news: {str(e)}")
\ No newline at end of file
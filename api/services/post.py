@@ -1,13 +1,118 @@
+import time
+from datetime import datetime, timedelta
+from typing import Optional
 from uuid import UUID
-from sqlmodel import col
-from api.db.models.post import Post
-from api.interfaces.utils import List
-from api.interfaces.post import PostRead, PostCreate, PostUpdate
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import col, select
+from api.db.models.comments import Comment
+from api.db.models.post import HashtagCount, Post, PostHashtag, PostLike, parse_hashtags, post_like_counter
+from api.db.models.user import User
+from api.interfaces.utils import List, PageParams
+from api.interfaces.post import FeedPost, FeedSort, PostAuthor, PostRead, PostCreate, PostUpdate, TrendingHashtag
+from api.utils.cache import TTLCache
 from api.utils.exceptions import NotFoundError
 from .base import BaseService
+from .likes import add_like, remove_like
+from .loaders import UserLoader
+
+
+# Longest window of the trending hashtags, the hourly counts older than it are pruned
+TRENDING_MAX_HOURS = 7 * 24
+# Seconds between two prunes of the hourly counts by a worker, see `_count_hashtags`
+PRUNE_INTERVAL = 60 * 60
+
+# Trending hashtags by (hours, limit). They move slowly, a minute old answer is fine and spares the aggregate.
+_trending_cache = TTLCache("trending_hashtags", maxsize=64, ttl=60)
+# When this worker last pruned the hourly counts (`time.monotonic`)
+_last_prune: Optional[float] = None
+
+
+def _hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
 
 
 class PostService(BaseService):
+    async def _add_user_names(self, result: dict) -> dict:
+        """
+        Add the author name to a page of posts, all the authors are loaded with one query
+        """
+        names = await UserLoader.of(self.db).names(post.user_id for post in result["data"])
+        for post in result["data"]:
+            post.user_name = names[post.user_id]
+            post.like_count = post_like_counter.merge(post.id, post.like_count)
+        return result
+
+    def _with_pending_likes(self, post: Post) -> PostRead:
+        """
+        Read model of the post, counting the likes still buffered in memory
+        """
+        read = PostRead.model_validate(post)
+        read.like_count = post_like_counter.merge(post.id, post.like_count, self.db)
+        return read
+
+    async def _count_hashtags(self, deltas: dict[tuple[str, datetime], int]):
+        """
+        Add the deltas to the hourly hashtag counts, one upsert for all of them
+        """
+        counts = [
+            HashtagCount(tag=tag, bucket=bucket, count=delta)
+            # sorted, so concurrent upserts lock the count rows in the same order
+            for (tag, bucket), delta in sorted(deltas.items())
+            if delta
+        ]
+        if not counts:
+            return
+        await self._prune_hashtag_counts()
+        stmt = pg_insert(HashtagCount).values([HashtagCount._column_values(count) for count in counts])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["tag", "bucket"], set_={"count": HashtagCount.count + stmt.excluded["count"]}
+        )
+        await self.db.execute(stmt)
+
+    async def _prune_hashtag_counts(self):
+        """
+        Delete the hourly counts out of the longest trending window, at most every `PRUNE_INTERVAL` per worker
+        """
+        global _last_prune  # pylint: disable=global-statement
+        if _last_prune is not None and time.monotonic() - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = time.monotonic()
+        oldest = _hour(datetime.now()) - timedelta(hours=TRENDING_MAX_HOURS - 1)
+        await self.db.execute(delete(HashtagCount).where(HashtagCount.bucket < oldest))
+
+    async def _sync_hashtags(self, post: Post, created: bool = False):
+        """
+        Make the `post_hashtags` rows of the post match its `hashtag` text, and count the tags added and removed
+        """
+        tags = set() if post.is_deleted else parse_hashtags(post.hashtag)
+        current: dict[str, PostHashtag] = {}
+        if not created:
+            rows = await self.db.exec(select(PostHashtag).where(PostHashtag.post_id == post.id))
+            current = {row.tag: row for row in rows.all()}
+
+        deltas: dict[tuple[str, datetime], int] = {}
+        if removed := [row for tag, row in current.items() if tag not in tags]:
+            await self.db.execute(delete(PostHashtag).where(col(PostHashtag.id).in_([row.id for row in removed])))
+            for row in removed:
+                # uncount it from the hour it was counted in
+                key = (row.tag, _hour(row.created_at))
+                deltas[key] = deltas.get(key, 0) - 1
+        if added := sorted(tags - current.keys()):
+            await PostHashtag.save_many(
+                self.db, [PostHashtag(post_id=post.id, tag=tag, post_created_at=post.created_at) for tag in added]
+            )
+            now = _hour(datetime.now())
+            for tag in added:
+                deltas[(tag, now)] = deltas.get((tag, now), 0) + 1
+        await self._count_hashtags(deltas)
+
+    async def _get_post(self, post_id: UUID) -> Post:
+        post = await Post.get_by_id(self.db, post_id)
+        if post is None:
+            raise NotFoundError("Post not found")
+        return post
+
     async def get_post(self, post_id: UUID) -> PostRead:
         """
         Retrieve a specific post by its UUID.
@@ -21,21 +126,112 @@ class PostService(BaseService):
         Raises:
         - NotFoundError: Raised if the post is not found.
         """
-        res = await Post.get(db=self.db, filters=[Post.id == post_id, ~col(Post.is_deleted)])
-        post = res.one_or_none()
-        if post is None:
-            raise NotFoundError("Post not found")
-        return post
+        return self._with_pending_likes(await self._get_post(post_id))
 
-    async def get_posts(self) -> List[PostRead]:
+    async def get_posts(self, page: PageParams, hashtag: Optional[str] = None) -> List[PostRead]:
         """
-        Retrieve a list of non-deleted posts.
+        Retrieve a page of non-deleted posts, newest first.
+
+        Args:
+        - page (PageParams): Cursor and size of the page to fetch.
+        - hashtag (str): Only the posts with this hashtag, with or without the `#`.
 
         Returns:
-        - List[PostRead]: List of non-deleted posts.
+        - List[PostRead]: Page of non-deleted posts.
         """
-        res = await Post.get(db=self.db, filters=[~col(Post.is_deleted)])
-        return {"data": res.all()}
+        if hashtag is None:
+            result = await Post.paginate(db=self.db, page=page, descending=True, projection=PostRead)
+            return await self._add_user_names(result)
+
+        # paginated on the (tag, post_created_at, post_id) index, the posts are joined in for the page only
+        tag = hashtag.lstrip("#").lower()
+        query = (
+            select(*Post.projection_columns(PostRead), PostHashtag.post_created_at, PostHashtag.post_id)
+            .join(PostHashtag, PostHashtag.post_id == Post.id)
+            .where(PostHashtag.tag == tag)
+        )
+        result = await Post.paginate(
+            db=self.db,
+            page=page,
+            query=query,
+            keys=[PostHashtag.post_created_at, PostHashtag.post_id],
+            descending=True,
+        )
+        result["data"] = [PostRead.model_validate(row._mapping) for row in result["data"]]
+        return await self._add_user_names(result)
+
+    async def get_trending_hashtags(self, hours: int = 24, limit: int = 10) -> list[TrendingHashtag]:
+        """
+        Most used hashtags of the last `hours`, from the hourly counts kept up to date on every post write.
+
+        Args:
+        - hours (int): Length of the rolling window.
+        - limit (int): Number of hashtags to return.
+
+        Returns:
+        - list[TrendingHashtag]: Hashtags with their uses in the window, most used first.
+        """
+        if (trending := _trending_cache.get((hours, limit))) is not None:
+            return trending
+        uses = func.sum(HashtagCount.count).label("uses")
+        query = (
+            select(HashtagCount.tag, uses)
+            .where(HashtagCount.bucket >= _hour(datetime.now()) - timedelta(hours=hours - 1))
+            .group_by(HashtagCount.tag)
+            .having(uses > 0)
+            .order_by(uses.desc(), HashtagCount.tag)
+            .limit(limit)
+        )
+        rows = await self.db.exec(query)
+        trending = [TrendingHashtag(tag=tag, uses=count) for tag, count in rows.all()]
+        _trending_cache.set((hours, limit), trending)
+        return trending
+
+    async def get_feed(self, page: PageParams, sort: FeedSort = FeedSort.RECENT) -> List[FeedPost]:
+        """
+        Retrieve a page of the feed, with the author and the comment count of each post, in one query.
+
+        Args:
+        - page (PageParams): Cursor and size of the page to fetch.
+        - sort (FeedSort): `recent` for the newest posts first, `top` for the most liked first.
+
+        Returns:
+        - List[FeedPost]: Page of the feed.
+        """
+        # the users table rather than the model, so the soft delete filter leaves the authors of old posts in
+        users = User.__table__
+        comment_count = (
+            select(func.count(Comment.id)).where(Comment.post_id == Post.id).correlate(Post).scalar_subquery()
+        )
+        query = select(
+            *Post.projection_columns(PostRead),
+            users.c.first_name.label("author_first_name"),
+            users.c.last_name.label("author_last_name"),
+            users.c.dp_url.label("author_dp_url"),
+            users.c.id.label("author_id"),
+            comment_count.label("comment_count"),
+        ).outerjoin(users, users.c.id == Post.user_id)
+        keys = Post.keyset_columns()
+        if sort == FeedSort.TOP:
+            keys = [Post.like_count, *keys]
+        result = await Post.paginate(db=self.db, page=page, query=query, keys=keys, descending=True)
+
+        feed = []
+        for row in result["data"]:
+            values = row._mapping
+            post = FeedPost.model_validate(values)
+            post.like_count = post_like_counter.merge(post.id, post.like_count)
+            if values["author_id"] is not None:
+                post.author = PostAuthor(
+                    id=values["author_id"],
+                    first_name=values["author_first_name"],
+                    last_name=values["author_last_name"],
+                    dp_url=values["author_dp_url"],
+                )
+                post.user_name = f"{post.author.first_name} {post.author.last_name}"
+            feed.append(post)
+        result["data"] = feed
+        return result
 
     async def create_post(self, data: PostCreate) -> PostRead:
         """
@@ -49,6 +245,7 @@ class PostService(BaseService):
         """
         new_post = Post(**data.model_dump())
         await new_post.save(self.db)
+        await self._sync_hashtags(new_post, created=True)
         return new_post
 
     async def delete_post(self, post_id: UUID):
@@ -58,9 +255,12 @@ class PostService(BaseService):
         Args:
         - post_id (UUID): The UUID of the post to delete.
         """
-        post = await self.get_post(post_id)
+        post = await self._get_post(post_id)
         post.is_deleted = True
         await post.save(self.db)
+        # without any tag in its text the post has no `post_hashtags` rows to remove
+        if parse_hashtags(post.hashtag):
+            await self._sync_hashtags(post)
 
     async def update_post(self, post_id: UUID, data: PostUpdate) -> PostRead:
         """
@@ -73,42 +273,49 @@ class PostService(BaseService):
         Returns:
         - PostRead: Details of the updated post.
         """
-        post = await self.get_post(post_id)
+        post = await self._get_post(post_id)
         await post.update(self.db, data)
-        return post
+        if "hashtag" in data.model_dump(exclude_unset=True):
+            await self._sync_hashtags(post)
+        return self._with_pending_likes(post)
     
-    async def increment_like_count(self, post_id: UUID) -> PostRead:
+    async def increment_like_count(self, post_id: UUID, user_id: UUID) -> PostRead:
         """
-        Increment the like count of a post.
+        Like a post, once per user. Liking it again leaves the count as is.
+
+        Raises:
+        - NotFoundError: Raised if the post is not found.
         """
-        post = await self.get_post(post_id)
-        post.like_count = post.like_count + 1 if post.like_count else 1
-        await post.save(self.db)
-        return post
-    
-    async def decrement_like_count(self, post_id: UUID) -> PostRead:
+        post = await add_like(self.db, Post, PostLike, "post_id", post_id, user_id, post_like_counter)
+        return self._with_pending_likes(post if post is not None else await self._get_post(post_id))
+
+    async def decrement_like_count(self, post_id: UUID, user_id: UUID) -> PostRead:
         """
-        Decrement the like count of a post.
+        Take back the like of the user on a post, if any.
+
+        Raises:
+        - NotFoundError: Raised if the post is not found.
         """
-        post = await self.get_post(post_id)
-        if post.like_count and post.like_count > 0:
-            post.like_count -= 1
-        await post.save(self.db)
-        return post
+        post = await remove_like(self.db, Post, PostLike, "post_id", post_id, user_id, post_like_counter)
+        return self._with_pending_likes(post if post is not None else await self._get_post(post_id))
     
-    async def get_posts_by_user(self, user_id: UUID) -> List[PostRead]:
+    async def get_posts_by_user(self, user_id: UUID, page: PageParams) -> List[PostRead]:
         """
-        Retrieve a list of posts created by a specific user.
+        Retrieve a page of posts created by a specific user, newest first.
 
         Args:
         - user_id (UUID): The UUID of the user whose posts are to be retrieved.
+        - page (PageParams): Cursor and size of the page to fetch.
 
         Returns:
-        - List[PostRead]: List of posts created by the user.
+        - List[PostRead]: Page of posts created by the user.
         """
-        res = await Post.get(
+        result = await Post.paginate(
             db=self.db,
-            filters=[Post.user_id == user_id, ~col(Post.is_deleted)]
+            page=page,
+            filters=[Post.user_id == user_id],
+            descending=True,
+            projection=PostRead,
         )
-        return {"data": res.all()}
+        return await self._add_user_names(result)
 
@@ -0,0 +1,119 @@
+from typing import Optional
+from sqlalchemy import false, func, literal_column, null, select, union_all
+
+from api.db.models.base import SEARCH_CONFIG
+from api.db.models.comments import Comment
+from api.db.models.forum import ForumMessage
+from api.db.models.post import Post
+from api.interfaces.search import SearchResult, SearchType
+from api.interfaces.utils import List, PageParams
+from .base import BaseService
+
+# Number of matches of each kind which are ranked, the most recent ones, see `SearchService._candidates`
+SEARCH_CANDIDATES = 1000
+
+
+class SearchService(BaseService):
+    """
+    Full text search over posts, comments and forum messages
+
+    Each kind is matched on its `search_vector` column through a GIN index, see `add_search_vector`.
+    The most recent `SEARCH_CANDIDATES` matches of each kind are ranked by `ts_rank` and merged with UNION ALL.
+    """
+
+    @staticmethod
+    def _candidates(model: type, query, *where):
+        """
+        The `SEARCH_CANDIDATES` most recent rows of `model` matching `query`, newest first
+
+        Ranking every match means reading the rows of all of them, up to the whole table for a common word.
+        The candidates are picked by the primary key instead (uuid7, so in creation order): Postgres walks the
+        key index back until it has enough matches for a common word, or takes the few matches of the GIN
+        index for a rare one. Only the candidates are ranked.
+        """
+        table = model.__table__
+        return (
+            select(table)
+            .where(table.c.search_vector.op("@@")(query), *where)
+            .order_by(table.c.id.desc())
+            .limit(SEARCH_CANDIDATES)
+            .subquery(f"{table.name}_candidates")
+        )
+
+    @classmethod
+    def _posts(cls, query):
+        posts = cls._candidates(Post, query, Post.is_deleted == false())
+        return select(
+            literal_column(f"'{SearchType.POST.value}'").label("type"),
+            posts.c.id,
+            posts.c.user_id,
+            posts.c.title.label("title"),
+            posts.c.description.label("text"),
+            null().label("parent_id"),
+            func.ts_rank(posts.c.search_vector, query).label("rank"),
+            posts.c.created_at,
+        )
+
+    @classmethod
+    def _comments(cls, query):
+        comments = cls._candidates(Comment, query, Comment.is_deleted == false())
+        return select(
+            literal_column(f"'{SearchType.COMMENT.value}'").label("type"),
+            comments.c.id,
+            comments.c.user_id,
+            null().label("title"),
+            comments.c.comment.label("text"),
+            comments.c.post_id.label("parent_id"),
+            func.ts_rank(comments.c.search_vector, query).label("rank"),
+            comments.c.created_at,
+        )
+
+    @classmethod
+    def _messages(cls, query):
+        messages = cls._candidates(ForumMessage, query)
+        return select(
+            literal_column(f"'{SearchType.MESSAGE.value}'").label("type"),
+            messages.c.id,
+            messages.c.user_id,
+            null().label("title"),
+            messages.c.message.label("text"),
+            messages.c.forum_id.label("parent_id"),
+            func.ts_rank(messages.c.search_vector, query).label("rank"),
+            messages.c.created_at,
+        )
+
+    async def search(self, q: str, page: PageParams, type: Optional[SearchType] = None) -> List[SearchResult]:
+        """
+        Search the posts, comments and forum messages matching `q`, most relevant first.
+
+        Args:
+        - q (str): Search text, in web search syntax: `doping -cycling "blood test" or epo`.
+        - page (PageParams): Cursor and size of the page to fetch.
+        - type (SearchType): Only search this kind of item.
+
+        Returns:
+        - List[SearchResult]: Page of matches, ranked by relevance. Only the `SEARCH_CANDIDATES` most recent
+          matches of each kind are ranked, so a query matching more rows than that pages through those only.
+        """
+        # pylint: disable=redefined-builtin
+        query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        branches = [
+            branch(query)
+            for kind, branch in (
+                (SearchType.POST, self._posts),
+                (SearchType.COMMENT, self._comments),
+                (SearchType.MESSAGE, self._messages),
+            )
+            if type in (None, kind)
+        ]
+        results = (branches[0] if len(branches) == 1 else union_all(*branches)).subquery("results")
+        # ranks tie often (eg: one word queries), the id keeps the order stable for the cursor
+        page_result = await Post.paginate(
+            db=self.db,
+            page=page,
+            query=select(results),
+            keys=[results.c.rank, results.c.id],
+            descending=True,
+        )
+        page_result["data"] = [SearchResult.model_validate(dict(row._mapping)) for row in page_result["data"]]
+        return page_result
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from sqlmodel import col, select
+from sqlalchemy import update
+
+from api.db.models.token import RefreshToken
+from api.db.models.user import User
+from api.utils.auth import create_access_token, hash_refresh_token, new_refresh_token, settings
+from api.utils.exceptions import ACLError
+from .base import BaseService
+
+
+class RefreshTokenService(BaseService):
+    """
+    Rotating refresh tokens, exchanged for new access tokens without checking the password again
+
+    Every refresh revokes the presented token and issues a new one. A revoked token showing up again
+    means it was copied, so all the tokens of that user and device are revoked (reuse detection).
+    """
+
+    async def issue(self, user_id: UUID, device_id: Optional[str] = None) -> str:
+        """
+        Issue a refresh token for the user, returns the token (only its hash is stored)
+        """
+        token = new_refresh_token()
+        refresh_token = RefreshToken(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            device_id=device_id,
+            expires_at=datetime.now() + timedelta(seconds=settings.refresh_token_ttl),
+        )
+        await refresh_token.save(self.db)
+        return token
+
+    async def _get_by_token(self, token: str) -> Optional[RefreshToken]:
+        # lock the row, so two concurrent refreshes of the same token can not both succeed
+        query = select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token)).with_for_update()
+        return (await self.db.exec(query)).one_or_none()
+
+    async def revoke_device(self, user_id: UUID, device_id: Optional[str]):
+        """
+        Revoke all the live tokens of the user on the device, `None` being the tokens without a device
+        """
+        if device_id is not None:
+            device = RefreshToken.device_id == device_id
+        else:
+            device = col(RefreshToken.device_id).is_(None)
+        await self.db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, device, col(RefreshToken.revoked_at).is_(None))
+            .values(revoked_at=datetime.now())
+        )
+
+    async def refresh(self, token: str) -> dict:
+        """
+        Exchange a refresh token for a new access token and a new refresh token
+
+        Raises:
+        - ACLError: Raised if the token is unknown, expired, revoked, or its user is deleted.
+        """
+        refresh_token = await self._get_by_token(token)
+        if refresh_token is None:
+            raise ACLError("Invalid refresh token")
+        if refresh_token.revoked_at is not None:
+            await self.revoke_device(refresh_token.user_id, refresh_token.device_id)
+            # the revocation has to be kept, even though the request fails
+            await self.db.commit()
+            raise ACLError("Refresh token has been revoked")
+        if refresh_token.expires_at <= datetime.now():
+            raise ACLError("Refresh token has expired")
+        if await User.get_by_id(self.db, refresh_token.user_id) is None:
+            raise ACLError("Invalid refresh token")
+
+        refresh_token.revoked_at = datetime.now()
+        await refresh_token.save(self.db)
+        return {
+            "access_token": create_access_token(refresh_token.user_id),
+            "refresh_token": await self.issue(refresh_token.user_id, refresh_token.device_id),
+            "token_type": "bearer",
+        }
+
+    async def revoke(self, token: str):
+        """
+        Revoke a refresh token, eg: on logout. Unknown or already revoked tokens are ignored.
+        """
+        refresh_token = await self._get_by_token(token)
+        if refresh_token is not None and refresh_token.revoked_at is None:
+            refresh_token.revoked_at = datetime.now()
+            await refresh_token.save(self.db)
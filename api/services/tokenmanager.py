@@ -1,12 +1,102 @@
-import httpx
+import asyncio
+import re
+import time
+from typing import Optional
 import jwt
 import os
+from jose import JWTError, jwt as jose_jwt
+
+from api.utils.exceptions import AuthenticationError
+from api.utils.http import http_clients
+
+# Google's public signing keys, see `GoogleKeySet`
+JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+# Accepted `iss` claims of Google ID tokens
+GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
+
+
+class GoogleKeySet:
+    """
+    Google's public signing keys (JWKS), cached across logins
+
+    The keys are fetched again once the `max-age` of the last response is over, or when a token is
+    signed by a key we do not know yet (Google rotates its keys). Such forced refreshes happen at most
+    every `min_refresh_interval` seconds, so tokens with a bogus `kid` can not hammer Google.
+
+    Pass `jwks` to use a fixed keyset which is never fetched, eg: a locally generated keypair in tests.
+    """
+
+    def __init__(
+        self,
+        jwks: Optional[dict] = None,
+        url: str = JWKS_URL,
+        default_ttl: float = 60 * 60,
+        min_refresh_interval: float = 60,
+    ):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._static = jwks is not None
+        self._keys: dict[str, dict] = self._index(jwks) if jwks else {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _index(jwks: dict) -> dict[str, dict]:
+        return {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+
+    def _max_age(self, cache_control: str) -> float:
+        match = re.search(r"max-age=(\d+)", cache_control or "")
+        return float(match.group(1)) if match else self.default_ttl
+
+    async def _refresh(self, force: bool = False):
+        async with self._lock:
+            now = time.monotonic()
+            # another login refreshed the keys while this one waited for the lock
+            if (not force and now < self._expires_at) or (force and now - self._fetched_at < self.min_refresh_interval):
+                return
+            try:
+                response = await http_clients.get("google").get(self.url)
+                response.raise_for_status()
+                keys = self._index(response.json())
+            except Exception as e:
+                # keep verifying with the keys we have, Google rotates them slowly
+                print(f"JWKS Refresh Error: {e}")  # TODO: Change print to logger
+                # and wait `min_refresh_interval` before trying again, not on every login during an outage
+                self._fetched_at = now
+                self._expires_at = max(self._expires_at, now + self.min_refresh_interval)
+                if not self._keys:
+                    raise AuthenticationError("Failed to fetch the Google signing keys") from e
+                return
+            self._keys = keys
+            self._fetched_at = now
+            self._expires_at = now + self._max_age(response.headers.get("Cache-Control"))
+
+    async def get_key(self, kid: Optional[str]) -> Optional[dict]:
+        """
+        The public key (JWK) with the id `kid`, None if Google does not know it either
+        """
+        if self._static:
+            return self._keys.get(kid)
+        if time.monotonic() >= self._expires_at:
+            await self._refresh()
+        if kid not in self._keys:
+            await self._refresh(force=True)
+        return self._keys.get(kid)
+
+
+google_keys = GoogleKeySet()
 
 
 class TokenManager:
     GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
     GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 
+    def __init__(self, keys: GoogleKeySet = google_keys, client_id: Optional[str] = None):
+        self.keys = keys
+        self.client_id = client_id or os.getenv("GOOGLE_CLIENT_ID")
+
     async def authenticate_with_google(self, code: str, redirect_uri: str) -> dict:
         """
         Exchange authorization code for access token.
@@ -21,16 +111,15 @@ class TokenManager:
         client_id = os.getenv("GOOGLE_CLIENT_ID")
         client_secret = os.getenv("GOOGLE_CLIENT_SECRET")
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(self.GOOGLE_TOKEN_URL, data={
-                "code": code,
-                "client_id": client_id,
-                "client_secret": client_secret,
-                "redirect_uri": redirect_uri,
-                "grant_type": "authorization_code",
-            })
-            response.raise_for_status()
-            return response.json()
+        response = await http_clients.get("google").post(self.GOOGLE_TOKEN_URL, data={
+            "code": code,
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "redirect_uri": redirect_uri,
+            "grant_type": "authorization_code",
+        })
+        response.raise_for_status()
+        return response.json()
 
     async def decode_jwt_token(self, access_token: str) -> dict:
         """
@@ -42,9 +131,42 @@ class TokenManager:
         Returns:
         - dict: User information decoded from the JWT.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.GOOGLE_USERINFO_URL, headers={
-                "Authorization": f"Bearer {access_token}"
-            })
-            response.raise_for_status()
-            return response.json()
+        response = await http_clients.get("google").get(self.GOOGLE_USERINFO_URL, headers={
+            "Authorization": f"Bearer {access_token}"
+        })
+        response.raise_for_status()
+        return response.json()
+
+    async def verify_id_token(self, id_token: str, access_token: Optional[str] = None) -> dict:
+        """
+        Verify a Google ID token locally, against the cached signing keys of Google
+
+        Args:
+        - id_token (str): ID token from the token response of Google.
+        - access_token (str): Access token issued with it, checked against the `at_hash` claim if given.
+
+        Returns:
+        - dict: Claims of the token, with the same profile fields as the userinfo endpoint (email, given_name, ...).
+
+        Raises:
+        - AuthenticationError: Raised if the token is malformed, expired, not signed by Google or not issued for us.
+        """
+        try:
+            header = jose_jwt.get_unverified_header(id_token)
+        except JWTError as e:
+            raise AuthenticationError("Invalid Google ID token") from e
+        key = await self.keys.get_key(header.get("kid"))
+        if key is None:
+            raise AuthenticationError("Google ID token is signed by an unknown key")
+        try:
+            return jose_jwt.decode(
+                id_token,
+                key,
+                algorithms=["RS256"],
+                audience=self.client_id,
+                issuer=GOOGLE_ISSUERS,
+                access_token=access_token,
+                options={"verify_at_hash": access_token is not None},
+            )
+        except JWTError as e:
+            raise AuthenticationError(f"Invalid Google ID token: {e}") from e
@@ -1,67 +1,60 @@
-import bcrypt
 from uuid import UUID
-from sqlmodel import col
 from api.db.models.user import User
-from api.interfaces.utils import List
-from api.interfaces.user import UserRead, UserCreate, UserUpdate, UserLogin
+from api.interfaces.utils import List, PageParams
+from api.interfaces.user import UserRead, UserListRead, UserCreate, UserUpdate, UserLogin
 from api.utils.exceptions import NotFoundError, DuplicateConstraint, AuthenticationError
 from api.services.tokenmanager import TokenManager
+from api.utils.auth import create_access_token
+from api.utils.passwords import password_hasher
+from api.services.token import RefreshTokenService
+from api.utils.http import http_clients
 from .base import BaseService
-import httpx
-import jwt
 import os
-from datetime import datetime, timedelta
 
 
 class UserService(BaseService):
-    def _hash_password(self, password: str) -> str:
+    async def _hash_password(self, password: str) -> str:
         """
-        Hash a password using bcrypt
+        Hash a password using bcrypt, on the password hashing pool so the event loop is not blocked
         """
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return await password_hasher.hash(password)
 
-    def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
+    async def _verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
-        Verify a password against its hash
+        Verify a password against its hash, on the password hashing pool so the event loop is not blocked
         """
-        return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+        return await password_hasher.verify(plain_password, hashed_password)
 
     def _create_access_token(self, user_id: UUID) -> str:
         """
-        Create a JWT access token
+        Create a JWT access token, verified by `api.utils.auth.get_current_user_id`
         """
-        secret_key = os.getenv('JWT_SECRET_KEY', 'your_very_secret_key')
-        payload = {
-            'sub': str(user_id),
-            'exp': datetime.utcnow() + timedelta(hours=2)
-        }
-        return jwt.encode(payload, secret_key, algorithm='HS256')
+        return create_access_token(user_id)
 
     async def login(self, login_data: UserLogin):
         """
         Authenticate a user and return an access token.
         """
-        # Retrieve the user based on the provided email and ensure they are not marked as deleted
-        res = await User.get(
-            db=self.db,
-            filters=[User.email == login_data.email, ~col(User.is_deleted)]
-        )
+        # Retrieve the user based on the provided email, deleted users are left out by `User.get`
+        res = await User.get(db=self.db, filters=[User.email == login_data.email])
         user = res.one_or_none()
 
         # Check if the user exists and if the password matches
-        if not user or not self._verify_password(login_data.password, user.password):
+        if not user or not await self._verify_password(login_data.password, user.password):
             raise AuthenticationError("Invalid email or password")
 
         # Check if the provided category matches the user's category
         if login_data.category != user.category:
             raise AuthenticationError("Invalid category")
 
-        # Generate an access token
+        # Generate an access token, and a refresh token to get the next ones without logging in again
         access_token = self._create_access_token(user.id)
+        refresh_token = await RefreshTokenService(db=self.db).issue(user.id, login_data.device_id)
 
-        # Return the access token along with user details
+        # Return the tokens along with user details
         return {
             "access_token": access_token,
+            "refresh_token": refresh_token,
             "token_type": "bearer",
             "id": user.id,
             "first_name": user.first_name,
@@ -85,33 +78,34 @@ class UserService(BaseService):
         Raises:
         - NotFoundError: Raised if the user is not found.
         """
-        # pylint: disable=invalid-unary-operand-type
-        res = await User.get(db=self.db, filters=[User.id == user_id, ~col(User.is_deleted)])
-        user = res.one_or_none()
+        user = await User.get_by_id(self.db, user_id)
         if user is None:
             raise NotFoundError("User not found")
         return user
 
-    async def get_users(self) -> List[UserRead]:
+    async def get_users(self, page: PageParams) -> List[UserListRead]:
         """
-        Retrieve a list of non-deleted users.
+        Retrieve a page of non-deleted users.
+
+        Args:
+        - page (PageParams): Cursor and size of the page to fetch.
 
         Returns:
-        - List[UserRead]: List of non-deleted users.
+        - List[UserListRead]: Page of non-deleted users, without their password hash and bio.
         """
-        # pylint: disable=invalid-unary-operand-type
-        res = await User.get(db=self.db, filters=[~col(User.is_deleted)])
-        return {"data": res.all()}
+        return await User.paginate(db=self.db, page=page, projection=UserListRead)
 
-    async def get_internal_users(self) -> List[UserRead]:
+    async def get_internal_users(self, page: PageParams) -> List[UserRead]:
         """
-        Retrieve a list of internal users, including those marked as deleted.
+        Retrieve a page of internal users, including those marked as deleted.
+
+        Args:
+        - page (PageParams): Cursor and size of the page to fetch.
 
         Returns:
-        - List[UserRead]: List of internal users.
+        - List[UserRead]: Page of internal users.
         """
-        res = await User.get(db=self.db)
-        return {"data": res.all()}
+        return await User.paginate(db=self.db, page=page, include_deleted=True)
 
     async def validate_unique_user(self, email: str = None, user_id: UUID = None):
         """
@@ -126,7 +120,8 @@ class UserService(BaseService):
         """
         # Check for unique email
         if email:
-            existing_user = await User.get(db=self.db, filters=[User.email == email])
+            # deleted users keep their email, which is unique in the table
+            existing_user = await User.get(db=self.db, filters=[User.email == email], include_deleted=True)
             if (user := existing_user.one_or_none()) and user.id != user_id:
                 raise DuplicateConstraint("Email is already taken")
 
@@ -145,7 +140,7 @@ class UserService(BaseService):
         """
         await self.validate_unique_user(email=data.email)
 
-        data.password = self._hash_password(data.password)
+        data.password = await self._hash_password(data.password)
 
         new_user = User(**data.model_dump())
         await new_user.save(self.db)
@@ -200,38 +195,40 @@ class UserService(BaseService):
         if code_verifier:
             token_data["code_verifier"] = code_verifier
 
-        async with httpx.AsyncClient() as client:
-            try:
-                token_response = await client.post(
-                    token_url,
-                    data=token_data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                )
-                token_data = token_response.json()
-
-                # If token exchange fails, raise specific error
-                if "error" in token_data:
-                    raise AuthenticationError(f"Google OAuth failed: {token_data.get('error_description', 'Unknown error')}")
-
-            except Exception as e:
-                # Log the full error for debugging
-                print(f"Token Exchange Error: {e}")
-                raise AuthenticationError("Failed to authenticate with Google")
-
-        # Get user info from Google using the access token
-        user_info_url = "https://openidconnect.googleapis.com/v1/userinfo"
-        access_token = token_data["access_token"]
-        async with httpx.AsyncClient() as client:
-            user_info_response = await client.get(
-                user_info_url, headers={"Authorization": f"Bearer {access_token}"}
+        client = http_clients.get("google")
+        try:
+            token_response = await client.post(
+                token_url,
+                data=token_data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
             )
-            user_info = user_info_response.json()
+            token_data = token_response.json()
+
+            # If token exchange fails, raise specific error
+            if "error" in token_data:
+                raise AuthenticationError(f"Google OAuth failed: {token_data.get('error_description', 'Unknown error')}")
+
+        except Exception as e:
+            # Log the full error for debugging
+            print(f"Token Exchange Error: {e}")
+            raise AuthenticationError("Failed to authenticate with Google")
+
+        # The ID token already carries the profile, verify it locally instead of calling the userinfo endpoint
+        token_manager = TokenManager()
+        access_token = token_data["access_token"]
+        if id_token := token_data.get("id_token"):
+            user_info = await token_manager.verify_id_token(id_token, access_token=access_token)
+        else:
+            # no `openid` scope was requested, so only userinfo knows who this is
+            user_info = await token_manager.decode_jwt_token(access_token)
 
         if not user_info.get("email"):
             raise AuthenticationError("Google OAuth failed: Email not provided by Google")
 
         # Check if the user already exists in the database
-        existing_user = (await User.get(db=self.db, filters=[User.email == user_info["email"]])).one_or_none()
+        existing_user = (
+            await User.get(db=self.db, filters=[User.email == user_info["email"]], include_deleted=True)
+        ).one_or_none()
         if existing_user:
             return existing_user
 
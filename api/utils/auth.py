@@ -0,0 +1,107 @@
+import hashlib
+import os
+import secrets
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Optional
+from uuid import UUID
+import jwt
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, Field
+
+from api.utils.cache import TTLCache
+from api.utils.exceptions import ACLError
+
+
+class AuthSettings(BaseModel):
+    """
+    'AuthSettings' holds the configuration of the access tokens, read once from the environment
+    """
+
+    secret_key: str = Field("your_very_secret_key", description="HMAC key signing the access tokens")
+    algorithm: str = Field("HS256", description="JWT signing algorithm")
+    access_token_ttl: int = Field(2 * 60 * 60, description="Seconds an access token stays valid")
+    refresh_token_ttl: int = Field(30 * 24 * 60 * 60, description="Seconds a refresh token stays valid")
+
+    @classmethod
+    def from_env(cls) -> "AuthSettings":
+        defaults = cls()
+        return cls(
+            secret_key=os.getenv("JWT_SECRET_KEY", defaults.secret_key),
+            algorithm=os.getenv("JWT_ALGORITHM", defaults.algorithm),
+            access_token_ttl=int(os.getenv("JWT_ACCESS_TOKEN_TTL", defaults.access_token_ttl)),
+            refresh_token_ttl=int(os.getenv("JWT_REFRESH_TOKEN_TTL", defaults.refresh_token_ttl)),
+        )
+
+
+settings = AuthSettings.from_env()
+
+# Decoded claims by token, each entry expires with its token.
+# Verifying the signature is cheap, but this also skips the JSON decoding and claim checks for busy clients.
+_claims_cache = TTLCache("jwt_claims", maxsize=10_000, ttl=settings.access_token_ttl)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+def create_access_token(user_id: UUID) -> str:
+    """
+    Create a signed JWT access token for the user
+    """
+    payload = {
+        "sub": str(user_id),
+        "exp": datetime.now(timezone.utc) + timedelta(seconds=settings.access_token_ttl),
+    }
+    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+
+
+def new_refresh_token() -> str:
+    """
+    Random, opaque refresh token. It carries 384 bits of entropy, so unlike a password
+    a fast hash is enough to store it, see `hash_refresh_token`.
+    """
+    return secrets.token_urlsafe(48)
+
+
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify the access token and return its claims, raises ACLError if it is invalid or expired
+    """
+    if (claims := _claims_cache.get(token)) is not None:
+        return claims
+    try:
+        claims = jwt.decode(
+            token, settings.secret_key, algorithms=[settings.algorithm], options={"require": ["exp", "sub"]}
+        )
+    except jwt.ExpiredSignatureError as err:
+        raise ACLError("Access token has expired") from err
+    except jwt.InvalidTokenError as err:
+        raise ACLError("Invalid access token") from err
+    if (ttl := claims["exp"] - time.time()) > 0:
+        _claims_cache.set(token, claims, ttl=ttl)
+    return claims
+
+
+async def get_current_user_id(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> UUID:
+    """
+    Dependency for the id of the authenticated user, from the `Authorization: Bearer <token>` header
+
+    It only verifies the token, the user row is not loaded, so it costs no query.
+    """
+    if credentials is None:
+        raise ACLError("Not authenticated")
+    claims = decode_access_token(credentials.credentials)
+    try:
+        return UUID(claims["sub"])
+    except ValueError as err:
+        raise ACLError("Invalid access token") from err
+
+
+# eg: `async def endpoint(user_id: CurrentUserId, ...)`
+CurrentUserId = Annotated[UUID, Depends(get_current_user_id)]
@@ -0,0 +1,105 @@
+import hashlib
+import json
+from typing import Any, Optional, Sequence, Type
+from uuid import UUID
+from fastapi import Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from api.db.counters import CounterBuffer
+from api.utils.exceptions import NotModifiedError
+from api.utils.misc import get_session
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If the `If-None-Match` header matches the ETag, with the weak comparison conditional GETs use
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class ConditionalGet:
+    """
+    Dependency answering conditional GETs: sets the `ETag` of the response and raises NotModifiedError (304)
+    when the client sent the same one in `If-None-Match`
+
+    eg: `async def endpoint(conditional: ConditionalGet = Depends(), ...)`, then `return conditional.check_body(body)`
+    """
+
+    def __init__(self, request: Request, response: Response):
+        self.if_none_match = request.headers.get("If-None-Match")
+        self.response = response
+
+    def check(self, etag: str):
+        self.response.headers["ETag"] = etag
+        if etag_matches(self.if_none_match, etag):
+            raise NotModifiedError(etag)
+
+    def check_body(self, body: Any) -> Any:
+        """
+        ETag from a hash of the body, for responses not backed by a single row (eg: lists and aggregates)
+
+        The body is still built and hashed on every request, the 304 saves the transfer and the client side parsing.
+        """
+        encoded = json.dumps(jsonable_encoder(body), sort_keys=True, separators=(",", ":"), default=str)
+        self.check(f'"{_digest(encoded)}"')
+        return body
+
+
+class RowVersion:
+    """
+    Dependency for the conditional GET of a single row, with the ETag derived from its `updated_at`
+
+    The version is answered without loading the full row when possible: from the identity cache of
+    the model when it has one (see `BaseModel.identity_cache`, the endpoint then loads the row from
+    the same cache), else by selecting `updated_at` alone. Rows which do not exist are left to the
+    endpoint, to answer its usual 404.
+
+    Counter columns written through a `CounterBuffer` change without touching `updated_at`, pass their
+    buffers in `counters` so the version covers their value with its pending delta, like the body does.
+
+    eg: `@router.get("/{user_id}", dependencies=[Depends(RowVersion(User, "user_id"))])`
+    """
+
+    def __init__(self, model: Type, path_param: str, counters: Sequence[CounterBuffer] = ()):
+        self.model = model
+        self.path_param = path_param
+        self.counters = tuple(counters)
+
+    async def _version(self, db: AsyncSession, id: UUID) -> Optional[tuple]:
+        # pylint: disable=redefined-builtin
+        columns = [counter.column.key for counter in self.counters]
+        if self.model.identity_cache is not None:
+            row = await self.model.get_by_id(db, id)
+            values = (row.updated_at, *[getattr(row, column) for column in columns]) if row is not None else None
+        else:
+            query = select(self.model.updated_at, *[getattr(self.model, column) for column in columns])
+            values = (await db.execute(query.where(self.model.id == id))).one_or_none()
+        if values is None:
+            return None
+        updated_at, *stored = values
+        return (updated_at.isoformat(), *[counter.merge(id, value) for counter, value in zip(self.counters, stored)])
+
+    async def __call__(
+        self,
+        request: Request,
+        conditional: ConditionalGet = Depends(),
+        db: AsyncSession = Depends(get_session),
+    ):
+        try:
+            id = UUID(str(request.path_params[self.path_param]))  # pylint: disable=redefined-builtin
+        except (KeyError, ValueError):
+            return
+        version = await self._version(db, id)
+        if version is not None:
+            conditional.check(f'W/"{_digest(self.model.__tablename__, id, *version)}"')
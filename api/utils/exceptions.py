@@ -1,5 +1,6 @@
+import math
 from fastapi import status, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 
 class HTTPError(Exception):
@@ -134,6 +135,47 @@ class ConflictError(HTTPError):
 
     def __init__(self, detail: str = None):
         self.detail = detail if detail else self.detail
+
+
+class ServiceUnavailableError(HTTPError):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Service is busy, please retry shortly"
+
+    def __init__(self, detail: str = None):
+        self.detail = detail if detail else self.detail
+
+
+class TooManyRequestsError(HTTPError):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Too many requests, please retry later"
+
+    def __init__(self, retry_after: float, detail: str = None):
+        self.retry_after = retry_after
+        self.detail = detail if detail else self.detail
+
+    @property
+    def json_response(self):
+        response = super().json_response
+        response.headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return response
+
+class NotModifiedError(HTTPError):
+    """
+    Not an error as such, it cuts a conditional GET short once the client's copy is known to be current
+    """
+
+    status_code = status.HTTP_304_NOT_MODIFIED
+    detail = "Not modified"
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+    @property
+    def json_response(self):
+        # a 304 has no body, the client reuses the one it has cached
+        return Response(status_code=self.status_code, headers={"ETag": self.etag})
+
+
 class BlockchainStorageError(Exception):
     """Exception raised for errors in blockchain storage."""
     pass
@@ -0,0 +1,161 @@
+import importlib.util
+import time
+from threading import Lock
+from typing import Optional
+import httpx
+from pydantic import BaseModel, Field
+
+# HTTP/2 needs the optional `h2` package, connections fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class UpstreamConfig(BaseModel):
+    """
+    'UpstreamConfig' holds the connection pool and timeouts of the client of one upstream service
+    """
+
+    name: str = Field(..., description="Name the client is looked up by")
+    connect_timeout: float = Field(5.0, description="Seconds to open a connection")
+    read_timeout: float = Field(10.0, description="Seconds to wait for each chunk of the response")
+    max_connections: int = Field(20, description="Connections open at once to the upstream")
+    max_keepalive_connections: int = Field(10, description="Idle connections kept open for reuse")
+    keepalive_expiry: float = Field(30.0, description="Seconds an idle connection is kept open")
+    retries: int = Field(2, description="Retries of failed connection attempts, the request itself is never resent")
+    http2: bool = Field(True, description="Use HTTP/2 when the upstream supports it and `h2` is installed")
+
+
+class UpstreamStats:
+    """
+    Running counters of the requests sent to one upstream
+
+    - 'requests': Requests sent
+    - 'errors': Requests which failed without a response, eg: timeouts or refused connections
+    - 'total_latency' / 'max_latency': Seconds until the response headers came back
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency: float, failed: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.errors += int(failed)
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "avg_latency_ms": (self.total_latency / self.requests * 1000) if self.requests else 0.0,
+                "max_latency_ms": self.max_latency * 1000,
+            }
+
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    Pooled transport which times every request sent through it
+    """
+
+    def __init__(self, stats: UpstreamStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self.stats.record(time.perf_counter() - start, failed=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return response
+
+    def pool_stats(self) -> dict:
+        connections = list(getattr(self._pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {"connections": len(connections), "idle": idle, "active": len(connections) - idle}
+
+
+class HttpClients:
+    """
+    Registry of the outbound HTTP clients, one pooled `httpx.AsyncClient` per upstream for the app lifetime
+
+    Reusing the clients keeps connections (and their TLS handshakes) alive across requests,
+    instead of opening a new pool for every call. Created on startup and closed on shutdown, see `lifespan`.
+    """
+
+    def __init__(self, upstreams: list[UpstreamConfig]):
+        self._configs = {config.name: config for config in upstreams}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._transports: dict[str, _InstrumentedTransport] = {}
+        self._stats = {name: UpstreamStats() for name in self._configs}
+
+    def _create(self, config: UpstreamConfig) -> httpx.AsyncClient:
+        transport = _InstrumentedTransport(
+            self._stats[config.name],
+            http2=config.http2 and HTTP2_AVAILABLE,
+            retries=config.retries,
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+        )
+        self._transports[config.name] = transport
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+        )
+
+    def start(self):
+        for name, config in self._configs.items():
+            if name not in self._clients:
+                self._clients[name] = self._create(config)
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        The client of the upstream `name`, eg: `await http_clients.get("google").post(...)`
+        """
+        if (client := self._clients.get(name)) is None:
+            # outside of the app lifespan, eg: scripts
+            client = self._clients[name] = self._create(self._configs[name])
+        return client
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+
+    def stats(self, name: Optional[str] = None) -> dict:
+        """
+        Latency and pool usage of each upstream, or of `name` alone
+        """
+        names = [name] if name else list(self._configs)
+        return {
+            upstream: {
+                **self._stats[upstream].snapshot(),
+                **(
+                    self._transports[upstream].pool_stats()
+                    if upstream in self._transports
+                    else {"connections": 0, "idle": 0, "active": 0}
+                ),
+            }
+            for upstream in names
+        }
+
+
+http_clients = HttpClients(
+    [
+        UpstreamConfig(name="google"),
+        UpstreamConfig(name="chatbot", read_timeout=30.0),
+        UpstreamConfig(name="newsapi"),
+        UpstreamConfig(name="crossref", read_timeout=20.0),
+    ]
+)
@@ -2,4 +2,7 @@ from fastapi import Request
 
 
 def get_session(req: Request):
-    yield req.state.session
+    """
+    Dependency for the DB session of the request, opened lazily on first use
+    """
+    yield req.state.db.get()
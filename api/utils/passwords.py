@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+import bcrypt
+
+from api.utils.exceptions import ServiceUnavailableError
+
+R = TypeVar("R")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop, on a dedicated and bounded thread pool
+
+    bcrypt takes ~200 ms of CPU per call (and releases the GIL meanwhile), run inline it would
+    stall every other request of the worker. At most `max_workers` hashes run at once and up to
+    `max_queue` more wait for a thread. Beyond that the request fails fast with a 503, instead of
+    piling up behind a login storm.
+
+    - 'in_flight': Calls running or waiting for a thread
+    - 'max_in_flight': Highest `in_flight` seen
+    - 'completed' / 'rejected': Calls done / refused because the queue was full
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 64):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        # counters are only touched from the event loop thread, so they need no lock
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_time = 0.0
+
+    @classmethod
+    def from_env(cls) -> "PasswordHasher":
+        return cls(
+            max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(2, os.cpu_count() or 1)))),
+            max_queue=int(os.getenv("PASSWORD_HASH_QUEUE", "64")),
+        )
+
+    async def _run(self, func: Callable[..., R], *args) -> R:
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise ServiceUnavailableError("Too many login attempts in progress, please retry shortly")
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self.total_time += time.perf_counter() - start
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password using bcrypt
+        """
+        hashed = await self._run(bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt())
+        return hashed.decode("utf-8")
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against its hash
+        """
+        return await self._run(bcrypt.checkpw, plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.max_workers, 0),
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_time_ms": (self.total_time / self.completed * 1000) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher.from_env()
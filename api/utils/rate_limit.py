@@ -0,0 +1,172 @@
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Literal, Optional
+from fastapi.requests import Request
+from pydantic import BaseModel, Field
+
+from api.utils.auth import decode_access_token
+from api.utils.exceptions import ACLError, ServiceConfigurationError, TooManyRequestsError
+
+
+class RateLimitPolicy(BaseModel):
+    """
+    'RateLimitPolicy' describes a token bucket: up to `capacity` requests at once,
+    then `refill_rate` requests per second on average
+    """
+
+    name: str = Field(..., description="Namespace of the buckets of this policy")
+    capacity: int = Field(..., description="Burst size, requests allowed back to back")
+    refill_rate: float = Field(..., description="Tokens added back per second")
+    key: Literal["ip", "user"] = Field(
+        "ip", description="Bucket per client IP, or per authenticated user (falling back to the IP)"
+    )
+
+
+class RateLimitBackend:
+    """
+    Storage of the token buckets. Implement `hit` to keep them elsewhere, eg: in Redis to share them across workers
+    """
+
+    async def hit(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> tuple[bool, float]:
+        """
+        Take `cost` tokens from the bucket `key`
+
+        Returns:
+            tuple[bool, float]: If the request is allowed, and if not the seconds until it would be
+        """
+        raise NotImplementedError
+
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    Token buckets in the memory of the worker process, limits are then per worker
+
+    Each key costs one (tokens, timestamp) entry. At most `max_keys` are kept, the least
+    recently used bucket is evicted first - an evicted bucket simply starts full again.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    async def hit(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * refill_rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / refill_rate
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Token buckets in Redis (or any store speaking its protocol), shared by all the workers
+
+    The bucket is read and updated by one Lua script, so concurrent hits can not race.
+    `client` is a `redis.asyncio.Redis`, or any object with the same async `eval`, eg: a fake in tests.
+    """
+
+    _script = """
+        local capacity = tonumber(ARGV[1])
+        local refill_rate = tonumber(ARGV[2])
+        local cost = tonumber(ARGV[3])
+        local clock = redis.call('TIME')
+        local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+        local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+        local tokens = tonumber(bucket[1]) or capacity
+        local last = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - last) * refill_rate)
+        local allowed = 0
+        local retry_after = 0
+        if tokens >= cost then
+            tokens = tokens - cost
+            allowed = 1
+        else
+            retry_after = (cost - tokens) / refill_rate
+        end
+        redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+        redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate) + 1)
+        return {allowed, tostring(retry_after)}
+    """
+
+    def __init__(self, client, prefix: str = "rate_limit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisBackend":
+        try:
+            from redis import asyncio as redis  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise ServiceConfigurationError(
+                "RATE_LIMIT_REDIS_URL is set but the `redis` package is not installed"
+            ) from err
+        return cls(redis.from_url(url))
+
+    async def hit(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> tuple[bool, float]:
+        allowed, retry_after = await self.client.eval(self._script, 1, self.prefix + key, capacity, refill_rate, cost)
+        return bool(int(allowed)), float(retry_after)
+
+
+def backend_from_env() -> Optional[RateLimitBackend]:
+    """
+    Redis when `RATE_LIMIT_REDIS_URL` is set, else in memory. None if `RATE_LIMIT_ENABLED=false`.
+    """
+    if os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("0", "false", "no", "off"):
+        return None
+    if url := os.getenv("RATE_LIMIT_REDIS_URL"):
+        return RedisBackend.from_url(url)
+    return InMemoryBackend(max_keys=int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")))
+
+
+backend = backend_from_env()
+# Behind a reverse proxy every request comes from the proxy, take the client IP from X-Forwarded-For instead
+TRUST_FORWARDED_FOR = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "false").lower() in ("1", "true", "yes", "on")
+
+
+def client_ip(request: Request) -> str:
+    if TRUST_FORWARDED_FOR and (forwarded := request.headers.get("X-Forwarded-For")):
+        return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimit:
+    """
+    Dependency enforcing a `RateLimitPolicy` on a route, raises TooManyRequestsError (429) once the bucket is empty
+
+    eg: `@router.post("/login", dependencies=[Depends(RateLimit(LOGIN_POLICY))])`
+    """
+
+    def __init__(self, policy: RateLimitPolicy):
+        self.policy = policy
+
+    def _key(self, request: Request) -> str:
+        if self.policy.key == "user":
+            authorization = request.headers.get("Authorization", "")
+            if authorization.lower().startswith("bearer "):
+                try:
+                    return f"{self.policy.name}:user:{decode_access_token(authorization[7:])['sub']}"
+                except ACLError:
+                    pass
+        return f"{self.policy.name}:ip:{client_ip(request)}"
+
+    async def __call__(self, request: Request):
+        if backend is None:
+            return
+        allowed, retry_after = await backend.hit(self._key(request), self.policy.capacity, self.policy.refill_rate)
+        if not allowed:
+            raise TooManyRequestsError(retry_after)
+
+
+# Policies of the expensive routes: bcrypt on login, paid upstream quota for gemini and the chatbot
+LOGIN_POLICY = RateLimitPolicy(name="login", capacity=5, refill_rate=5 / 60, key="ip")
+GEMINI_POLICY = RateLimitPolicy(name="gemini", capacity=10, refill_rate=10 / 60, key="user")
+CHAT_POLICY = RateLimitPolicy(name="chat", capacity=20, refill_rate=20 / 60, key="user")
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import resource
+import time
+from dotenv import load_dotenv
+
+
+def _rss_mb() -> float:
+    # current resident set size where /proc is available, else the peak so far
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _seed(conn, rows: int, batch_size: int = 200_000):
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import text
+
+    user_id = await conn.scalar(
+        text(
+            "INSERT INTO users (id, first_name, last_name, email, phone_number, password, category, is_deleted, "
+            "created_at, updated_at) VALUES (gen_random_uuid(), 'Bench', 'User', gen_random_uuid() || '@example.com', "
+            "'0000000000', 'not-a-hash', 'ATHELETE', false, now(), now()) RETURNING id"
+        )
+    )
+    for start in range(0, rows, batch_size):
+        await conn.execute(
+            text(
+                "INSERT INTO game_scores (id, user_id, game_name, score, cumulative_total, is_deleted, "
+                "created_at, updated_at) "
+                "SELECT gen_random_uuid(), :user_id, 'game ' || g % 20, g % 100, g * 50, false, "
+                "now() - g * interval '1 second', now() "
+                "FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g"
+            ),
+            {"user_id": user_id, "start": start + 1, "stop": min(start + batch_size, rows)},
+        )
+        await conn.commit()
+    return user_id
+
+
+async def _measure(chunks, export_format):
+    start_rss = peak_rss = _rss_mb()
+    exported = size = 0
+    started = time.perf_counter()
+    # consumed like the response body, each chunk is dropped once counted
+    async for chunk in chunks:
+        exported += 1
+        size += len(chunk)
+        if exported % 10_000 == 0:
+            peak_rss = max(peak_rss, _rss_mb())
+    elapsed = time.perf_counter() - started
+    peak_rss = max(peak_rss, _rss_mb())
+    print(
+        f"{export_format.value:<8} {exported:>9} {size / 2**20:8.1f} {elapsed:8.1f} {start_rss:13.1f} {peak_rss:12.1f}"
+    )
+
+
+async def _bench():
+    # pylint: disable=import-outside-toplevel,unused-import
+    import api.services  # loads every model, their relationships refer to each other
+    from api.db import initiate
+    from api.db.session import engine
+    from api.interfaces.export import ExportFormat, ExportResource
+    from api.services.export import ExportService
+
+    rows = int(os.getenv("BENCH_EXPORT_ROWS", "1000000"))
+    await initiate()
+    async with engine.connect() as conn:
+        started = time.perf_counter()
+        user_id = await _seed(conn, rows)
+        print(f"Seeded {rows} game scores in {time.perf_counter() - started:.1f}s")
+
+    service = ExportService(None)
+    print(f"{'format':<8} {'rows':>9} {'MB':>8} {'seconds':>8} {'rss start MB':>13} {'rss peak MB':>12}")
+    for export_format in (ExportFormat.NDJSON, ExportFormat.CSV):
+        await _measure(service.export_user_data(ExportResource.GAME_SCORES, user_id, export_format), export_format)
+    await engine.dispose()
+
+
+def bench():
+    """
+    Benchmark the memory of a user data export: streams the `BENCH_EXPORT_ROWS` game scores (default 1M)
+    of one user as NDJSON and CSV, and reports the resident memory of the process along the way.
+    Run it against a scratch database (`DB_URL`), it adds the user and their scores.
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    asyncio.run(_bench())
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import time
+from typing import Callable
+from dotenv import load_dotenv
+
+
+def _percentile(timings: list[float], percent: int) -> float:
+    return sorted(timings)[min(len(timings) - 1, len(timings) * percent // 100)]
+
+
+async def _seed(db):
+    # pylint: disable=import-outside-toplevel
+    from uuid import uuid4
+    from api.db.models.comments import Comment
+    from api.db.models.post import Post
+    from api.db.models.user import User, UserCategory
+
+    user = User(
+        first_name="Bench",
+        last_name="User",
+        email=f"{uuid4().hex}@example.com",
+        phone_number="0000000000",
+        password="not-a-hash",
+        category=UserCategory.ATHELETE,
+    )
+    await user.save(db)
+    post = Post(user_id=user.id, title="Bench", description="Bench", hashtag="", image_url="")
+    await post.save(db)
+    await Comment.save_many(db, [Comment(post_id=post.id, user_id=user.id, comment=f"#{i}") for i in range(5)])
+    await db.commit()
+    return user, post
+
+
+def _shapes(user, post) -> list[tuple[str, type, Callable[[], list], Callable[[], dict]]]:
+    """
+    The hot lookups, as (label, model, list filters as the services built them before, dict filters of the cached shape)
+    The filters are built on every call, like in the services.
+    """
+    # pylint: disable=import-outside-toplevel,invalid-unary-operand-type
+    from sqlmodel import col
+    from api.db.models.comments import Comment
+    from api.db.models.post import Post
+    from api.db.models.user import User
+
+    return [
+        (
+            "User.id",
+            User,
+            lambda: [User.id == user.id, ~col(User.is_deleted)],
+            lambda: {User.id: {"operator": "==", "value": user.id}},
+        ),
+        (
+            "Post.id",
+            Post,
+            lambda: [Post.id == post.id, ~col(Post.is_deleted)],
+            lambda: {Post.id: {"operator": "==", "value": post.id}},
+        ),
+        (
+            "Comment.post_id",
+            Comment,
+            lambda: [Comment.post_id == post.id, ~col(Comment.is_deleted)],
+            lambda: {Comment.post_id: {"operator": "==", "value": post.id}},
+        ),
+    ]
+
+
+def _time_build(model, make_filters: Callable, calls: int) -> float:
+    """
+    Mean time to get the statement of a call ready to run: built (or taken from the cache) and its cache key
+    computed, which is how SQLAlchemy looks up the compiled form. The same steps as `BaseModel.get`, without the DB.
+    """
+    # pylint: disable=import-outside-toplevel,protected-access
+    from sqlmodel import select
+    from api.db.models import base
+
+    started = time.perf_counter()
+    for _ in range(calls):
+        filters = make_filters()
+        if isinstance(filters, dict):
+            statement, _ = base._cached_statement(model, None, filters)
+        else:
+            statement = select(model).where(*filters)
+        statement._generate_cache_key()
+    return (time.perf_counter() - started) / calls
+
+
+async def _time_get(db, model, make_filters: Callable, calls: int) -> list[float]:
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        (await model.get(db=db, filters=make_filters())).all()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def _bench():
+    # pylint: disable=import-outside-toplevel,unused-import,protected-access
+    import api.services  # loads every model, their relationships refer to each other
+    from sqlalchemy import event
+    from sqlalchemy.engine.default import CACHE_HIT
+    from api.db import initiate
+    from api.db.models import base
+    from api.db.session import async_session_maker, engine
+
+    calls = int(os.getenv("BENCH_GET_CALLS", "5000"))
+    await initiate()
+    # SQLAlchemy compiled cache hits of the statements run
+    compiled = {"hits": 0, "total": 0}
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _count_compiled(conn, cursor, statement, parameters, context, executemany):
+        compiled["total"] += 1
+        compiled["hits"] += context.cache_hit == CACHE_HIT
+
+    print(
+        f"{'lookup':<16} {'filters':<14} {'build us':>9} {'get p50 us':>11} {'get p99 us':>11} "
+        f"{'stmt cache hits':>16} {'compiled hits':>14}"
+    )
+    async with async_session_maker() as db:
+        user, post = await _seed(db)
+        for label, model, *modes in _shapes(user, post):
+            for mode, make_filters in zip(("list (before)", "dict (cached)"), modes):
+                # as in a fresh process: nothing cached yet by either cache
+                base._statement_cache.clear()
+                engine.sync_engine._compiled_cache.clear()
+                compiled.update(hits=0, total=0)
+                timings = await _time_get(db, model, make_filters, calls)
+                # a statement built for the first call of a shape is a miss, the list filters never use the cache
+                statement_hits = f"{calls - len(base._statement_cache)}/{calls}" if base._statement_cache else "-"
+                compiled_hits = f"{compiled['hits']}/{compiled['total']}"
+                print(
+                    f"{label:<16} {mode:<14} {_time_build(model, make_filters, calls) * 1e6:9.1f} "
+                    f"{_percentile(timings, 50) * 1e6:11.0f} {_percentile(timings, 99) * 1e6:11.0f} "
+                    f"{statement_hits:>16} {compiled_hits:>14}"
+                )
+    event.remove(engine.sync_engine, "after_cursor_execute", _count_compiled)
+    await engine.dispose()
+
+
+def bench():
+    """
+    Benchmark `BaseModel.get` on the hot lookups (user by id, post by id, comments of a post): the latency of
+    `BENCH_GET_CALLS` calls (default 5000) with list filters, built on every call as the services did before,
+    and with the dict filters whose statement is cached per shape, along with the hit rate of both caches.
+    Run it against a scratch database (`DB_URL`), it adds a user, a post and its comments.
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    asyncio.run(_bench())
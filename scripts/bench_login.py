@@ -0,0 +1,120 @@
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+
+# Interval between two `/ping` requests of the probe, in seconds
+PING_INTERVAL = 0.01
+PASSWORD = "bench-password"
+
+
+def _percentile(timings: list[float], percent: int) -> float:
+    return sorted(timings)[min(len(timings) - 1, len(timings) * percent // 100)]
+
+
+async def _seed(db):
+    # pylint: disable=import-outside-toplevel
+    from uuid import uuid4
+    from api.db.models.user import User, UserCategory
+    from api.utils.passwords import password_hasher
+
+    user = User(
+        first_name="Bench",
+        last_name="User",
+        email=f"{uuid4().hex}@example.com",
+        phone_number="0000000000",
+        password=await password_hasher.hash(PASSWORD),
+        category=UserCategory.ATHELETE,
+    )
+    await user.save(db)
+    await db.commit()
+    return user
+
+
+async def _ping(client, seconds: float) -> list[float]:
+    timings = []
+    stop = time.perf_counter() + seconds
+    while time.perf_counter() < stop:
+        started = time.perf_counter()
+        (await client.get("/ping")).raise_for_status()
+        timings.append(time.perf_counter() - started)
+        await asyncio.sleep(PING_INTERVAL)
+    return timings
+
+
+async def _login(client, body: dict, stop: float) -> int:
+    logins = 0
+    while time.perf_counter() < stop:
+        (await client.post("/users/login", json=body)).raise_for_status()
+        logins += 1
+    return logins
+
+
+async def _storm(client, body: dict, concurrency: int, seconds: float) -> tuple[list[float], int]:
+    """
+    `/ping` latencies while `concurrency` clients log in back to back, and the number of logins done
+    """
+    stop = time.perf_counter() + seconds
+    timings, *logins = await asyncio.gather(
+        _ping(client, seconds), *(_login(client, body, stop) for _ in range(concurrency))
+    )
+    return timings, sum(logins)
+
+
+async def _bench():
+    # pylint: disable=import-outside-toplevel,unused-import
+    import api.services  # loads every model, their relationships refer to each other
+    import httpx
+    from api.db import initiate
+    from api.db.session import async_session_maker, engine
+    from api.endpoints import route_setup
+    from api.main import app
+    from api.utils.passwords import password_hasher
+
+    async def run_inline(func, *args):
+        # what `UserService` did before: bcrypt right on the event loop
+        return func(*args)
+
+    concurrency = int(os.getenv("BENCH_LOGIN_CONCURRENCY", "16"))
+    seconds = float(os.getenv("BENCH_LOGIN_SECONDS", "10"))
+    await initiate()
+    route_setup(app)
+    async with async_session_maker() as db:
+        user = await _seed(db)
+    body = {"email": user.email, "password": PASSWORD, "category": user.category.value}
+
+    print(f"{'bcrypt':<8} {'logins/s':>9} {'ping p50 ms':>12} {'ping p99 ms':>12} {'ping max ms':>12}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        timings = await _ping(client, seconds)
+        print(
+            f"{'idle':<8} {0:9.1f} {_percentile(timings, 50) * 1000:12.1f} "
+            f"{_percentile(timings, 99) * 1000:12.1f} {max(timings) * 1000:12.1f}"
+        )
+        original_run = password_hasher._run  # pylint: disable=protected-access
+        try:
+            for mode, run in (("inline", run_inline), ("pool", original_run)):
+                password_hasher._run = run  # pylint: disable=protected-access
+                timings, logins = await _storm(client, body, concurrency, seconds)
+                print(
+                    f"{mode:<8} {logins / seconds:9.1f} {_percentile(timings, 50) * 1000:12.1f} "
+                    f"{_percentile(timings, 99) * 1000:12.1f} {max(timings) * 1000:12.1f}"
+                )
+        finally:
+            password_hasher._run = original_run  # pylint: disable=protected-access
+    print(f"Hashing pool: {password_hasher.stats()}")
+    await engine.dispose()
+
+
+def bench():
+    """
+    Benchmark the event loop latency during a login storm: `BENCH_LOGIN_CONCURRENCY` clients (default 16)
+    log in back to back for `BENCH_LOGIN_SECONDS` (default 10) while a probe times `/ping` every 10 ms.
+    It runs with bcrypt on the event loop, as before, and on the hashing pool (`PASSWORD_HASH_WORKERS`).
+    The app is called in process, so the `/ping` latency is the time it waits for the event loop.
+    Run it against a scratch database (`DB_URL`), it adds a user.
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    # every login of the storm comes from the same client, the login rate limit would turn them away
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    asyncio.run(_bench())
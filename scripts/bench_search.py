@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+
+# Words of the generated posts, the first ones are the most frequent (see `_seed`)
+WORDS = (
+    "training race athlete coach team season recovery nutrition sleep injury "
+    "doping test sample anti federation ban appeal blood urine caffeine "
+    "marathon sprint relay cycling swimming rowing hurdles javelin decathlon epo"
+).split()
+# uuid7 like the ids of the app (see `IdMixin`): the creation time in the first 48 bits keeps them in creation order
+UUID7 = (
+    "encode(overlay(uuid_send(gen_random_uuid()) PLACING "
+    "substring(int8send(floor(extract(epoch FROM {created_at}) * 1000)::bigint) FROM 3) FROM 1 FOR 6), 'hex')::uuid"
+)
+QUERIES = ["training", "doping", "blood test", "doping -cycling", '"anti doping"', "epo or decathlon", "missing"]
+
+
+async def _seed(conn, rows: int, batch_size: int = 100_000):
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import text
+
+    user_id = await conn.scalar(
+        text(
+            "INSERT INTO users (id, first_name, last_name, email, phone_number, password, category, is_deleted, "
+            "created_at, updated_at) VALUES (gen_random_uuid(), 'Bench', 'User', gen_random_uuid() || '@example.com', "
+            "'0000000000', 'not-a-hash', 'ATHELETE', false, now(), now()) RETURNING id"
+        )
+    )
+    # skewed word picks (`random() ^ 2`) so the queries match from a few rows to a large part of the table
+    words = "(ARRAY[" + ", ".join(f"'{word}'" for word in WORDS) + f"])[1 + floor(random() ^ 2 * {len(WORDS)})::int]"
+    created_at = "now() - g * interval '1 second'"
+    for start in range(0, rows, batch_size):
+        await conn.execute(
+            text(
+                "INSERT INTO posts (id, user_id, title, description, hashtag, image_url, like_count, is_deleted, "
+                "created_at, updated_at) "
+                f"SELECT {UUID7.format(created_at=created_at)}, :user_id, {words} || ' ' || {words}, "
+                f"array_to_string(ARRAY(SELECT {words} FROM generate_series(1, 20) WHERE g > 0), ' '), "
+                f"'', '', 0, g % 50 = 0, {created_at}, now() "
+                "FROM generate_series(CAST(:start AS int), CAST(:stop AS int)) AS g"
+            ),
+            {"user_id": user_id, "start": start + 1, "stop": min(start + batch_size, rows)},
+        )
+        await conn.commit()
+
+
+def _percentile(timings: list[float], percent: int) -> float:
+    return sorted(timings)[min(len(timings) - 1, len(timings) * percent // 100)]
+
+
+async def _time_query(service, q: str, runs: int) -> tuple[list[float], list[float]]:
+    """
+    Latencies of the first page of `q`, and of the next one when there is one
+    """
+    # pylint: disable=import-outside-toplevel
+    from api.interfaces.utils import PageParams
+
+    timings, next_timings = [], []
+    for _ in range(runs):
+        started = time.perf_counter()
+        page = await service.search(q, PageParams(limit=20))
+        timings.append(time.perf_counter() - started)
+        if page["next_cursor"]:
+            started = time.perf_counter()
+            await service.search(q, PageParams(after=page["next_cursor"], limit=20))
+            next_timings.append(time.perf_counter() - started)
+    return timings, next_timings
+
+
+async def _bench():
+    # pylint: disable=import-outside-toplevel,unused-import
+    import api.services  # loads every model, their relationships refer to each other
+    from sqlalchemy import text
+    from api.db import initiate
+    from api.db.migrations import migrate_manual
+    from api.db.session import async_session_maker, engine
+    from api.services.search import SearchService
+
+    rows = int(os.getenv("BENCH_SEARCH_ROWS", "1000000"))
+    runs = int(os.getenv("BENCH_SEARCH_RUNS", "50"))
+    await initiate()
+    async with engine.connect() as conn:
+        # the existing rows of a database from before the search columns: no vector, no index
+        await conn.execute(text("ALTER TABLE posts DISABLE TRIGGER posts_search_vector"))
+        await conn.execute(text("DROP INDEX IF EXISTS ix_posts_search_vector"))
+        await conn.commit()
+        started = time.perf_counter()
+        await _seed(conn, rows)
+        print(f"Seeded {rows} posts in {time.perf_counter() - started:.1f}s")
+        await conn.execute(text("ALTER TABLE posts ENABLE TRIGGER posts_search_vector"))
+        await conn.execute(text("DELETE FROM schema_migrations WHERE name = '0003_backfill_search_vectors'"))
+        await conn.commit()
+
+    started = time.perf_counter()
+    await migrate_manual(engine)
+    print(f"Backfilled the vectors and built the index in {time.perf_counter() - started:.1f}s")
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("VACUUM ANALYZE posts"))
+
+    print(f"{'query':<20} {'matches':>9} {'p50 ms':>8} {'p95 ms':>8} {'page 2 p50':>11}")
+    async with async_session_maker() as db:
+        service = SearchService(db)
+        for q in QUERIES:
+            matches = await db.scalar(
+                text(
+                    "SELECT count(*) FROM posts WHERE NOT is_deleted "
+                    "AND search_vector @@ websearch_to_tsquery('english', :q)"
+                ),
+                {"q": q},
+            )
+            timings, next_timings = await _time_query(service, q, runs)
+            page_2 = f"{_percentile(next_timings, 50) * 1000:11.1f}" if next_timings else f"{'-':>11}"
+            print(
+                f"{q:<20} {matches:>9} {_percentile(timings, 50) * 1000:8.1f} "
+                f"{_percentile(timings, 95) * 1000:8.1f} {page_2}"
+            )
+    await engine.dispose()
+
+
+def bench():
+    """
+    Benchmark the latency of `SearchService.search` over generated posts, and the time of the search vector backfill.
+    Run it against a scratch database (`DB_URL`), it adds `BENCH_SEARCH_ROWS` posts (default 1M) and queries them
+    `BENCH_SEARCH_RUNS` times (default 50) each.
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    asyncio.run(_bench())
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+from dotenv import load_dotenv
+
+# (label, path) of the routes timed, a route without any DB access and one reading a page of posts
+ROUTES = [("no DB", "/ping"), ("DB", "/posts?limit=1")]
+# Number of turns each session mode takes, see `_bench`
+ROUNDS = 10
+
+
+def _percentile(timings: list[float], percent: int) -> float:
+    return sorted(timings)[min(len(timings) - 1, len(timings) * percent // 100)]
+
+
+async def _time_route(client, path: str, requests: int) -> list[float]:
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return timings
+
+
+async def _time_modes(client, path: str, requests: int, modes: dict) -> dict[str, list[float]]:
+    # pylint: disable=import-outside-toplevel
+    from api.middleware import handler_middleware
+
+    # the modes take turns, so a drift of the machine over the run weighs on both alike
+    timings: dict[str, list[float]] = {mode: [] for mode in modes}
+    try:
+        for _ in range(ROUNDS):
+            for mode, session_class in modes.items():
+                handler_middleware.LazySession = session_class
+                timings[mode] += await _time_route(client, path, requests // ROUNDS)
+    finally:
+        handler_middleware.LazySession = modes["lazy"]
+    return timings
+
+
+async def _bench():
+    # pylint: disable=import-outside-toplevel,unused-import
+    import api.services  # loads every model, their relationships refer to each other
+    import httpx
+    from api.db import initiate
+    from api.db.session import LazySession, engine
+    from api.endpoints import route_setup
+    from api.main import app
+
+    class EagerSession(LazySession):
+        """
+        What `HandlerMiddleware` did before: a session for every request, used or not
+        """
+
+        def __init__(self, read_only: bool = False):
+            super().__init__(read_only)
+            self.get()
+
+    requests = int(os.getenv("BENCH_SESSION_REQUESTS", "5000"))
+    await initiate()
+    route_setup(app)
+    modes = {"eager": EagerSession, "lazy": LazySession}
+    print(f"{'route':<6} {'session':<8} {'p50 us':>8} {'p99 us':>8} {'mean us':>8}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for label, path in ROUTES:
+            await _time_route(client, path, requests // 10)
+            timings = await _time_modes(client, path, requests, modes)
+            for mode, times in timings.items():
+                print(
+                    f"{label:<6} {mode:<8} {_percentile(times, 50) * 1e6:8.0f} {_percentile(times, 99) * 1e6:8.0f} "
+                    f"{sum(times) / len(times) * 1e6:8.0f}"
+                )
+    await engine.dispose()
+
+
+def bench():
+    """
+    Benchmark the overhead of the request DB session: times `BENCH_SESSION_REQUESTS` (default 5000) requests
+    to a route without DB access and to one with, when the session is opened for every request (eager, as before)
+    or only on first use (lazy). The app is called in process, so the numbers are the server side cost only.
+    Run it against a scratch database (`DB_URL`), the tables are created if missing.
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    asyncio.run(_bench())
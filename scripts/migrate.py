@@ -0,0 +1,25 @@
+import asyncio
+from dotenv import load_dotenv
+
+
+async def _migrate():
+    # pylint: disable=import-outside-toplevel,unused-import
+    import api.services  # loads every model, their relationships refer to each other
+    from api.db import initiate
+    from api.db.migrations import migrate_manual
+    from api.db.session import engine
+
+    await initiate()
+    names = await migrate_manual(engine)
+    await engine.dispose()
+    print(f"Applied the manual migrations: {', '.join(names) or 'none pending'}")
+
+
+def migrate():
+    """
+    Apply the migrations too slow for the startup, eg: backfills and concurrent index builds over big tables.
+    The workers keep serving meanwhile, run it after deploying a release which ships one.
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    asyncio.run(_migrate())
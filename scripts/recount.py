@@ -0,0 +1,27 @@
+import asyncio
+from dotenv import load_dotenv
+
+
+async def _recount():
+    # pylint: disable=import-outside-toplevel,unused-import
+    import api.services  # loads every model, their relationships refer to each other
+    from api.db.models.comments import Comment, CommentLike
+    from api.db.models.post import Post, PostLike
+    from api.db.session import async_session_maker, engine
+    from api.services.likes import recount_likes
+
+    async with async_session_maker() as db:
+        posts = await recount_likes(db, Post, PostLike, "post_id")
+        comments = await recount_likes(db, Comment, CommentLike, "comment_id")
+    await engine.dispose()
+    print(f"Recounted the likes: {posts} posts and {comments} comments were off")
+
+
+def recount():
+    """
+    Recount the likes of the posts and comments from their like rows, eg: after a worker died with likes
+    still buffered. Stop the workers first (or run them with `COUNTER_BUFFER_ENABLED=false`).
+    """
+    # the DB engine is configured from the env on import
+    load_dotenv()
+    asyncio.run(_recount())
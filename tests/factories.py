@@ -0,0 +1,36 @@
+from uuid import uuid4
+
+from api.db.models.forum import Forum
+from api.db.models.post import Post
+from api.db.models.user import User, UserCategory
+
+
+def make_user(**kwargs) -> User:
+    # the password is never checked by these tests, hashing a real one would only slow them down
+    return User(
+        first_name="Test",
+        last_name="Athlete",
+        phone_number="0000000000",
+        email=f"{uuid4().hex}@example.com",
+        password="not-a-hash",
+        category=UserCategory.ATHELETE,
+        **kwargs,
+    )
+
+
+def make_post(user: User, **kwargs) -> Post:
+    # `PostRead` does not accept a null hashtag or image
+    defaults = {
+        "title": "Clean sport",
+        "description": "What athletes should know about testing",
+        "hashtag": "",
+        "image_url": "",
+    }
+    return Post(
+        **{**defaults, **kwargs},
+        user_id=user.id,
+    )
+
+
+def make_forum(**kwargs) -> Forum:
+    return Forum(**{"forum_name": f"Forum {uuid4().hex[:8]}", **kwargs})
@@ -0,0 +1,30 @@
+import json
+
+from api.db.models.games import GameScore
+from .factories import make_user
+from .utils import DatabaseTestCase, auth_headers
+
+
+class ExportUserDataTest(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.user, self.other = await self.create(make_user(), make_user())
+        await self.create(
+            *(GameScore(user_id=self.user.id, game_name="quiz", score=i, cumulative_total=i) for i in range(3)),
+            GameScore(user_id=self.other.id, game_name="quiz", score=9, cumulative_total=9),
+        )
+        self.path = f"/export/users/{self.user.id}/game-scores"
+
+    async def test_own_data(self):
+        response = await self.client.get(self.path, headers=auth_headers(self.user.id))
+        self.assertEqual(response.status_code, 200, response.text)
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual([row["score"] for row in rows], [0, 1, 2])
+
+    async def test_other_users_data(self):
+        response = await self.client.get(self.path, headers=auth_headers(self.other.id))
+        self.assertEqual(response.status_code, 403, response.text)
+
+    async def test_anonymous(self):
+        response = await self.client.get(self.path)
+        self.assertEqual(response.status_code, 401, response.text)
@@ -0,0 +1,43 @@
+import unittest
+
+from sqlalchemy.dialects import postgresql
+
+from api.db.models.base import _cached_statement
+from api.db.models.user import User
+
+
+def where(filters: dict) -> tuple[str, dict]:
+    statement, params = _cached_statement(User, [User.id], filters)
+    return str(statement.whereclause.compile(dialect=postgresql.dialect())), params
+
+
+class CachedStatementTest(unittest.TestCase):
+    def test_values_are_bound(self):
+        sql, params = where({User.email: {"operator": "==", "value": "a@b.c"}})
+        self.assertEqual(sql, "users.email = %(p0)s")
+        self.assertEqual(params, {"p0": "a@b.c"})
+
+    def test_none_compiles_to_is_null(self):
+        sql, params = where({User.bio: {"operator": "==", "value": None}})
+        self.assertEqual(sql, "users.bio IS NULL")
+        self.assertEqual(params, {})
+        sql, params = where({User.bio: {"operator": "!=", "value": None}})
+        self.assertEqual(sql, "users.bio IS NOT NULL")
+
+    def test_none_and_value_are_cached_apart(self):
+        where({User.country: {"operator": "==", "value": None}})
+        sql, params = where({User.country: {"operator": "==", "value": "India"}})
+        self.assertEqual(sql, "users.country = %(p0)s")
+        self.assertEqual(params, {"p0": "India"})
+
+    def test_positions_of_bound_values(self):
+        sql, params = where(
+            {
+                User.bio: {"operator": "==", "value": None},
+                User.is_deleted: {"operator": "not"},
+                User.state: {"operator": "in", "value": ["Goa", "Kerala"]},
+            }
+        )
+        self.assertEqual(params, {"p2": ["Goa", "Kerala"]})
+        self.assertIn("users.bio IS NULL", sql)
+        self.assertIn("users.state IN (__[POSTCOMPILE_p2])", sql)
@@ -0,0 +1,20 @@
+from .factories import make_forum
+from .utils import DatabaseTestCase
+
+
+class ListForumsTest(DatabaseTestCase):
+    async def test_pages(self):
+        forums = await self.create(*(make_forum() for _ in range(3)))
+        await self.create(make_forum(is_deleted=True))
+
+        response = await self.client.get("/forums", params={"limit": 2})
+        self.assertEqual(response.status_code, 200, response.text)
+        first = response.json()
+        self.assertEqual([forum["id"] for forum in first["data"]], [str(forum.id) for forum in forums[:2]])
+        self.assertEqual(set(first["data"][0]), {"id", "forum_name", "description", "image_url"})
+
+        response = await self.client.get("/forums", params={"limit": 2, "after": first["next_cursor"]})
+        self.assertEqual(response.status_code, 200, response.text)
+        second = response.json()
+        self.assertEqual([forum["id"] for forum in second["data"]], [str(forums[2].id)])
+        self.assertIsNone(second["next_cursor"])
@@ -0,0 +1,169 @@
+import base64
+import hashlib
+import time
+import unittest
+from unittest import mock
+import rsa
+from jose import jwt as jose_jwt
+
+from api.services import tokenmanager
+from api.services.tokenmanager import GoogleKeySet, TokenManager
+from api.utils.exceptions import AuthenticationError
+
+CLIENT_ID = "fairplay-test.apps.googleusercontent.com"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _int_b64(value: int) -> str:
+    return _b64(value.to_bytes((value.bit_length() + 7) // 8, "big"))
+
+
+class KeyPair:
+    """
+    A locally generated RSA key, standing in for one of Google's signing keys
+    """
+
+    def __init__(self, kid: str):
+        self.kid = kid
+        self.public, self.private = rsa.newkeys(1024)
+
+    @property
+    def jwk(self) -> dict:
+        return {
+            "kid": self.kid,
+            "kty": "RSA",
+            "alg": "RS256",
+            "use": "sig",
+            "n": _int_b64(self.public.n),
+            "e": _int_b64(self.public.e),
+        }
+
+    def sign(self, **claims) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": CLIENT_ID,
+            "sub": "1234567890",
+            "email": "athlete@example.com",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jose_jwt.encode(claims, self.private.save_pkcs1().decode(), algorithm="RS256", headers={"kid": self.kid})
+
+
+def at_hash(access_token: str) -> str:
+    return _b64(hashlib.sha256(access_token.encode()).digest()[:16])
+
+
+class VerifyIdTokenTest(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.key = KeyPair("current")
+        cls.manager = TokenManager(GoogleKeySet(jwks={"keys": [cls.key.jwk]}), client_id=CLIENT_ID)
+
+    async def test_valid(self):
+        claims = await self.manager.verify_id_token(self.key.sign())
+        self.assertEqual(claims["email"], "athlete@example.com")
+
+    async def test_at_hash(self):
+        token = self.key.sign(at_hash=at_hash("access"))
+        self.assertEqual((await self.manager.verify_id_token(token, "access"))["sub"], "1234567890")
+        with self.assertRaises(AuthenticationError):
+            await self.manager.verify_id_token(token, "another access token")
+
+    async def test_rejected(self):
+        forged = KeyPair("current")
+        now = int(time.time())
+        tokens = {
+            "other audience": self.key.sign(aud="someone-else.apps.googleusercontent.com"),
+            "other issuer": self.key.sign(iss="https://evil.example.com"),
+            "expired": self.key.sign(iat=now - 7200, exp=now - 3600),
+            "forged signature": forged.sign(),
+            "unknown key": KeyPair("unknown").sign(),
+            "not a jwt": "not.a.jwt",
+        }
+        for reason, token in tokens.items():
+            with self.subTest(reason), self.assertRaises(AuthenticationError):
+                await self.manager.verify_id_token(token)
+
+
+class FakeGoogle:
+    """
+    Stands in for the `google` client of `http_clients`, serving the JWKS of `keys` until it is marked `down`
+    """
+
+    def __init__(self, *keys: KeyPair):
+        self.keys = list(keys)
+        self.down = False
+        self.requests = 0
+
+    async def get(self, url: str):
+        self.requests += 1
+        if self.down:
+            raise ConnectionError("Google is down")
+        response = mock.Mock(headers={"Cache-Control": "public, max-age=600"})
+        response.json.return_value = {"keys": [key.jwk for key in self.keys]}
+        return response
+
+
+class GoogleKeySetRefreshTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.google = FakeGoogle(KeyPair("first"))
+        clients = mock.Mock(get=lambda name: self.google if name == "google" else None)
+        patchers = [
+            mock.patch.object(tokenmanager.time, "monotonic", lambda: self.now),
+            mock.patch.object(tokenmanager, "http_clients", clients),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.keys = GoogleKeySet(min_refresh_interval=60)
+
+    async def test_cached_until_max_age(self):
+        self.assertIsNotNone(await self.keys.get_key("first"))
+        self.now += 599
+        await self.keys.get_key("first")
+        self.assertEqual(self.google.requests, 1)
+        self.now += 1
+        await self.keys.get_key("first")
+        self.assertEqual(self.google.requests, 2)
+
+    async def test_unknown_kid_refreshes_at_most_every_interval(self):
+        await self.keys.get_key("first")
+        self.google.keys.append(KeyPair("rotated"))
+        self.now += 61
+        self.assertIsNotNone(await self.keys.get_key("rotated"))
+        self.assertEqual(self.google.requests, 2)
+        for _ in range(5):
+            self.assertIsNone(await self.keys.get_key("bogus"))
+        self.assertEqual(self.google.requests, 2)
+
+    async def test_outage_is_throttled(self):
+        await self.keys.get_key("first")
+        self.google.down = True
+        self.now += 600
+        for _ in range(5):
+            # the keys we have keep working
+            self.assertIsNotNone(await self.keys.get_key("first"))
+        self.assertEqual(self.google.requests, 2)
+        self.now += 60
+        await self.keys.get_key("first")
+        self.assertEqual(self.google.requests, 3)
+
+        self.google.down = False
+        self.now += 60
+        await self.keys.get_key("first")
+        self.assertEqual(self.google.requests, 4)
+
+    async def test_outage_without_keys(self):
+        self.google.down = True
+        with self.assertRaises(AuthenticationError):
+            await self.keys.get_key("first")
+        for _ in range(5):
+            self.assertIsNone(await self.keys.get_key("first"))
+        self.assertEqual(self.google.requests, 1)
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, text
+
+from api.db.migrations import migrate_manual
+from api.db.models.post import HashtagCount, PostHashtag
+from api.db.session import async_session_maker, engine
+from api.services import post as post_service
+from .factories import make_post, make_user
+from .utils import DatabaseTestCase, auth_headers
+
+
+class BackfillPostHashtagsTest(DatabaseTestCase):
+    async def _backfill(self) -> list[str]:
+        async with engine.begin() as conn:
+            await conn.execute(text("DELETE FROM schema_migrations WHERE name = '0004_backfill_post_hashtags'"))
+        return await migrate_manual(engine)
+
+    async def _counts(self) -> dict[str, int]:
+        async with async_session_maker() as db:
+            rows = await db.execute(select(HashtagCount.tag, HashtagCount.count))
+            return dict(rows.all())
+
+    async def test_existing_posts_are_tagged(self):
+        user = await self.create(make_user())
+        # written before `post_hashtags` existed, so without their rows
+        tagged, other, _ = await self.create(
+            make_post(user, hashtag="#Doping #cycling"),
+            make_post(user, hashtag="doping"),
+            make_post(user, hashtag="#doping", is_deleted=True),
+        )
+        await self.create(make_post(user))
+
+        self.assertIn("0004_backfill_post_hashtags", await self._backfill())
+
+        response = await self.client.get("/posts", params={"hashtag": "doping"})
+        self.assertEqual({post["id"] for post in response.json()["data"]}, {str(tagged.id), str(other.id)})
+        self.assertEqual(await self._counts(), {"doping": 2, "cycling": 1})
+        response = await self.client.get("/posts/hashtags/trending", params={"hours": 2})
+        self.assertEqual(response.json()[0], {"tag": "doping", "uses": 2})
+
+        # resumed after the rows were written, nothing is counted twice
+        self.assertIn("0004_backfill_post_hashtags", await self._backfill())
+        self.assertEqual(await self._counts(), {"doping": 2, "cycling": 1})
+        async with async_session_maker() as db:
+            self.assertEqual(len((await db.execute(select(PostHashtag.id))).all()), 3)
+
+
+class PruneHashtagCountsTest(DatabaseTestCase):
+    async def test_old_buckets_are_pruned(self):
+        user = await self.create(make_user())
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        _, kept = await self.create(
+            HashtagCount(tag="doping", bucket=now - timedelta(hours=post_service.TRENDING_MAX_HOURS), count=4),
+            HashtagCount(tag="doping", bucket=now - timedelta(hours=post_service.TRENDING_MAX_HOURS - 1), count=2),
+        )
+        self.addCleanup(setattr, post_service, "_last_prune", post_service._last_prune)
+        post_service._last_prune = None
+
+        body = {
+            "user_id": str(user.id),
+            "title": "Clean sport",
+            "description": "Testing",
+            "hashtag": "#epo",
+            "image_url": "",
+        }
+        response = await self.client.post("/posts", json=body, headers=auth_headers(user.id))
+        self.assertEqual(response.status_code, 201, response.text)
+
+        async with async_session_maker() as db:
+            ids = set((await db.execute(select(HashtagCount.id).where(HashtagCount.tag == "doping"))).scalars())
+        self.assertEqual(ids, {kept.id})
@@ -0,0 +1,47 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from api.db.models.post import Post
+from api.db.session import async_session_maker, engine
+from .factories import make_post, make_user
+from .utils import DatabaseTestCase
+
+# what `replica_session_maker` builds, on the test database
+replica_session_maker = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True), class_=AsyncSession, expire_on_commit=False
+)
+
+
+class IdentityCacheTest(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        user = await self.create(make_user())
+        self.post = await self.create(make_post(user))
+        Post.identity_cache.delete(self.post.id)
+        self.addCleanup(Post.identity_cache.delete, self.post.id)
+
+    async def test_primary_reads_fill_the_cache(self):
+        async with async_session_maker() as db:
+            self.assertIsNotNone(await Post.get_by_id(db, self.post.id))
+        self.assertIsNotNone(Post.identity_cache.get(self.post.id))
+
+    async def test_replica_reads_do_not_fill_the_cache(self):
+        async with replica_session_maker() as db:
+            self.assertIsNotNone(await Post.get_by_id(db, self.post.id))
+        self.assertIsNone(Post.identity_cache.get(self.post.id))
+
+    async def test_lagging_replica_after_a_write(self):
+        # a REPEATABLE READ snapshot taken before the write reads the old row, like a replica lagging behind
+        async with replica_session_maker() as replica:
+            await replica.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            await replica.exec(text("SELECT 1"))
+            async with async_session_maker() as db:
+                post = await Post.get_by_id(db, self.post.id)
+                post.title = "Renamed"
+                await post.save(db)
+                await db.commit()
+            self.assertEqual((await Post.get_by_id(replica, self.post.id)).title, "Clean sport")
+
+        async with async_session_maker() as db:
+            self.assertEqual((await Post.get_by_id(db, self.post.id)).title, "Renamed")
@@ -0,0 +1,30 @@
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from api.db.instrumentation import current_stats, end_request, start_request
+from api.db.session import engine
+from .utils import DatabaseTestCase
+
+
+class StatementTimingTest(DatabaseTestCase):
+    async def test_failed_statements_are_timed(self):
+        token = start_request("GET /test")
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SET statement_timeout = 200"))
+                with self.assertLogs("api.db.instrumentation", "WARNING") as logs, self.assertRaises(DBAPIError):
+                    await conn.execute(text("SELECT pg_sleep(1)"))
+                self.assertIn("Slow query on GET /test", logs.output[0])
+                await conn.rollback()
+                await conn.execute(text("SELECT 1"))
+                stats = current_stats()
+                # nothing is left behind on the pooled connection by the failed statement
+                self.assertNotIn("query_start", conn.info)
+        finally:
+            end_request(token)
+
+        self.assertEqual(stats.count, 3)
+        (slowest, failed), *others = stats.slowest
+        self.assertEqual(failed, "SELECT pg_sleep(1)")
+        self.assertGreaterEqual(slowest, 0.2)
+        self.assertTrue(all(duration < 0.2 for duration, _ in others))
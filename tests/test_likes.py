@@ -0,0 +1,80 @@
+import asyncio
+from sqlalchemy import func, select
+
+from api.db.models.base import INCLUDE_DELETED
+from api.db.models.comments import Comment, CommentLike
+from api.db.models.post import Post, PostLike
+from api.db.models.user import User
+from api.db.session import async_session_maker
+from .factories import make_post, make_user
+from .utils import DatabaseTestCase, auth_headers
+
+USERS = 1000
+# users liking twice at the same time, the second like must not count
+DUPLICATES = 200
+
+
+class ConcurrentLikesTest(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        async with async_session_maker() as db:
+            self.users = await User.save_many(db, [make_user() for _ in range(USERS)])
+            await db.commit()
+        self.post = await self.create(make_post(self.users[0]))
+
+    async def _fire(self, path: str, users: list[User]) -> list[int]:
+        responses = await asyncio.gather(*(self.client.post(path, headers=auth_headers(user.id)) for user in users))
+        return [response.status_code for response in responses]
+
+    async def _counts(self, target, like, fk: str, target_id) -> tuple[int, int]:
+        async with async_session_maker() as db:
+            like_count = await db.scalar(
+                select(target.like_count).where(target.id == target_id).execution_options(**{INCLUDE_DELETED: True})
+            )
+            likes = await db.scalar(select(func.count()).select_from(like).where(getattr(like, fk) == target_id))
+        return like_count, likes
+
+    async def test_post_likes(self):
+        statuses = await self._fire(f"/posts/{self.post.id}/like", self.users + self.users[:DUPLICATES])
+        self.assertEqual(set(statuses), {200})
+        self.assertEqual(await self._counts(Post, PostLike, "post_id", self.post.id), (USERS, USERS))
+
+        unliking = self.users[: USERS // 4]
+        statuses = await self._fire(f"/posts/{self.post.id}/unlike", unliking + unliking[:DUPLICATES])
+        self.assertEqual(set(statuses), {200})
+        remaining = USERS - len(unliking)
+        self.assertEqual(await self._counts(Post, PostLike, "post_id", self.post.id), (remaining, remaining))
+
+        response = await self.client.get(f"/posts/{self.post.id}")
+        self.assertEqual(response.json()["like_count"], remaining)
+
+    async def test_comment_likes(self):
+        comment = await self.create(Comment(post_id=self.post.id, user_id=self.users[0].id, comment="Well said"))
+        statuses = await self._fire(f"/comments/{comment.id}/like", self.users + self.users[:DUPLICATES])
+        self.assertEqual(set(statuses), {200})
+        self.assertEqual(await self._counts(Comment, CommentLike, "comment_id", comment.id), (USERS, USERS))
+
+    async def test_deleted_post(self):
+        deleted = await self.create(make_post(self.users[0], is_deleted=True))
+        self.assertEqual(set(await self._fire(f"/posts/{deleted.id}/like", self.users[:10])), {404})
+        self.assertEqual(await self._counts(Post, PostLike, "post_id", deleted.id), (0, 0))
+
+
+class LikeCountWritesTest(DatabaseTestCase):
+    async def test_like_count_is_not_writable(self):
+        user = await self.create(make_user())
+        post = await self.create(make_post(user, like_count=3))
+        comment = await self.create(Comment(post_id=post.id, user_id=user.id, comment="Well said"))
+        headers = auth_headers(user.id)
+
+        response = await self.client.patch(f"/posts/{post.id}", json={"like_count": 100}, headers=headers)
+        self.assertEqual(response.status_code, 422, response.text)
+        body = {"user_id": str(user.id), "post_id": str(post.id), "like_count": 100}
+        response = await self.client.patch(f"/comments/{comment.id}", json=body, headers=headers)
+        self.assertEqual(response.status_code, 422, response.text)
+        body = {"user_id": str(user.id), "title": "Clean sport", "description": "Testing", "like_count": 100}
+        response = await self.client.post("/posts", json=body, headers=headers)
+        self.assertEqual(response.status_code, 422, response.text)
+
+        response = await self.client.get(f"/posts/{post.id}")
+        self.assertEqual(response.json()["like_count"], 3)
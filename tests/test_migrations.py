@@ -0,0 +1,40 @@
+from sqlalchemy import text
+
+from api.db import initiate as init_db
+from api.db.models.forum import ForumMember
+from api.db.session import async_session_maker, engine
+from .factories import make_forum, make_user
+from .utils import DatabaseTestCase
+
+
+class DedupeForumMembersTest(DatabaseTestCase):
+    async def test_duplicates_are_removed_before_the_unique_index(self):
+        forum, user, other = await self.create(make_forum(), make_user(), make_user())
+        # a database from before the unique index, with a user added twice
+        async with engine.begin() as conn:
+            await conn.execute(text("DROP INDEX ux_forum_members_forum_id_user_id"))
+            await conn.execute(text("DELETE FROM schema_migrations WHERE name = '0001_dedupe_forum_members'"))
+        first, _, kept = await self.create(
+            ForumMember(forum_id=forum.id, user_id=user.id),
+            ForumMember(forum_id=forum.id, user_id=user.id),
+            ForumMember(forum_id=forum.id, user_id=other.id),
+        )
+
+        await init_db()
+
+        async with async_session_maker() as db:
+            members = (await db.exec(text("SELECT id FROM forum_members ORDER BY id"))).scalars().all()
+            self.assertEqual(members, sorted([first.id, kept.id]))
+            index = await db.exec(
+                text("SELECT indexdef FROM pg_indexes WHERE indexname = 'ux_forum_members_forum_id_user_id'")
+            )
+            self.assertIn("UNIQUE", index.scalar_one())
+
+    async def test_applied_once(self):
+        async with engine.begin() as conn:
+            names = (await conn.execute(text("SELECT name FROM schema_migrations"))).scalars().all()
+        self.assertIn("0001_dedupe_forum_members", names)
+        await init_db()
+        async with engine.begin() as conn:
+            count = await conn.execute(text("SELECT count(*) FROM schema_migrations"))
+            self.assertEqual(count.scalar_one(), len(names))
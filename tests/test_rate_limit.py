@@ -0,0 +1,166 @@
+import unittest
+from unittest import mock
+from uuid import uuid4
+import httpx
+from fastapi import Depends, FastAPI
+
+from api.middleware import custom_middleware_setup
+from api.utils import rate_limit
+from api.utils.auth import create_access_token
+from api.utils.rate_limit import InMemoryBackend, RateLimit, RateLimitPolicy, RedisBackend
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    """
+    Stands in for `redis.asyncio.Redis`: runs the token bucket of the Lua script of `RedisBackend` in Python,
+    on hashes kept in a dict and the time of `clock`
+    """
+
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.hashes: dict[str, dict] = {}
+        self.calls: list[tuple] = []
+
+    async def eval(self, script: str, numkeys: int, *keys_and_args):
+        self.calls.append((script, numkeys, *keys_and_args))
+        key, capacity, refill_rate, cost = keys_and_args
+        bucket = self.hashes.get(key, {})
+        now = self.clock()
+        tokens = min(capacity, bucket.get("tokens", capacity) + max(0, now - bucket.get("ts", now)) * refill_rate)
+        allowed, retry_after = 0, 0
+        if tokens >= cost:
+            tokens -= cost
+            allowed = 1
+        else:
+            retry_after = (cost - tokens) / refill_rate
+        self.hashes[key] = {"tokens": tokens, "ts": now}
+        # redis replies with integers and bulk strings
+        return [allowed, str(retry_after).encode()]
+
+
+class InMemoryBackendTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(rate_limit.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_burst_then_refill(self):
+        backend = InMemoryBackend()
+        for _ in range(3):
+            self.assertEqual(await backend.hit("k", capacity=3, refill_rate=1), (True, 0.0))
+        allowed, retry_after = await backend.hit("k", capacity=3, refill_rate=1)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 1.0)
+
+        self.clock.now += 0.5
+        allowed, retry_after = await backend.hit("k", capacity=3, refill_rate=1)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 0.5)
+        self.clock.now += 0.5
+        self.assertEqual(await backend.hit("k", capacity=3, refill_rate=1), (True, 0.0))
+
+    async def test_refill_is_capped(self):
+        backend = InMemoryBackend()
+        await backend.hit("k", capacity=2, refill_rate=1)
+        self.clock.now += 3600
+        results = [(await backend.hit("k", capacity=2, refill_rate=1))[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+    async def test_keys_are_separate(self):
+        backend = InMemoryBackend()
+        self.assertTrue((await backend.hit("a", capacity=1, refill_rate=1))[0])
+        self.assertFalse((await backend.hit("a", capacity=1, refill_rate=1))[0])
+        self.assertTrue((await backend.hit("b", capacity=1, refill_rate=1))[0])
+
+    async def test_least_recently_used_key_is_evicted(self):
+        backend = InMemoryBackend(max_keys=2)
+        await backend.hit("a", capacity=1, refill_rate=1)
+        await backend.hit("b", capacity=1, refill_rate=1)
+        await backend.hit("a", capacity=1, refill_rate=1)
+        await backend.hit("c", capacity=1, refill_rate=1)
+        self.assertEqual(list(backend._buckets), ["a", "c"])
+        # an evicted bucket starts full again
+        self.assertTrue((await backend.hit("b", capacity=1, refill_rate=1))[0])
+
+
+class RedisBackendTest(unittest.IsolatedAsyncioTestCase):
+    async def test_hit(self):
+        clock = FakeClock()
+        client = FakeRedis(clock)
+        backend = RedisBackend(client, prefix="test:")
+
+        self.assertEqual(await backend.hit("k", capacity=2, refill_rate=0.5), (True, 0.0))
+        self.assertEqual(await backend.hit("k", capacity=2, refill_rate=0.5), (True, 0.0))
+        self.assertEqual(await backend.hit("k", capacity=2, refill_rate=0.5), (False, 2.0))
+        clock.now += 2
+        self.assertEqual(await backend.hit("k", capacity=2, refill_rate=0.5), (True, 0.0))
+
+        script, numkeys, key, *args = client.calls[0]
+        self.assertEqual(script, RedisBackend._script)
+        self.assertEqual((numkeys, key, args), (1, "test:k", [2, 0.5, 1]))
+
+    def test_from_url_without_redis(self):
+        with mock.patch.dict("sys.modules", {"redis": None}):
+            with self.assertRaises(rate_limit.ServiceConfigurationError):
+                RedisBackend.from_url("redis://localhost:6379/0")
+
+
+class RateLimitDependencyTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch.object(rate_limit.time, "monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(rate_limit, "backend", InMemoryBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        app = FastAPI()
+        custom_middleware_setup(app)
+        by_ip = RateLimitPolicy(name="test_ip", capacity=2, refill_rate=0.25)
+        by_user = RateLimitPolicy(name="test_user", capacity=1, refill_rate=0.25, key="user")
+
+        @app.post("/ip", dependencies=[Depends(RateLimit(by_ip))])
+        async def limited_by_ip():
+            return {"ok": True}
+
+        @app.post("/user", dependencies=[Depends(RateLimit(by_user))])
+        async def limited_by_user():
+            return {"ok": True}
+
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+        self.addAsyncCleanup(self.client.aclose)
+
+    async def test_429_with_retry_after(self):
+        self.assertEqual((await self.client.post("/ip")).status_code, 200)
+        self.assertEqual((await self.client.post("/ip")).status_code, 200)
+        response = await self.client.post("/ip")
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "4")
+
+        self.clock.now += 4
+        self.assertEqual((await self.client.post("/ip")).status_code, 200)
+
+    async def test_bucket_per_user(self):
+        first = {"Authorization": f"Bearer {create_access_token(uuid4())}"}
+        second = {"Authorization": f"Bearer {create_access_token(uuid4())}"}
+        self.assertEqual((await self.client.post("/user", headers=first)).status_code, 200)
+        self.assertEqual((await self.client.post("/user", headers=first)).status_code, 429)
+        self.assertEqual((await self.client.post("/user", headers=second)).status_code, 200)
+        # anonymous and invalid tokens share the bucket of the client IP
+        self.assertEqual((await self.client.post("/user")).status_code, 200)
+        self.assertEqual((await self.client.post("/user", headers={"Authorization": "Bearer bad"})).status_code, 429)
+
+    async def test_disabled(self):
+        with mock.patch.object(rate_limit, "backend", None):
+            for _ in range(5):
+                self.assertEqual((await self.client.post("/ip")).status_code, 200)
@@ -0,0 +1,91 @@
+from unittest import mock
+from sqlalchemy import text
+
+from api.db import initiate as init_db
+from api.db.migrations import migrate_manual
+from api.db.models.comments import Comment
+from api.db.models.forum import ForumMessage
+from api.db.session import engine
+from api.services import search as search_service
+from .factories import make_forum, make_post, make_user
+from .utils import DatabaseTestCase
+
+
+class SearchTest(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        user, forum = await self.create(make_user(), make_forum())
+        self.post, self.other_post, _ = await self.create(
+            make_post(user, title="Doping rules", description="Doping tests after the race"),
+            make_post(user, title="Nutrition", description="Training meals"),
+            make_post(user, title="Old doping news", is_deleted=True),
+        )
+        self.comment, self.message = await self.create(
+            Comment(post_id=self.other_post.id, user_id=user.id, comment="Is caffeine doping?"),
+            ForumMessage(forum_id=forum.id, user_id=user.id, message="Doping control at nationals"),
+        )
+
+    async def search(self, **params):
+        response = await self.client.get("/search", params=params)
+        self.assertEqual(response.status_code, 200, response.text)
+        return response.json()
+
+    async def test_all_kinds_most_relevant_first(self):
+        results = (await self.search(q="doping"))["data"]
+        self.assertEqual(results[0]["id"], str(self.post.id))
+        self.assertEqual(results[0]["type"], "post")
+        self.assertEqual(results[0]["title"], "Doping rules")
+        self.assertEqual(
+            {(result["type"], result["id"]) for result in results},
+            {("post", str(self.post.id)), ("comment", str(self.comment.id)), ("message", str(self.message.id))},
+        )
+        comment = next(result for result in results if result["type"] == "comment")
+        self.assertEqual(comment["parent_id"], str(self.other_post.id))
+
+    async def test_type(self):
+        results = (await self.search(q="doping", type="message"))["data"]
+        self.assertEqual([result["id"] for result in results], [str(self.message.id)])
+
+    async def test_pages(self):
+        first = await self.search(q="doping", limit=2)
+        second = await self.search(q="doping", limit=2, after=first["next_cursor"])
+        self.assertIsNone(second["next_cursor"])
+        ids = [result["id"] for result in first["data"] + second["data"]]
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(ids, [result["id"] for result in (await self.search(q="doping"))["data"]])
+
+    async def test_updated_text(self):
+        async with engine.begin() as conn:
+            await conn.execute(text("UPDATE posts SET title = 'Recovery' WHERE id = :id"), {"id": self.other_post.id})
+        results = (await self.search(q="recovery"))["data"]
+        self.assertEqual([result["id"] for result in results], [str(self.other_post.id)])
+
+    async def test_most_recent_matches_are_ranked(self):
+        newer = await self.create(make_post(await self.create(make_user()), title="Doping appeal"))
+        with mock.patch.object(search_service, "SEARCH_CANDIDATES", 1):
+            results = (await self.search(q="doping", type="post"))["data"]
+        self.assertEqual([result["id"] for result in results], [str(newer.id)])
+
+
+class SearchVectorMigrationTest(DatabaseTestCase):
+    async def test_backfill(self):
+        user = await self.create(make_user())
+        # a database from before the search columns
+        async with engine.begin() as conn:
+            await conn.execute(text("ALTER TABLE posts DROP COLUMN search_vector"))
+            await conn.execute(text("DROP FUNCTION posts_search_vector CASCADE"))
+            await conn.execute(text("DELETE FROM schema_migrations WHERE name LIKE '000%_search_vectors'"))
+        post = await self.create(make_post(user, title="Doping rules"))
+
+        await init_db()
+        self.assertEqual((await self.client.get("/search", params={"q": "doping"})).json()["data"], [])
+        self.assertEqual(await migrate_manual(engine), ["0003_backfill_search_vectors"])
+
+        results = (await self.client.get("/search", params={"q": "doping"})).json()["data"]
+        self.assertEqual([result["id"] for result in results], [str(post.id)])
+        async with engine.begin() as conn:
+            valid = await conn.execute(
+                text("SELECT indisvalid FROM pg_index WHERE indexrelid = 'ix_posts_search_vector'::regclass")
+            )
+            self.assertTrue(valid.scalar_one())
+        self.assertEqual(await migrate_manual(engine), [])
@@ -0,0 +1,55 @@
+from sqlmodel import select
+
+from api.db.models.base import INCLUDE_DELETED
+from api.db.models.forum import Forum, ForumMessage
+from api.db.models.post import Post
+from api.db.session import async_session_maker
+from .factories import make_forum, make_post, make_user
+from .utils import DatabaseTestCase
+
+
+class SoftDeleteFilterTest(DatabaseTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.user = await self.create(make_user())
+        self.live, self.deleted = await self.create(
+            make_post(self.user, title="live"), make_post(self.user, title="deleted", is_deleted=True)
+        )
+
+    async def test_select_leaves_out_deleted_rows(self):
+        async with async_session_maker() as db:
+            posts = (await db.exec(select(Post))).all()
+            self.assertEqual([post.id for post in posts], [self.live.id])
+
+    async def test_include_deleted(self):
+        async with async_session_maker() as db:
+            posts = (await db.exec(select(Post).execution_options(**{INCLUDE_DELETED: True}))).all()
+            self.assertEqual({post.id for post in posts}, {self.live.id, self.deleted.id})
+
+    async def test_joined_models_are_filtered(self):
+        # messages are not soft deleted themselves, the ones of a deleted forum only go through the join
+        forum, deleted_forum = await self.create(make_forum(), make_forum(is_deleted=True))
+        message, _ = await self.create(
+            ForumMessage(forum_id=forum.id, user_id=self.user.id, message="live forum"),
+            ForumMessage(forum_id=deleted_forum.id, user_id=self.user.id, message="deleted forum"),
+        )
+        async with async_session_maker() as db:
+            query = select(ForumMessage, Forum).join(Forum, ForumMessage.forum_id == Forum.id)
+            rows = (await db.exec(query)).all()
+            self.assertEqual([(m.id, f.id) for m, f in rows], [(message.id, forum.id)])
+            rows = (await db.exec(query.execution_options(**{INCLUDE_DELETED: True}))).all()
+            self.assertEqual(len(rows), 2)
+
+    async def test_get_by_id(self):
+        async with async_session_maker() as db:
+            self.assertIsNotNone(await Post.get_by_id(db, self.live.id))
+            self.assertIsNone(await Post.get_by_id(db, self.deleted.id))
+
+    async def test_endpoints(self):
+        response = await self.client.get(f"/posts/{self.live.id}")
+        self.assertEqual(response.status_code, 200, response.text)
+        response = await self.client.get(f"/posts/{self.deleted.id}")
+        self.assertEqual(response.status_code, 404, response.text)
+        response = await self.client.get(f"/posts/user/{self.user.id}")
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual([post["id"] for post in response.json()["data"]], [str(self.live.id)])
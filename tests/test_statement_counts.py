@@ -0,0 +1,59 @@
+from unittest import mock
+
+from api.db.session import settings
+from api.middleware.instrumentation_middleware import QUERY_COUNT_HEADER
+from .factories import make_post, make_user
+from .utils import DatabaseTestCase, auth_headers
+
+# a write used to be followed by a SELECT reloading the row, see `BaseModel.save`
+MAX_WRITE_STATEMENTS = 2
+
+
+class WriteStatementsTest(DatabaseTestCase):
+    """
+    Statements run by the post write endpoints, as counted by the request's `QueryStats`
+    Posts without hashtags, keeping the `post_hashtags` rows in sync is extra work on top of the write itself.
+    """
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        patcher = mock.patch.object(settings, "debug_headers", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = await self.create(make_user())
+        self.post = await self.create(make_post(self.user))
+        self.headers = auth_headers(self.user.id)
+
+    def assertStatements(self, response, expected: int):
+        self.assertLess(response.status_code, 300, response.text)
+        self.assertEqual(int(response.headers[QUERY_COUNT_HEADER]), expected)
+        self.assertLessEqual(expected, MAX_WRITE_STATEMENTS)
+
+    async def test_create(self):
+        body = {
+            "user_id": str(self.user.id),
+            "title": "Clean sport",
+            "description": "Testing",
+            "hashtag": "",
+            "image_url": "",
+        }
+        response = await self.client.post("/posts", json=body, headers=self.headers)
+        # the INSERT
+        self.assertStatements(response, 1)
+
+    async def test_update(self):
+        response = await self.client.patch(f"/posts/{self.post.id}", json={"title": "Renamed"}, headers=self.headers)
+        # the SELECT of the post and the UPDATE
+        self.assertStatements(response, 2)
+        self.assertEqual(response.json()["title"], "Renamed")
+
+    async def test_like(self):
+        response = await self.client.post(f"/posts/{self.post.id}/like", headers=self.headers)
+        # the like and the count in one statement
+        self.assertStatements(response, 1)
+        self.assertEqual(response.json()["like_count"], 1)
+
+    async def test_soft_delete(self):
+        response = await self.client.delete(f"/posts/{self.post.id}", headers=self.headers)
+        # the SELECT of the post and the UPDATE of `is_deleted`
+        self.assertStatements(response, 2)
@@ -0,0 +1,69 @@
+import asyncio
+import os
+import unittest
+from uuid import UUID
+import httpx
+from sqlmodel import SQLModel
+
+from api.main import app
+from api.db import initiate as init_db
+from api.db.counters import counters
+from api.db.migrations import SchemaMigration
+from api.db.session import async_session_maker, engine
+from api.endpoints import route_setup
+from api.utils.auth import create_access_token
+
+_routes_ready = False
+
+
+def setup_routes():
+    """
+    Register the routes once, the lifespan (which does it in the app) is not run by the tests
+    """
+    global _routes_ready  # pylint: disable=global-statement
+    if not _routes_ready:
+        route_setup(app)
+        _routes_ready = True
+
+
+def auth_headers(user_id: UUID) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+
+@unittest.skipUnless(os.getenv("TEST_DB_URL"), "TEST_DB_URL is not set")
+class DatabaseTestCase(unittest.IsolatedAsyncioTestCase):
+    """
+    Base class of the DB backed tests: creates the schema, empties the tables before every test,
+    and provides `self.client`, an httpx client calling the app in process.
+
+    Every test runs in its own event loop, so the pooled connections are dropped after each of them.
+    """
+
+    async def asyncSetUp(self):
+        # `IsolatedAsyncioTestCase` runs the loop in debug mode, which slows down the load tests a lot
+        asyncio.get_running_loop().set_debug(False)
+        # cleanups also run when the set up fails, unlike `asyncTearDown`
+        self.addAsyncCleanup(engine.dispose)
+        self.addAsyncCleanup(counters.aclose)
+        setup_routes()
+        await init_db()
+        # the data, not which migrations were applied to the schema
+        tables = ", ".join(
+            table.name for table in SQLModel.metadata.sorted_tables if table is not SchemaMigration.__table__
+        )
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(f"TRUNCATE {tables} CASCADE")
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    async def create(self, *objects: SQLModel):
+        """
+        Insert the rows in their own transaction, like data which was there before the request
+        """
+        async with async_session_maker() as db:
+            for obj in objects:
+                await obj.save(db)
+            await db.commit()
+        return objects[0] if len(objects) == 1 else objects